@@ -1,2 +1,4 @@
 #! /bin/bash
+# Usage: decode_hours.sh TAPE NUM_BITS
+# With - as the tape, it is read from stdin, e.g. decode_hours.sh - 5 < tape.txt
 venv/bin/python -m vim_turing_machine.machines.merge_overlapping_intervals.decode_intervals "$1" $2
@@ -12,5 +12,8 @@ setup(
     install_requires=[
         'colored',
     ],
+    extras_require={
+        'numpy': ['numpy'],
+    },
     packages=find_packages(exclude=('tests*', 'testing*')),
 )
@@ -0,0 +1,67 @@
+from vim_turing_machine.constants import BLANK_CHARACTER
+from vim_turing_machine.constants import INITIAL_STATE
+from vim_turing_machine.constants import YES_FINAL_STATE
+from vim_turing_machine.struct import BACKWARDS
+from vim_turing_machine.struct import StateTransition
+from vim_turing_machine.turing_machine import NegativeTapePositionException
+from vim_turing_machine.turing_machine import TooManyStepsException
+from vim_turing_machine.turing_machine import TuringMachine
+
+
+# Moves left until it finds a blank and writes a 1 there
+move_left_to_blank = [
+    StateTransition(
+        previous_state=INITIAL_STATE,
+        previous_character=bit_value,
+        next_state=INITIAL_STATE,
+        next_character=bit_value,
+        tape_pointer_direction=BACKWARDS,
+    )
+    for bit_value in ['0', '1']
+] + [
+    StateTransition(
+        previous_state=INITIAL_STATE,
+        previous_character=BLANK_CHARACTER,
+        next_state=YES_FINAL_STATE,
+        next_character='1',
+        tape_pointer_direction=BACKWARDS,
+    ),
+]
+
+
+def run_both(transitions, tape, max_steps=None, initial_cursor_position=0, **machine_options):
+    """Runs the tape on the interpreter and on a machine with these options.
+    Both results hold the final configuration and the error the run stopped
+    with, so that they can be compared.
+
+    :rtype: [(str, int, str, int, type)]
+    """
+    results = []
+    for options in ({}, machine_options):
+        machine = TuringMachine(list(transitions), quiet=True, **options)
+        try:
+            machine.run(tape, max_steps=max_steps, initial_cursor_position=initial_cursor_position)
+        except (TooManyStepsException, NegativeTapePositionException) as e:
+            error = type(e)
+        else:
+            error = None
+        results.append((str(machine.tape), machine.cursor_position, machine.current_state, machine._num_steps, error))
+
+    return results
+
+
+def merge(intervals):
+    merged = []
+    for begin, end in intervals:
+        if merged and begin <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([begin, end])
+    return merged
+
+
+def random_intervals(generator, num_intervals, num_bits):
+    return sorted(
+        sorted(generator.randrange(2 ** num_bits) for _ in range(2))
+        for _ in range(num_intervals)
+    )
@@ -0,0 +1,109 @@
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+import vim_turing_machine.artifact
+from vim_turing_machine.artifact import artifact_filename
+from vim_turing_machine.artifact import InvalidArtifactException
+from vim_turing_machine.artifact import load_artifact
+from vim_turing_machine.artifact import load_machine
+from vim_turing_machine.artifact import save_artifact
+from vim_turing_machine.constants import INITIAL_STATE
+from vim_turing_machine.machines.is_number_even import number_is_even_state_transitions
+from vim_turing_machine.machines.merge_overlapping_intervals.encode_intervals import encode_intervals
+from vim_turing_machine.machines.merge_overlapping_intervals.merge_overlapping_intervals import MergeOverlappingIntervalsGenerator
+from vim_turing_machine.struct import StateTransition
+from vim_turing_machine.turing_machine import TuringMachine
+
+
+@pytest.fixture
+def artifact_file(tmpdir):
+    return tmpdir.join('machine.machine').strpath
+
+
+def test_round_trip(artifact_file):
+    transitions = MergeOverlappingIntervalsGenerator(num_bits=3).merge_overlapping_intervals_transitions()
+    save_artifact(transitions, artifact_file)
+
+    loaded = load_artifact(artifact_file)
+    assert loaded == list(transitions)
+    assert all(isinstance(transition, StateTransition) for transition in loaded)
+
+    machine = TuringMachine(loaded, quiet=True, validate=False)
+    expected = TuringMachine(transitions, quiet=True)
+    tape = encode_intervals([[1, 3], [2, 4], [6, 7]], num_bits=3)
+    assert machine.run(tape).num_steps == expected.run(tape).num_steps
+    assert str(machine.tape) == str(expected.tape)
+
+
+def test_invalid_transitions_are_not_saved(artifact_file):
+    with pytest.raises(AssertionError):
+        save_artifact([StateTransition(INITIAL_STATE, '0', 'bad:state', '0', 1)], artifact_file)
+
+    assert not os.path.exists(artifact_file)
+
+
+def test_corrupted_artifact(artifact_file):
+    save_artifact(number_is_even_state_transitions, artifact_file)
+    with open(artifact_file, 'r+b') as f:
+        f.seek(-1, os.SEEK_END)
+        f.write(b'\x7f')
+
+    with pytest.raises(InvalidArtifactException):
+        load_artifact(artifact_file)
+
+
+def test_not_an_artifact(artifact_file):
+    with open(artifact_file, 'wb') as f:
+        f.write(b'hello\n')
+
+    with pytest.raises(InvalidArtifactException):
+        load_artifact(artifact_file)
+
+
+def test_load_machine_is_cached(monkeypatch):
+    transitions = load_machine('merge_overlapping_intervals', 3)
+    assert transitions == MergeOverlappingIntervalsGenerator(num_bits=3).merge_overlapping_intervals_transitions()
+    assert os.path.exists(artifact_filename('merge_overlapping_intervals', 3))
+
+    def fail(*args):
+        raise AssertionError('The machine should have been loaded from the cache')
+
+    monkeypatch.setattr(vim_turing_machine.artifact, 'save_artifact', fail)
+    monkeypatch.setattr(vim_turing_machine.artifact, 'validate_state_transitions', fail)
+    assert load_machine('merge_overlapping_intervals', 3) == transitions
+
+
+def test_cache_is_keyed_by_num_bits():
+    assert artifact_filename('merge_overlapping_intervals', 3) != artifact_filename('merge_overlapping_intervals', 4)
+    assert len(load_machine('merge_overlapping_intervals', 4)) != len(load_machine('merge_overlapping_intervals', 3))
+
+
+def test_cache_is_keyed_by_the_package_source(tmpdir, monkeypatch):
+    package = tmpdir.join('vim_turing_machine')
+    shutil.copytree(os.path.dirname(vim_turing_machine.artifact.__file__), package.strpath)
+    monkeypatch.setattr(vim_turing_machine.artifact, 'PACKAGE_DIRECTORY', package.strpath)
+    filename = artifact_filename('merge_overlapping_intervals', 3)
+
+    # Not the generator's module, but something it uses
+    package.join('constants.py').write('\n', mode='a')
+    assert artifact_filename('merge_overlapping_intervals', 3) != filename
+
+
+def test_unknown_generator():
+    with pytest.raises(KeyError):
+        artifact_filename('unknown', 3)
+
+
+def test_machines_are_imported_when_needed():
+    modules = subprocess.check_output([
+        sys.executable,
+        '-c',
+        'import sys, vim_turing_machine.artifact; print(sorted(sys.modules))',
+    ]).decode()
+
+    assert 'vim_turing_machine.artifact' in modules
+    assert 'vim_turing_machine.machines' not in modules
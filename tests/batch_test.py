@@ -0,0 +1,63 @@
+import pytest
+
+from vim_turing_machine.batch import run_batch
+from vim_turing_machine.constants import NO_FINAL_STATE
+from vim_turing_machine.constants import YES_FINAL_STATE
+from vim_turing_machine.machines.is_number_even import number_is_even_state_transitions
+from vim_turing_machine.machines.merge_overlapping_intervals.decode_intervals import decode_intervals
+from vim_turing_machine.machines.merge_overlapping_intervals.encode_intervals import encode_intervals
+from vim_turing_machine.machines.merge_overlapping_intervals.merge_overlapping_intervals import MergeOverlappingIntervalsGenerator
+from vim_turing_machine.turing_machine import MissingStateTransition
+from vim_turing_machine.turing_machine import TooManyStepsException
+from vim_turing_machine.turing_machine import TuringMachine
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_run_batch_in_order(workers):
+    tapes = ['', '1', '0', '1001', '1010']
+    results = list(run_batch(number_is_even_state_transitions, tapes, max_steps=100, workers=workers))
+
+    assert [result.index for result in results] == list(range(len(tapes)))
+    assert [result.final_state for result in results] == [
+        NO_FINAL_STATE,
+        NO_FINAL_STATE,
+        YES_FINAL_STATE,
+        NO_FINAL_STATE,
+        YES_FINAL_STATE,
+    ]
+    assert all(result.error is None for result in results)
+
+
+def test_run_batch_matches_single_runs():
+    transitions = MergeOverlappingIntervalsGenerator(num_bits=3).merge_overlapping_intervals_transitions()
+    interval_lists = [
+        [[0, 1]],
+        [[0, 1], [5, 6]],
+        [[0, 5], [2, 3]],
+        [[1, 3], [3, 4], [4, 5], [6, 7]],
+    ]
+    tapes = [encode_intervals(intervals, num_bits=3) for intervals in interval_lists]
+
+    results = sorted(
+        run_batch(transitions, tapes, max_steps=10000, workers=2, ordered=False, chunksize=1),
+        key=lambda result: result.index,
+    )
+
+    for tape, result in zip(tapes, results):
+        machine = TuringMachine(transitions, quiet=True)
+        machine.run(tape, max_steps=10000)
+
+        assert result.final_state == machine.current_state
+        assert result.num_steps == machine._num_steps
+        assert result.tape == str(machine.tape)
+
+    assert decode_intervals(results[3].tape, num_bits=3) == [[1, 5], [6, 7]]
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_run_batch_reports_errors(workers):
+    results = list(run_batch(number_is_even_state_transitions, ['1a', '1111'], max_steps=2, workers=workers))
+
+    assert isinstance(results[0].error, MissingStateTransition)
+    assert isinstance(results[1].error, TooManyStepsException)
+    assert results[1].num_steps == 2
@@ -0,0 +1,111 @@
+import json
+import os
+
+import pytest
+
+from vim_turing_machine.benchmarks.cases import BENCHMARKS
+from vim_turing_machine.benchmarks.cases import random_intervals
+from vim_turing_machine.benchmarks.runner import BASELINE_FILENAME
+from vim_turing_machine.benchmarks.runner import compare
+from vim_turing_machine.benchmarks.runner import load_results
+from vim_turing_machine.benchmarks.runner import main
+from vim_turing_machine.benchmarks.runner import parse_threshold
+from vim_turing_machine.benchmarks.runner import run_benchmarks
+from vim_turing_machine.benchmarks.runner import threshold_for
+from vim_turing_machine.benchmarks.runner import write_results
+from vim_turing_machine.benchmarks.struct import BenchmarkRegression
+from vim_turing_machine.benchmarks.struct import BenchmarkResult
+
+
+@pytest.fixture
+def results_file(tmpdir):
+    return tmpdir.join('results.json').strpath
+
+
+def test_every_benchmark_runs(tmpdir):
+    with tmpdir.as_cwd():
+        results = run_benchmarks(repeat=1, quick=True)
+
+        # The vim machine is written to a temporary directory
+        assert not os.path.exists('machine.vim')
+
+    assert [result.name for result in results] == [benchmark.name for benchmark in BENCHMARKS]
+    assert all(result.seconds > 0 and result.work > 0 for result in results)
+
+
+def test_patterns_select_benchmarks():
+    results = run_benchmarks(['run/is_number_even/*', 'encode_*'], repeat=1, quick=True)
+    assert [result.name for result in results] == [
+        'run/is_number_even/length=10000',
+        'encode_intervals/num_bits=16/intervals=10000',
+        'encode_intervals_array/num_bits=16/intervals=10000',
+    ]
+
+
+def test_random_intervals_are_sorted_and_fit():
+    intervals = random_intervals(50, num_bits=4)
+
+    assert intervals == sorted(intervals)
+    assert all(0 <= begin <= end < 16 for begin, end in intervals)
+    assert intervals == random_intervals(50, num_bits=4)
+
+
+def test_baseline_covers_every_benchmark():
+    baseline = load_results(BASELINE_FILENAME)
+
+    assert {result.name for result in baseline} == {benchmark.name for benchmark in BENCHMARKS}
+
+
+def test_results_round_trip(results_file):
+    results = [BenchmarkResult('a', 0.5, 100, 'steps'), BenchmarkResult('b', 2.0, 10, 'intervals')]
+    write_results(results, results_file)
+
+    assert sorted(load_results(results_file)) == results
+    assert results[0].rate == 200
+
+
+def test_compare():
+    baseline = [
+        BenchmarkResult('run/fast', 1.0, 100, 'steps'),
+        BenchmarkResult('run/slow', 1.0, 100, 'steps'),
+        BenchmarkResult('vim/noisy', 1.0, 100, 'steps'),
+        BenchmarkResult('run/resized', 1.0, 100, 'steps'),
+    ]
+    results = [
+        BenchmarkResult('run/fast', 1.05, 100, 'steps'),
+        BenchmarkResult('run/slow', 1.5, 100, 'steps'),
+        BenchmarkResult('vim/noisy', 1.5, 100, 'steps'),
+        BenchmarkResult('run/resized', 5.0, 1000, 'steps'),
+        BenchmarkResult('run/new', 5.0, 100, 'steps'),
+    ]
+
+    assert compare(results, baseline, thresholds=[('vim/*', 1.0)]) == [
+        BenchmarkRegression('run/slow', 1.0, 1.5, 0.1),
+    ]
+
+
+def test_thresholds():
+    thresholds = [parse_threshold('0.2'), parse_threshold('vim/*=0.5')]
+
+    assert thresholds == [('*', 0.2), ('vim/*', 0.5)]
+    assert threshold_for('vim/machine', thresholds) == 0.5
+    assert threshold_for('run/machine', thresholds) == 0.2
+    assert threshold_for('run/machine', []) == 0.1
+
+
+def test_main_reports_regressions(results_file, capsys):
+    with open(results_file, 'w') as f:
+        json.dump({
+            'run/is_number_even/length=10000': {
+                'name': 'run/is_number_even/length=10000',
+                'seconds': 1e-9,
+                'work': 101,
+                'unit': 'steps',
+            },
+        }, f)
+
+    assert main(['run/is_number_even/*', '--quick', '--repeat', '1', '--baseline', results_file]) == 1
+    assert 'Regression: run/is_number_even/length=10000' in capsys.readouterr().out
+
+    assert main(['run/is_number_even/*', '--quick', '--repeat', '1', '--output', results_file]) == 0
+    assert [result.name for result in load_results(results_file)] == ['run/is_number_even/length=10000']
@@ -0,0 +1,110 @@
+import pytest
+
+from vim_turing_machine.checkpoint import CheckpointMismatchException
+from vim_turing_machine.checkpoint import transitions_hash
+from vim_turing_machine.constants import YES_FINAL_STATE
+from vim_turing_machine.machines.is_number_even import number_is_even_state_transitions
+from vim_turing_machine.machines.merge_overlapping_intervals.encode_intervals import encode_intervals
+from vim_turing_machine.machines.merge_overlapping_intervals.merge_overlapping_intervals import MergeOverlappingIntervalsGenerator
+from vim_turing_machine.profiler import Profiler
+from vim_turing_machine.tape import TwoWayTape
+from vim_turing_machine.turing_machine import COMPILED_PYTHON
+from vim_turing_machine.turing_machine import TooManyStepsException
+from vim_turing_machine.turing_machine import TuringMachine
+
+
+@pytest.fixture
+def checkpoint_file(tmpdir):
+    return tmpdir.join('machine.checkpoint').strpath
+
+
+@pytest.fixture
+def transitions():
+    return MergeOverlappingIntervalsGenerator(num_bits=3).merge_overlapping_intervals_transitions()
+
+
+@pytest.fixture
+def tape():
+    return encode_intervals([[1, 3], [3, 4], [6, 7]], num_bits=3)
+
+
+def test_transitions_hash_ignores_order():
+    transitions = list(number_is_even_state_transitions)
+
+    assert transitions_hash(transitions) == transitions_hash(reversed(transitions))
+    assert transitions_hash(transitions) != transitions_hash(transitions[1:])
+
+
+@pytest.mark.parametrize('compiled', [False, True])
+def test_resume_after_step_limit(compiled, checkpoint_file, transitions, tape):
+    expected = TuringMachine(transitions, quiet=True).run(tape)
+
+    machine = TuringMachine(transitions, quiet=True, compiled=compiled)
+    with pytest.raises(TooManyStepsException):
+        machine.run(tape, max_steps=100, checkpoint_file=checkpoint_file)
+
+    resumed = TuringMachine(transitions, quiet=True, compiled=compiled)
+    resumed.load_checkpoint(checkpoint_file)
+    assert resumed._num_steps == 100
+    assert str(resumed.tape) == str(machine.tape)
+
+    result = resumed.resume(max_steps=10000)
+    assert result.final_state == YES_FINAL_STATE
+    assert result.num_steps == expected.num_steps
+    assert result.cursor_position == expected.cursor_position
+
+
+def test_resume_in_place(transitions, tape):
+    expected = TuringMachine(transitions, quiet=True).run(tape)
+
+    machine = TuringMachine(transitions, quiet=True)
+    with pytest.raises(TooManyStepsException):
+        machine.run(tape, max_steps=50)
+
+    assert machine.resume(max_steps=10000).num_steps == expected.num_steps
+
+
+def test_periodic_checkpoints(checkpoint_file, transitions, tape):
+    machine = TuringMachine(transitions, quiet=True)
+    result = machine.run(tape, checkpoint_file=checkpoint_file, checkpoint_interval=40)
+
+    # The last checkpoint is from the last full interval before halting
+    resumed = TuringMachine(transitions, quiet=True)
+    resumed.load_checkpoint(checkpoint_file)
+    assert resumed._num_steps == result.num_steps // 40 * 40
+    assert resumed.resume().num_steps == result.num_steps
+
+
+def test_checkpoint_from_a_different_machine(checkpoint_file):
+    machine = TuringMachine(number_is_even_state_transitions, quiet=True)
+    with pytest.raises(TooManyStepsException):
+        machine.run('1111', max_steps=2, checkpoint_file=checkpoint_file)
+
+    other = TuringMachine(number_is_even_state_transitions[1:], quiet=True)
+    with pytest.raises(CheckpointMismatchException):
+        other.load_checkpoint(checkpoint_file)
+
+    two_way = TuringMachine(number_is_even_state_transitions, quiet=True, tape_class=TwoWayTape)
+    with pytest.raises(CheckpointMismatchException):
+        two_way.load_checkpoint(checkpoint_file)
+
+
+@pytest.mark.parametrize('options', [
+    {},
+    {'compiled': True},
+    {'compiled': COMPILED_PYTHON},
+    {'detect_loops': True},
+    {'profiler': Profiler()},
+    {'macro_block_size': 2},
+])
+def test_resume_below_the_step_count(options, transitions, tape):
+    machine = TuringMachine(transitions, quiet=True, **options)
+    with pytest.raises(TooManyStepsException):
+        machine.run(tape, max_steps=20)
+    cursor_position = machine.cursor_position
+
+    # The step count never goes backwards
+    with pytest.raises(TooManyStepsException):
+        machine.resume(max_steps=10)
+    assert machine._num_steps == 20
+    assert machine.cursor_position == cursor_position
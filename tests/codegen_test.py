@@ -0,0 +1,72 @@
+import os
+
+import pytest
+
+import vim_turing_machine.codegen
+from vim_turing_machine.codegen import cache_key
+from vim_turing_machine.codegen import CACHE_DIRECTORY_VARIABLE
+from vim_turing_machine.codegen import cache_filename
+from vim_turing_machine.codegen import GeneratedMachine
+from vim_turing_machine.constants import BLANK_CHARACTER
+from vim_turing_machine.machines.is_number_even import number_is_even_state_transitions
+from vim_turing_machine.machines.merge_overlapping_intervals.encode_intervals import encode_intervals
+from vim_turing_machine.tape import TwoWayTape
+from vim_turing_machine.turing_machine import COMPILED_PYTHON
+from vim_turing_machine.turing_machine import MissingStateTransition
+from vim_turing_machine.turing_machine import TuringMachine
+from testing.util import move_left_to_blank
+from testing.util import run_both
+
+
+@pytest.mark.parametrize('tape', ['', '0', '1', '1001', '1010'])
+def test_is_number_even_matches_interpreter(tape):
+    interpreted, generated = run_both(number_is_even_state_transitions, tape, compiled=COMPILED_PYTHON)
+    assert interpreted == generated
+
+
+@pytest.mark.parametrize('max_steps', [None, 1, 17, 150, 151])
+def test_merge_overlapping_intervals_matches_interpreter(merge_transitions, max_steps):
+    tape = encode_intervals([[1, 3], [3, 4], [4, 5], [6, 7]], num_bits=3)
+
+    interpreted, generated = run_both(merge_transitions, tape, max_steps=max_steps, compiled=COMPILED_PYTHON)
+    assert interpreted == generated
+
+
+def test_missing_transition():
+    machine = TuringMachine(number_is_even_state_transitions, quiet=True, compiled=COMPILED_PYTHON)
+
+    with pytest.raises(MissingStateTransition) as excinfo:
+        machine.run('10a1')
+
+    assert excinfo.value.args[0] == ('onward!', 'a')
+    assert str(machine.tape) == '10a1'
+
+
+def test_two_way_tape():
+    machine = TuringMachine(move_left_to_blank, quiet=True, compiled=COMPILED_PYTHON, tape_class=TwoWayTape)
+    machine.run('0110', initial_cursor_position=2)
+
+    assert machine.cursor_position == -2
+    assert str(machine.tape) == BLANK_CHARACTER + '10110'
+
+
+def test_code_is_cached_on_disk(merge_transitions, cache_directory, monkeypatch):
+    GeneratedMachine(merge_transitions)
+    assert os.path.exists(cache_filename(cache_key(merge_transitions, BLANK_CHARACTER)))
+
+    def fail(*args):
+        raise AssertionError('The code should have been loaded from the cache')
+
+    monkeypatch.setattr(vim_turing_machine.codegen, 'generate_source', fail)
+    machine = GeneratedMachine(list(reversed(merge_transitions)))
+
+    assert callable(machine.run_machine)
+
+
+def test_unwritable_cache_is_ignored(monkeypatch, tmpdir):
+    not_a_directory = tmpdir.join('file')
+    not_a_directory.write('')
+    monkeypatch.setenv(CACHE_DIRECTORY_VARIABLE, not_a_directory.strpath)
+
+    machine = TuringMachine(number_is_even_state_transitions, quiet=True, compiled=COMPILED_PYTHON)
+    assert machine.run('10').num_steps == 3
@@ -0,0 +1,133 @@
+import pytest
+
+from vim_turing_machine.compiled import CompiledMachine
+from vim_turing_machine.compiled import MISSING_TRANSITION
+from vim_turing_machine.constants import BLANK_CHARACTER
+from vim_turing_machine.constants import INITIAL_STATE
+from vim_turing_machine.constants import YES_FINAL_STATE
+from vim_turing_machine.machines.is_number_even import number_is_even_state_transitions
+from vim_turing_machine.machines.merge_overlapping_intervals.encode_intervals import encode_intervals
+from vim_turing_machine.machines.merge_overlapping_intervals.merge_overlapping_intervals import MergeOverlappingIntervalsGenerator
+from vim_turing_machine.struct import BACKWARDS
+from vim_turing_machine.struct import FORWARDS
+from vim_turing_machine.struct import StateTransition
+from vim_turing_machine.turing_machine import MissingStateTransition
+from vim_turing_machine.turing_machine import NegativeTapePositionException
+from vim_turing_machine.turing_machine import TooManyStepsException
+from vim_turing_machine.turing_machine import TuringMachine
+from testing.util import run_both
+
+
+def test_interns_states_and_symbols():
+    compiled = CompiledMachine(number_is_even_state_transitions)
+
+    assert compiled.states[0] == INITIAL_STATE
+    assert compiled.symbols[compiled.blank_symbol_id] == BLANK_CHARACTER
+    assert set(compiled.symbols) == {'0', '1', BLANK_CHARACTER}
+
+    index = compiled.index(compiled.state_ids[INITIAL_STATE], compiled.symbol_ids['0'])
+    assert compiled.states[compiled.next_states[index]] == 'onward!'
+    assert compiled.directions[index] == FORWARDS
+
+    index = compiled.index(compiled.state_ids[YES_FINAL_STATE], compiled.symbol_ids['0'])
+    assert compiled.next_states[index] == MISSING_TRANSITION
+
+
+def test_detects_scanning_states():
+    compiled = CompiledMachine(number_is_even_state_transitions)
+    state_id = compiled.state_ids['onward!']
+
+    assert compiled.scan_directions[state_id] == FORWARDS
+    assert compiled.symbol_ids[BLANK_CHARACTER] in compiled.scan_stop_symbols[state_id]
+    assert compiled.is_scan[compiled.index(state_id, compiled.symbol_ids['0'])]
+    assert compiled.is_scan[compiled.index(state_id, compiled.symbol_ids['1'])]
+    assert not compiled.is_scan[compiled.index(state_id, compiled.symbol_ids[BLANK_CHARACTER])]
+
+    # The initial state moves forward but changes state, so it isn't a scan.
+    assert compiled.scan_directions[compiled.state_ids[INITIAL_STATE]] == 0
+
+
+def test_detects_searching_states_in_merge_machine():
+    transitions = MergeOverlappingIntervalsGenerator(num_bits=3).merge_overlapping_intervals_transitions()
+    compiled = CompiledMachine(transitions)
+
+    searching_states = [state for state in compiled.states if 'Searching' in state]
+    assert searching_states
+    for state in searching_states:
+        assert compiled.scan_directions[compiled.state_ids[state]] in (FORWARDS, BACKWARDS)
+
+
+@pytest.mark.parametrize('max_steps', range(1, 12))
+def test_scan_stops_at_exact_step_limit(max_steps):
+    interpreted, compiled = run_both(number_is_even_state_transitions, '1' * 20, max_steps=max_steps, compiled=True)
+
+    assert interpreted == compiled
+    assert compiled[-1] is TooManyStepsException
+
+
+def test_scan_stops_at_exact_step_limit_in_merge_machine():
+    transitions = MergeOverlappingIntervalsGenerator(num_bits=3).merge_overlapping_intervals_transitions()
+    tape = encode_intervals([[1, 3], [3, 4], [6, 7]], num_bits=3)
+
+    for max_steps in range(1, 400, 7):
+        interpreted, compiled = run_both(transitions, tape, max_steps=max_steps, compiled=True)
+
+        assert interpreted == compiled
+        assert compiled[-1] is TooManyStepsException
+
+
+@pytest.mark.parametrize('tape', ['', '0', '1', '1001', '1010'])
+def test_is_number_even_matches_interpreter(tape):
+    interpreted, compiled = run_both(number_is_even_state_transitions, tape, max_steps=100, compiled=True)
+    assert interpreted == compiled
+
+
+@pytest.mark.parametrize('intervals', [
+    [[0, 1]],
+    [[0, 5], [2, 3]],
+    [[1, 3], [3, 4], [4, 5], [6, 7]],
+])
+def test_merge_overlapping_intervals_matches_interpreter(intervals):
+    transitions = MergeOverlappingIntervalsGenerator(num_bits=3).merge_overlapping_intervals_transitions()
+
+    interpreted, compiled = run_both(transitions, encode_intervals(intervals, num_bits=3), max_steps=10000, compiled=True)
+    assert interpreted == compiled
+
+
+def test_missing_transition():
+    machine = TuringMachine(number_is_even_state_transitions, quiet=True, compiled=True)
+
+    with pytest.raises(MissingStateTransition) as excinfo:
+        machine.run('10a1')
+
+    assert excinfo.value.args[0] == ('onward!', 'a')
+    assert str(machine.tape) == '10a1'
+
+
+def test_too_many_steps():
+    machine = TuringMachine(number_is_even_state_transitions, quiet=True, compiled=True)
+
+    with pytest.raises(TooManyStepsException):
+        machine.run('10101', max_steps=3)
+
+    assert machine._num_steps == 3
+    assert machine.cursor_position == 3
+
+
+def test_negative_tape_position():
+    machine = TuringMachine(
+        [
+            StateTransition(
+                previous_state=INITIAL_STATE,
+                previous_character='0',
+                next_state=INITIAL_STATE,
+                next_character='0',
+                tape_pointer_direction=BACKWARDS,
+            ),
+        ],
+        quiet=True,
+        compiled=True,
+    )
+
+    with pytest.raises(NegativeTapePositionException):
+        machine.run('0')
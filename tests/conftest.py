@@ -0,0 +1,16 @@
+import pytest
+
+from vim_turing_machine.codegen import CACHE_DIRECTORY_VARIABLE
+from vim_turing_machine.machines.merge_overlapping_intervals.merge_overlapping_intervals import MergeOverlappingIntervalsGenerator
+
+
+@pytest.fixture(autouse=True)
+def cache_directory(tmpdir, monkeypatch):
+    """Keeps the generated code and artifacts of every test to itself"""
+    monkeypatch.setenv(CACHE_DIRECTORY_VARIABLE, tmpdir.join('cache').strpath)
+    return tmpdir.join('cache').strpath
+
+
+@pytest.fixture
+def merge_transitions():
+    return MergeOverlappingIntervalsGenerator(num_bits=3).merge_overlapping_intervals_transitions()
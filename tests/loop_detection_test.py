@@ -0,0 +1,85 @@
+import pytest
+
+from vim_turing_machine.constants import BLANK_CHARACTER
+from vim_turing_machine.constants import INITIAL_STATE
+from vim_turing_machine.machines.is_number_even import number_is_even_state_transitions
+from vim_turing_machine.machines.merge_overlapping_intervals.encode_intervals import encode_intervals
+from vim_turing_machine.machines.merge_overlapping_intervals.merge_overlapping_intervals import MergeOverlappingIntervalsGenerator
+from vim_turing_machine.struct import BACKWARDS
+from vim_turing_machine.struct import DO_NOT_MOVE
+from vim_turing_machine.struct import FORWARDS
+from vim_turing_machine.struct import StateTransition
+from vim_turing_machine.tape import TwoWayTape
+from vim_turing_machine.turing_machine import InfiniteLoopDetected
+from vim_turing_machine.turing_machine import TooManyStepsException
+from vim_turing_machine.turing_machine import TuringMachine
+
+
+def transition(previous_state, previous_character, next_state, next_character, direction):
+    return StateTransition(
+        previous_state=previous_state,
+        previous_character=previous_character,
+        next_state=next_state,
+        next_character=next_character,
+        tape_pointer_direction=direction,
+    )
+
+
+# Walks forward over 1s, then bounces between the two cells around the first 0
+# while flipping it: 0 -> 1 -> 0 ...
+walk_then_bounce = [
+    transition(INITIAL_STATE, '1', INITIAL_STATE, '1', FORWARDS),
+    transition(INITIAL_STATE, '0', 'Flip', '1', BACKWARDS),
+    transition('Flip', '1', 'Back', '1', FORWARDS),
+    transition('Back', '1', 'Unflip', '0', DO_NOT_MOVE),
+    transition('Unflip', '0', 'Flip', '1', BACKWARDS),
+]
+
+
+def run(transitions, tape, **kwargs):
+    return TuringMachine(transitions, quiet=True, detect_loops=True, **kwargs).run(tape, max_steps=100000)
+
+
+@pytest.mark.parametrize('tape, entry_step', [
+    ('10', 2),
+    ('11110', 5),
+])
+def test_detects_loop(tape, entry_step):
+    with pytest.raises(InfiniteLoopDetected) as excinfo:
+        run(walk_then_bounce, tape)
+
+    assert excinfo.value.cycle_length == 3
+    assert excinfo.value.entry_step == entry_step
+    assert 'every 3 steps' in str(excinfo.value)
+
+
+def test_detects_loop_on_two_way_tape():
+    bounce = [
+        transition(INITIAL_STATE, BLANK_CHARACTER, 'Left', BLANK_CHARACTER, BACKWARDS),
+        transition('Left', BLANK_CHARACTER, INITIAL_STATE, BLANK_CHARACTER, FORWARDS),
+    ]
+
+    with pytest.raises(InfiniteLoopDetected) as excinfo:
+        run(bounce, '', tape_class=TwoWayTape)
+
+    assert excinfo.value.cycle_length == 2
+    assert excinfo.value.entry_step == 0
+
+
+def test_growing_tape_is_not_a_loop():
+    forever = [transition(INITIAL_STATE, BLANK_CHARACTER, INITIAL_STATE, '1', FORWARDS)]
+
+    with pytest.raises(TooManyStepsException):
+        run(forever, '')
+
+
+def test_halting_machines_are_unchanged():
+    transitions = MergeOverlappingIntervalsGenerator(num_bits=3).merge_overlapping_intervals_transitions()
+    tape = encode_intervals([[1, 3], [3, 4], [6, 7]], num_bits=3)
+
+    expected = TuringMachine(transitions, quiet=True).run(tape)
+    result = run(transitions, tape)
+
+    assert result.num_steps == expected.num_steps
+    assert result.cursor_position == expected.cursor_position
+    assert run(number_is_even_state_transitions, '1010').num_steps == 5
@@ -1,5 +1,38 @@
+import io
+import json
+
+import pytest
+
 from vim_turing_machine.machines.merge_overlapping_intervals.decode_intervals import decode_intervals
+from vim_turing_machine.machines.merge_overlapping_intervals.decode_intervals import iter_decoded_intervals
+from vim_turing_machine.machines.merge_overlapping_intervals.decode_intervals import read_tape
+from vim_turing_machine.machines.merge_overlapping_intervals.decode_intervals import write_intervals
 
 
 def test_encode_intervals():
     assert decode_intervals('{}{}'.format('01010', '11111'), 5) == [[10, 31]]
+
+
+def test_decode_skips_blanks():
+    assert decode_intervals('X01 010X\n111X11XX', 5) == [[10, 31]]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 1000])
+def test_decode_chunks(chunk_size):
+    tape = 'XX0101011111 00001X00010\n'
+    intervals = iter_decoded_intervals(read_tape(io.StringIO(tape), chunk_size), 5)
+
+    assert list(intervals) == [[10, 31], [1, 2]]
+
+
+def test_decode_partial_interval():
+    with pytest.raises(ValueError):
+        decode_intervals('010101111', 5)
+
+
+@pytest.mark.parametrize('intervals', [[], [[1, 2]], [[1, 2], [3, 4]]])
+def test_write_intervals(intervals):
+    f = io.StringIO()
+    write_intervals(iter(intervals), f, chunk_size=3)
+
+    assert f.getvalue() == json.dumps(intervals) + '\n'
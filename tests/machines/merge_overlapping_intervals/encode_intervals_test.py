@@ -1,7 +1,11 @@
+import io
+
 import pytest
 
 from vim_turing_machine.machines.merge_overlapping_intervals.encode_intervals import encode_in_x_bits
 from vim_turing_machine.machines.merge_overlapping_intervals.encode_intervals import encode_intervals
+from vim_turing_machine.machines.merge_overlapping_intervals.encode_intervals import read_intervals
+from vim_turing_machine.machines.merge_overlapping_intervals.encode_intervals import write_tape
 
 
 @pytest.mark.parametrize('number, encoded', [
@@ -15,3 +19,54 @@ def test_encode_in_x_bits(number, encoded):
 
 def test_encode_intervals():
     assert encode_intervals([(10, 31)], num_bits=5) == '{}{}'.format('01010', '11111')
+
+
+@pytest.mark.parametrize('text', [
+    '[[1, 2], [10, 31], [123, 4567]]',
+    '[1, 2]\n[10, 31]\n[123, 4567]\n',
+    '1 2\n10 31\n123 4567',
+    '[\n  [1,2],\n  [10,31],\n  [123,4567]\n]\n',
+])
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 1000])
+def test_read_intervals(text, chunk_size):
+    assert list(read_intervals(io.StringIO(text), chunk_size)) == [[1, 2], [10, 31], [123, 4567]]
+
+
+@pytest.mark.parametrize('text', ['', '[]', '\n'])
+def test_read_no_intervals(text):
+    assert list(read_intervals(io.StringIO(text))) == []
+
+
+@pytest.mark.parametrize('text', [
+    '[[1, 2], [3]]',
+    '[[1, -2]]',
+    '[[1.5, 2]]',
+    '{"a": 1}',
+    '[[1, 2, 3], [4, 5, 6]]',
+    '[[1, 2], []]',
+    '[[1, 2], 3, 4]',
+    '[[[1, 2]]]',
+    '[[1, 2]',
+    '[1, 2]]',
+    '1 2 3\n4 5 6',
+    '[1, 2, 3]\n',
+    '[[1 2] [3 4]]',
+    '[[1, 2] [3, 4]]',
+    '[[1,,2],,,[3,4]]',
+    '[[1, 2],]',
+    '[, [1, 2]]',
+    '[[1, 2,]]',
+    '1, 2\n',
+])
+def test_read_invalid_intervals(text):
+    with pytest.raises(ValueError):
+        list(read_intervals(io.StringIO(text), chunk_size=2))
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 1000])
+def test_write_tape(chunk_size):
+    intervals = [[i, 2 * i] for i in range(10)]
+    f = io.StringIO()
+    write_tape(iter(intervals), f, num_bits=5, chunk_size=chunk_size)
+
+    assert f.getvalue() == encode_intervals(intervals, num_bits=5)
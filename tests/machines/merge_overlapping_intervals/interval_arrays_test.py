@@ -0,0 +1,43 @@
+import numpy
+import pytest
+
+from vim_turing_machine.machines.merge_overlapping_intervals.decode_intervals import decode_intervals
+from vim_turing_machine.machines.merge_overlapping_intervals.encode_intervals import encode_intervals
+from vim_turing_machine.machines.merge_overlapping_intervals.interval_arrays import decode_intervals_array
+from vim_turing_machine.machines.merge_overlapping_intervals.interval_arrays import encode_intervals_array
+
+
+@pytest.mark.parametrize('num_bits', [1, 5, 8, 13, 63])
+def test_matches_encode_and_decode_intervals(num_bits):
+    generator = numpy.random.default_rng(num_bits)
+    intervals = generator.integers(0, 2 ** num_bits, size=(100, 2), dtype=numpy.int64, endpoint=False)
+    intervals[0] = [0, 2 ** num_bits - 1]
+
+    tape = encode_intervals_array(intervals, num_bits)
+    tape_string = encode_intervals(intervals.tolist(), num_bits)
+
+    assert tape.dtype == numpy.uint8
+    assert tape.tobytes().decode() == tape_string
+    assert decode_intervals_array(tape, num_bits).tolist() == decode_intervals(tape_string, num_bits) == intervals.tolist()
+
+
+def test_empty():
+    assert encode_intervals_array([], num_bits=5).size == 0
+    assert decode_intervals_array('', num_bits=5).shape == (0, 2)
+
+
+def test_decode_skips_blanks():
+    assert decode_intervals_array('X01 010X\n111X11XX', 5).tolist() == [[10, 31]]
+    assert decode_intervals_array(b'0101011111', 5).tolist() == [[10, 31]]
+
+
+@pytest.mark.parametrize('intervals', [[[0, 32]], [[-1, 2]]])
+def test_encode_out_of_range(intervals):
+    with pytest.raises(AssertionError):
+        encode_intervals_array(intervals, num_bits=5)
+
+
+@pytest.mark.parametrize('tape', ['010101111', '01010111a1'])
+def test_decode_invalid_tape(tape):
+    with pytest.raises(ValueError):
+        decode_intervals_array(tape, num_bits=5)
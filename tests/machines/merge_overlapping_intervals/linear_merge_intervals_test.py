@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+from vim_turing_machine.constants import YES_FINAL_STATE
+from vim_turing_machine.machines.merge_overlapping_intervals.decode_intervals import decode_intervals
+from vim_turing_machine.machines.merge_overlapping_intervals.encode_intervals import encode_intervals
+from vim_turing_machine.machines.merge_overlapping_intervals.linear_merge_intervals import LinearMergeOverlappingIntervalsGenerator
+from vim_turing_machine.machines.merge_overlapping_intervals.merge_overlapping_intervals import MergeOverlappingIntervalsGenerator
+from vim_turing_machine.turing_machine import COMPILED_TABLES
+from vim_turing_machine.turing_machine import TuringMachine
+from testing.util import merge
+from testing.util import random_intervals
+
+
+def run_machine(generator_class, intervals, num_bits, compiled=False):
+    machine = TuringMachine(
+        generator_class(num_bits).merge_overlapping_intervals_transitions(),
+        quiet=True,
+        compiled=compiled,
+    )
+    result = machine.run(encode_intervals(intervals, num_bits))
+
+    assert result.final_state == YES_FINAL_STATE
+    return decode_intervals(str(machine.tape), num_bits), result.num_steps
+
+
+@pytest.mark.parametrize('intervals', [
+    [],
+    [[1, 2]],
+    [[1, 5], [2, 3], [4, 6], [9, 11]],
+    [[1, 2], [2, 3], [5, 7]],
+    [[0, 0], [0, 0], [0, 15]],
+    [[3, 4], [5, 6], [7, 8]],
+    [[1, 15], [2, 3], [4, 5]],
+])
+def test_merges_intervals(intervals):
+    assert run_machine(LinearMergeOverlappingIntervalsGenerator, intervals, num_bits=4)[0] == merge(intervals)
+
+
+@pytest.mark.parametrize('num_bits', [2, 3, 5])
+def test_matches_the_original_machine(num_bits):
+    generator = random.Random(num_bits)
+    for _ in range(20):
+        intervals = random_intervals(generator, generator.randint(1, 6), num_bits)
+
+        linear, _ = run_machine(LinearMergeOverlappingIntervalsGenerator, intervals, num_bits)
+        original, _ = run_machine(MergeOverlappingIntervalsGenerator, intervals, num_bits)
+        assert linear == original == merge(intervals)
+
+
+def test_steps_grow_linearly():
+    generator = random.Random(0)
+    intervals = random_intervals(generator, 400, num_bits=8)
+
+    merged, num_steps = run_machine(LinearMergeOverlappingIntervalsGenerator, intervals, 8, compiled=COMPILED_TABLES)
+    _, half_num_steps = run_machine(LinearMergeOverlappingIntervalsGenerator, intervals[:200], 8, compiled=COMPILED_TABLES)
+
+    assert merged == merge(intervals)
+    assert num_steps < 2.2 * half_num_steps
+    # Bounded by a constant number of passes over 4 numbers per interval
+    assert num_steps < len(intervals) * 12 * 8 ** 2
@@ -0,0 +1,80 @@
+import random
+
+import pytest
+
+from vim_turing_machine.constants import YES_FINAL_STATE
+from vim_turing_machine.machines.merge_overlapping_intervals.decode_intervals import decode_intervals
+from vim_turing_machine.machines.merge_overlapping_intervals.encode_intervals import encode_intervals
+from vim_turing_machine.machines.merge_overlapping_intervals.two_tape_merge import NUM_TAPES
+from vim_turing_machine.machines.merge_overlapping_intervals.two_tape_merge import OUTPUT_TAPE
+from vim_turing_machine.machines.merge_overlapping_intervals.two_tape_merge import TwoTapeMergeOverlappingIntervalsGenerator
+from vim_turing_machine.multi_tape import decode_tapes
+from vim_turing_machine.multi_tape import encode_tapes
+from vim_turing_machine.multi_tape import lower_to_single_tape
+from vim_turing_machine.multi_tape import MultiTapeTuringMachine
+from vim_turing_machine.turing_machine import TuringMachine
+from testing.util import merge
+from testing.util import random_intervals
+
+
+def run_machine(intervals, num_bits):
+    machine = MultiTapeTuringMachine(
+        TwoTapeMergeOverlappingIntervalsGenerator(num_bits).merge_overlapping_intervals_transitions(),
+        NUM_TAPES,
+    )
+    result = machine.run([encode_intervals(intervals, num_bits), ''])
+
+    assert result.final_state == YES_FINAL_STATE
+    return decode_intervals(str(machine.tapes[OUTPUT_TAPE]), num_bits), result.num_steps
+
+
+@pytest.mark.parametrize('intervals', [
+    [],
+    [[1, 2]],
+    [[1, 5], [2, 3], [4, 6], [9, 11]],
+    [[1, 2], [2, 3], [5, 7]],
+    [[0, 0], [0, 0], [0, 15]],
+    [[3, 4], [5, 6], [7, 8]],
+    [[1, 15], [2, 3], [4, 5]],
+])
+def test_merges_intervals(intervals):
+    assert run_machine(intervals, num_bits=4)[0] == merge(intervals)
+
+
+@pytest.mark.parametrize('num_bits', [1, 2, 3, 5])
+def test_random_intervals(num_bits):
+    generator = random.Random(num_bits)
+    for _ in range(20):
+        intervals = random_intervals(generator, generator.randint(1, 8), num_bits)
+        assert run_machine(intervals, num_bits)[0] == merge(intervals)
+
+
+def test_lowered_machine():
+    num_bits = 3
+    transitions = lower_to_single_tape(
+        TwoTapeMergeOverlappingIntervalsGenerator(num_bits).merge_overlapping_intervals_transitions(),
+        NUM_TAPES,
+    )
+    generator = random.Random(0)
+    for _ in range(5):
+        intervals = random_intervals(generator, generator.randint(1, 5), num_bits)
+
+        machine = TuringMachine(transitions, quiet=True)
+        result = machine.run(encode_tapes([encode_intervals(intervals, num_bits), '']))
+        tapes, _ = decode_tapes(str(machine.tape), NUM_TAPES)
+
+        assert result.final_state == YES_FINAL_STATE
+        assert decode_intervals(tapes[OUTPUT_TAPE], num_bits) == merge(intervals)
+
+
+def test_steps_grow_linearly():
+    generator = random.Random(0)
+    intervals = random_intervals(generator, 4000, num_bits=8)
+
+    merged, num_steps = run_machine(intervals, 8)
+    _, half_num_steps = run_machine(intervals[:2000], 8)
+
+    assert merged == merge(intervals)
+    assert num_steps < 2.2 * half_num_steps
+    # A constant number of passes over 2 numbers per interval
+    assert num_steps < len(intervals) * 8 * 8
@@ -1,8 +1,11 @@
 import subprocess
 
+import pytest
+
 from vim_turing_machine.machines.merge_overlapping_intervals.decode_intervals import decode_intervals
 from vim_turing_machine.machines.merge_overlapping_intervals.encode_intervals import encode_intervals
 from vim_turing_machine.machines.merge_overlapping_intervals.merge_overlapping_intervals import MergeOverlappingIntervalsGenerator
+from vim_turing_machine.vim_constants import VIM_END_OF_TAPE
 from vim_turing_machine.vim_constants import VIM_MACHINE_FILENAME
 from vim_turing_machine.vim_machine import VimTuringMachine
 
@@ -10,14 +13,14 @@ from vim_turing_machine.vim_machine import VimTuringMachine
 NUM_BITS = 3
 
 
-def run_vim_machine(intervals):
+def run_vim_machine(intervals, **kwargs):
     initial_tape = encode_intervals(intervals, NUM_BITS)
 
     gen = MergeOverlappingIntervalsGenerator(NUM_BITS)
     merge_overlapping_intervals = VimTuringMachine(gen.merge_overlapping_intervals_transitions(), debug=False)
 
     # Write to the vim machine file
-    merge_overlapping_intervals.run(initial_tape=initial_tape)
+    merge_overlapping_intervals.run(initial_tape=initial_tape, **kwargs)
 
     subprocess.run(
         [
@@ -40,10 +43,10 @@ def read_contents_of_tape():
         found_beginning_of_tape = False
 
         for line in f:
-            # Look for the lines between '_t:' and 'notvalid'
+            # Look for the lines between '_t:' and the end of the tape
             if line.startswith('_t:'):
                 found_beginning_of_tape = True
-            elif line.startswith('notvalid'):
+            elif found_beginning_of_tape and line.startswith(VIM_END_OF_TAPE):
                 return convert_tape_to_string(tape_lines)
             elif found_beginning_of_tape:
                 tape_lines.append(line)
@@ -52,12 +55,38 @@ def read_contents_of_tape():
 
 
 def convert_tape_to_string(tape_lines):
-    return ''.join(tape_lines).replace(' ', '').replace('\n', '')
-
-
-def test_merge_intervals_in_vim():
-    run_vim_machine([[1, 2], [2, 3], [5, 7]])
+    return ''.join(tape_lines).replace('\n', '')
+
+
+@pytest.mark.parametrize('options', [
+    {},
+    {'profile_guided': True},
+    {'line_dispatch': True},
+    {'compact_states': True},
+    {'line_dispatch': True, 'compact_states': True},
+    {'fuse_chains': True},
+    {'line_dispatch': True, 'fuse_chains': True},
+])
+def test_merge_intervals_in_vim(options):
+    run_vim_machine([[1, 2], [2, 3], [5, 7]], **options)
     tape = read_contents_of_tape()
 
     intervals = decode_intervals(tape, num_bits=NUM_BITS)
     assert intervals == [[1, 3], [5, 7]]
+
+
+@pytest.mark.parametrize('options', [
+    {},
+    {'line_dispatch': True},
+    {'fuse_chains': True},
+    {'line_dispatch': True, 'fuse_chains': True},
+])
+def test_tape_grows_in_vim(options):
+    # Longer than a line of the tape, so the head moves across lines and
+    # the tape grows
+    intervals = [[0, 1], [1, 6], [2, 3], [4, 5], [6, 7], [7, 7]]
+    run_vim_machine(intervals, **options)
+    tape = read_contents_of_tape()
+
+    assert len(tape) > 40
+    assert decode_intervals(tape, num_bits=NUM_BITS) == [[0, 7]]
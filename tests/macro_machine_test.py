@@ -0,0 +1,93 @@
+import pytest
+
+from vim_turing_machine.constants import INITIAL_STATE
+from vim_turing_machine.constants import YES_FINAL_STATE
+from vim_turing_machine.machines.is_number_even import number_is_even_state_transitions
+from vim_turing_machine.machines.merge_overlapping_intervals.encode_intervals import encode_intervals
+from vim_turing_machine.macro_machine import MacroMachine
+from vim_turing_machine.struct import BACKWARDS
+from vim_turing_machine.struct import StateTransition
+from vim_turing_machine.tape import Tape
+from vim_turing_machine.tape import TwoWayTape
+from vim_turing_machine.turing_machine import MissingStateTransition
+from vim_turing_machine.turing_machine import NegativeTapePositionException
+from vim_turing_machine.turing_machine import TooManyStepsException
+from vim_turing_machine.turing_machine import TuringMachine
+from testing.util import move_left_to_blank
+from testing.util import run_both
+
+
+@pytest.mark.parametrize('block_size', [1, 2, 3])
+@pytest.mark.parametrize('tape', ['', '0', '1', '1001', '1010'])
+def test_is_number_even_matches_interpreter(tape, block_size):
+    interpreted, macro = run_both(number_is_even_state_transitions, tape, macro_block_size=block_size)
+    assert interpreted == macro
+
+
+@pytest.mark.parametrize('block_size', [1, 3, 4, 7])
+@pytest.mark.parametrize('max_steps', [None, 1, 17, 150, 151])
+def test_merge_overlapping_intervals_matches_interpreter(merge_transitions, block_size, max_steps):
+    tape = encode_intervals([[1, 3], [3, 4], [4, 5], [6, 7]], num_bits=3)
+
+    interpreted, macro = run_both(merge_transitions, tape, max_steps=max_steps, macro_block_size=block_size)
+    assert interpreted == macro
+
+
+@pytest.mark.parametrize('block_size', [1, 2, 4])
+def test_moving_off_the_tape(block_size):
+    interpreted, macro = run_both(move_left_to_blank, '0110', initial_cursor_position=2, macro_block_size=block_size)
+
+    assert interpreted == macro
+    assert macro[-1] is NegativeTapePositionException
+
+
+@pytest.mark.parametrize('block_size', [1, 2, 3])
+def test_moving_off_the_tape_into_a_final_state(block_size):
+    transitions = [StateTransition(INITIAL_STATE, '0', YES_FINAL_STATE, '1', BACKWARDS)]
+    machine = TuringMachine(transitions, quiet=True, macro_block_size=block_size)
+
+    # The first run caches the block, the second one reads it from the cache
+    for _ in range(2):
+        with pytest.raises(NegativeTapePositionException):
+            machine.run('0')
+
+
+def test_missing_transition():
+    machine = TuringMachine(number_is_even_state_transitions, quiet=True, macro_block_size=2)
+
+    with pytest.raises(MissingStateTransition) as excinfo:
+        machine.run('10a1')
+
+    assert excinfo.value.args[0] == ('onward!', 'a')
+    assert str(machine.tape) == '10a1'
+
+
+def test_loop_inside_a_block_hits_the_step_limit():
+    bounce = [
+        StateTransition('InitialState', '0', 'Back', '0', 1),
+        StateTransition('Back', '0', 'InitialState', '0', -1),
+    ]
+    machine = TuringMachine(bounce, quiet=True, macro_block_size=4)
+
+    with pytest.raises(TooManyStepsException):
+        machine.run('0000', max_steps=1001)
+
+    assert machine._num_steps == 1001
+    assert machine.cursor_position == 1
+    assert machine.current_state == 'Back'
+
+
+def test_block_results_are_reused(merge_transitions):
+    macro = MacroMachine(merge_transitions, block_size=3)
+    tape = Tape(encode_intervals([[1, 3], [3, 4], [6, 7]], num_bits=3))
+
+    macro.run(tape, 0, 'InitialState', 0, limit=10 ** 6)
+    num_cached_blocks = macro.num_cached_blocks
+
+    macro.run(Tape(encode_intervals([[1, 3], [3, 4], [6, 7]], num_bits=3)), 0, 'InitialState', 0, limit=10 ** 6)
+    assert macro.num_cached_blocks == num_cached_blocks
+
+
+def test_rejects_two_way_tapes():
+    with pytest.raises(ValueError):
+        TuringMachine(number_is_even_state_transitions, quiet=True, macro_block_size=2, tape_class=TwoWayTape)
@@ -0,0 +1,127 @@
+import pytest
+
+from vim_turing_machine.constants import BACKWARDS
+from vim_turing_machine.constants import BLANK_CHARACTER
+from vim_turing_machine.constants import DO_NOT_MOVE
+from vim_turing_machine.constants import FORWARDS
+from vim_turing_machine.constants import INITIAL_STATE
+from vim_turing_machine.constants import YES_FINAL_STATE
+from vim_turing_machine.multi_tape import decode_tapes
+from vim_turing_machine.multi_tape import encode_tapes
+from vim_turing_machine.multi_tape import lower_to_single_tape
+from vim_turing_machine.multi_tape import MultiTapeTuringMachine
+from vim_turing_machine.struct import MultiTapeStateTransition
+from vim_turing_machine.turing_machine import DuplicateStateTransitionException
+from vim_turing_machine.turing_machine import MissingStateTransition
+from vim_turing_machine.turing_machine import NegativeTapePositionException
+from vim_turing_machine.turing_machine import TooManyStepsException
+from vim_turing_machine.turing_machine import TuringMachine
+
+
+def transition(previous_state, previous_characters, next_state, next_characters, directions):
+    return MultiTapeStateTransition(
+        previous_state=previous_state,
+        previous_characters=tuple(previous_characters),
+        next_state=next_state,
+        next_characters=tuple(next_characters),
+        tape_pointer_directions=directions,
+    )
+
+
+# Copies the bits after the leading blank of tape 0 to tape 1 in reverse
+# order. Tape 0 is read backwards, so every direction gets used.
+reverse_transitions = [
+    transition(INITIAL_STATE, 'XX', 'FindEnd', 'XX', (FORWARDS, DO_NOT_MOVE)),
+    transition('FindEnd', '0X', 'FindEnd', '0X', (FORWARDS, DO_NOT_MOVE)),
+    transition('FindEnd', '1X', 'FindEnd', '1X', (FORWARDS, DO_NOT_MOVE)),
+    transition('FindEnd', 'XX', 'Copy', 'XX', (BACKWARDS, DO_NOT_MOVE)),
+    transition('Copy', '0X', 'Copy', '00', (BACKWARDS, FORWARDS)),
+    transition('Copy', '1X', 'Copy', '11', (BACKWARDS, FORWARDS)),
+    transition('Copy', 'XX', YES_FINAL_STATE, 'XX', (DO_NOT_MOVE, DO_NOT_MOVE)),
+]
+
+
+def run_lowered(transitions, tapes, **kwargs):
+    machine = TuringMachine(lower_to_single_tape(transitions, len(tapes)), quiet=True)
+    result = machine.run(encode_tapes(tapes), **kwargs)
+
+    lowered_tapes, cursor_positions = decode_tapes(str(machine.tape), len(tapes))
+    return result.final_state, [tape.rstrip(BLANK_CHARACTER) for tape in lowered_tapes], cursor_positions
+
+
+def run_native(transitions, tapes, **kwargs):
+    machine = MultiTapeTuringMachine(transitions, len(tapes))
+    result = machine.run(tapes, **kwargs)
+
+    return result.final_state, [str(tape).rstrip(BLANK_CHARACTER) for tape in machine.tapes], list(result.cursor_position)
+
+
+@pytest.mark.parametrize('tape', ['X', 'X0', 'X1', 'X0110', 'X1101001'])
+def test_reverse(tape):
+    final_state, tapes, cursor_positions = run_native(reverse_transitions, [tape, ''])
+
+    assert final_state == YES_FINAL_STATE
+    assert tapes == [tape.rstrip(BLANK_CHARACTER), tape[:0:-1]]
+    assert cursor_positions == [0, len(tape) - 1]
+
+
+@pytest.mark.parametrize('tape', ['X', 'X0', 'X1', 'X0110', 'X1101001'])
+def test_lowered_machine_matches(tape):
+    assert run_lowered(reverse_transitions, [tape, '']) == run_native(reverse_transitions, [tape, ''])
+
+
+def test_lowered_machine_with_three_tapes():
+    # Moves the heads of the tapes apart
+    transitions = [
+        transition(INITIAL_STATE, '1XX', INITIAL_STATE, '1X1', (FORWARDS, DO_NOT_MOVE, FORWARDS)),
+        transition(INITIAL_STATE, 'XXX', 'Back', 'XXX', (DO_NOT_MOVE, FORWARDS, BACKWARDS)),
+        transition('Back', 'XX1', 'BackAgain', 'X00', (DO_NOT_MOVE, FORWARDS, BACKWARDS)),
+        transition('BackAgain', 'XX1', YES_FINAL_STATE, 'X10', (DO_NOT_MOVE, DO_NOT_MOVE, DO_NOT_MOVE)),
+    ]
+    tapes = ['111', 'X', '']
+
+    assert run_native(transitions, tapes) == (YES_FINAL_STATE, ['111', 'X01', '100'], [3, 2, 1])
+    assert run_lowered(transitions, tapes) == run_native(transitions, tapes)
+
+
+def test_steps_are_counted_like_turing_machine():
+    machine = MultiTapeTuringMachine(reverse_transitions, num_tapes=2)
+    assert machine.run(['X01', '']).num_steps == 6
+
+    with pytest.raises(TooManyStepsException):
+        machine.run(['X01', ''], max_steps=6)
+
+
+@pytest.mark.parametrize('run', [run_native, run_lowered])
+def test_missing_transition(run):
+    with pytest.raises(MissingStateTransition):
+        run(reverse_transitions, ['0', ''])
+
+
+@pytest.mark.parametrize('run', [run_native, run_lowered])
+def test_negative_position(run):
+    transitions = [transition(INITIAL_STATE, 'XX', YES_FINAL_STATE, 'XX', (FORWARDS, BACKWARDS))]
+
+    with pytest.raises(NegativeTapePositionException):
+        run(transitions, ['', ''])
+
+
+def test_duplicate_transitions():
+    with pytest.raises(DuplicateStateTransitionException):
+        MultiTapeTuringMachine(reverse_transitions + reverse_transitions[:1], num_tapes=2)
+
+
+def test_invalid_transitions():
+    with pytest.raises(AssertionError):
+        MultiTapeTuringMachine(reverse_transitions, num_tapes=3)
+
+    with pytest.raises(AssertionError):
+        transition(INITIAL_STATE, 'XX', YES_FINAL_STATE, 'X', (FORWARDS, FORWARDS)).validate()
+
+
+def test_encode_tapes():
+    tape = encode_tapes(['01', '1'])
+
+    assert tape == '10' '11' '01' '0X'
+    assert decode_tapes(tape, 2) == (['01', '1X'], [0, 0])
+    assert encode_tapes(['', '']) == '1X1X'
@@ -0,0 +1,116 @@
+import random
+import subprocess
+import sys
+
+import pytest
+
+from vim_turing_machine.constants import BACKWARDS
+from vim_turing_machine.constants import FORWARDS
+from vim_turing_machine.constants import INITIAL_STATE
+from vim_turing_machine.constants import YES_FINAL_STATE
+from vim_turing_machine.machines.is_number_even import number_is_even_state_transitions
+from vim_turing_machine.machines.merge_overlapping_intervals.encode_intervals import encode_intervals
+from vim_turing_machine.machines.merge_overlapping_intervals.merge_overlapping_intervals import MergeOverlappingIntervalsGenerator
+from vim_turing_machine.optimizer import merge_equivalent_states
+from vim_turing_machine.optimizer import optimize_transitions
+from vim_turing_machine.optimizer import reachable_states
+from vim_turing_machine.struct import OptimizationReport
+from vim_turing_machine.struct import StateTransition
+from vim_turing_machine.turing_machine import TuringMachine
+
+
+def test_unreachable_states_are_pruned():
+    transitions = list(number_is_even_state_transitions) + [
+        StateTransition('unused', '0', 'alsoUnused', '1', FORWARDS),
+        StateTransition('alsoUnused', '0', YES_FINAL_STATE, '1', FORWARDS),
+        StateTransition(YES_FINAL_STATE, '0', INITIAL_STATE, '0', FORWARDS),
+    ]
+
+    optimized, report = optimize_transitions(transitions)
+
+    assert sorted(optimized) == sorted(number_is_even_state_transitions)
+    assert report.num_transitions_before == len(number_is_even_state_transitions) + 3
+    assert report.num_transitions_after == len(number_is_even_state_transitions)
+
+
+def test_reachable_states():
+    assert reachable_states(number_is_even_state_transitions) == {INITIAL_STATE, 'onward!', 'eof', 'YES', 'NO'}
+
+
+def test_equivalent_states_are_merged():
+    transitions = [
+        StateTransition(INITIAL_STATE, '0', 'A', '0', FORWARDS),
+        StateTransition(INITIAL_STATE, '1', 'B', '1', FORWARDS),
+        StateTransition('A', '0', 'A', '0', FORWARDS),
+        StateTransition('A', '1', YES_FINAL_STATE, '1', BACKWARDS),
+        StateTransition('B', '0', 'B', '0', FORWARDS),
+        StateTransition('B', '1', YES_FINAL_STATE, '1', BACKWARDS),
+    ]
+
+    assert merge_equivalent_states(transitions) == [
+        StateTransition(INITIAL_STATE, '0', 'A', '0', FORWARDS),
+        StateTransition(INITIAL_STATE, '1', 'A', '1', FORWARDS),
+        StateTransition('A', '0', 'A', '0', FORWARDS),
+        StateTransition('A', '1', YES_FINAL_STATE, '1', BACKWARDS),
+    ]
+
+
+def test_states_that_behave_differently_are_kept():
+    transitions = [
+        StateTransition(INITIAL_STATE, '0', 'A', '0', FORWARDS),
+        StateTransition(INITIAL_STATE, '1', 'B', '1', FORWARDS),
+        StateTransition('A', '0', 'A', '0', FORWARDS),
+        StateTransition('A', '1', YES_FINAL_STATE, '1', BACKWARDS),
+        StateTransition('B', '0', 'B', '0', FORWARDS),
+        StateTransition('B', '1', 'NO', '1', BACKWARDS),
+    ]
+
+    assert sorted(merge_equivalent_states(transitions)) == sorted(transitions)
+
+
+def test_report_str():
+    assert str(OptimizationReport(10, 5, 30, 12)) == 'States: 10 -> 5, transitions: 30 -> 12'
+
+
+@pytest.mark.parametrize('num_bits', [3, 4])
+def test_merge_overlapping_intervals_runs_the_same(num_bits):
+    transitions = MergeOverlappingIntervalsGenerator(num_bits).merge_overlapping_intervals_transitions()
+    optimized, report = optimize_transitions(transitions)
+
+    assert report.num_states_after < report.num_states_before
+    assert report.num_transitions_after < report.num_transitions_before
+    assert report.num_transitions_after == len(optimized)
+
+    generator = random.Random(num_bits)
+    for _ in range(10):
+        intervals = sorted(
+            sorted(generator.sample(range(2 ** num_bits), 2))
+            for _ in range(generator.randint(1, 5))
+        )
+        tape = encode_intervals(intervals, num_bits)
+
+        results = []
+        for machine_transitions in (transitions, optimized):
+            machine = TuringMachine(machine_transitions, quiet=True)
+            result = machine.run(tape)
+            results.append((str(machine.tape), result.final_state, result.num_steps, result.cursor_position))
+
+        assert results[0] == results[1]
+
+
+def test_optimizing_twice_changes_nothing():
+    transitions = MergeOverlappingIntervalsGenerator(3).merge_overlapping_intervals_transitions()
+    optimized, _ = optimize_transitions(transitions)
+
+    assert optimize_transitions(optimized)[0] == optimized
+
+
+def test_machines_are_imported_when_needed():
+    modules = subprocess.check_output([
+        sys.executable,
+        '-c',
+        'import sys, vim_turing_machine.optimizer; print(sorted(sys.modules))',
+    ]).decode()
+
+    assert 'vim_turing_machine.optimizer' in modules
+    assert 'vim_turing_machine.machines' not in modules
@@ -0,0 +1,82 @@
+import json
+
+from vim_turing_machine.constants import BLANK_CHARACTER
+from vim_turing_machine.constants import INITIAL_STATE
+from vim_turing_machine.machines.is_number_even import number_is_even_state_transitions
+from vim_turing_machine.machines.merge_overlapping_intervals.encode_intervals import encode_intervals
+from vim_turing_machine.machines.merge_overlapping_intervals.merge_overlapping_intervals import MergeOverlappingIntervalsGenerator
+from vim_turing_machine.profiler import OTHER_PREFIX
+from vim_turing_machine.profiler import Profiler
+from vim_turing_machine.profiler import split_state_name
+from vim_turing_machine.turing_machine import TuringMachine
+
+
+def profile(transitions, tape):
+    profiler = Profiler()
+    result = TuringMachine(list(transitions), quiet=True, profiler=profiler).run(tape)
+    return profiler, result
+
+
+def test_split_state_name():
+    assert split_state_name('InitialStateCopy1Bit0Forward') == ['Initial', 'State', 'Copy1', 'Bit0', 'Forward']
+    assert split_state_name('YES') == ['YES']
+    assert split_state_name('onward!') == ['onward!']
+
+
+def test_counts_transitions_and_states():
+    profiler, result = profile(number_is_even_state_transitions, '1010')
+
+    # The transition into the final state fires but isn't a counted step
+    assert profiler.num_transitions_fired == result.num_steps + 1
+    assert profiler.head_travel == 6
+
+    states = profiler.state_totals()
+    assert states[INITIAL_STATE] == {'hits': 1, 'head_travel': 1}
+    assert states['onward!'] == {'hits': 4, 'head_travel': 4}
+    assert states['eof'] == {'hits': 1, 'head_travel': 1}
+
+    [blank_transition] = [
+        transition
+        for transition in profiler.transition_hits
+        if transition.previous_character == BLANK_CHARACTER
+    ]
+    assert profiler.transition_hits[blank_transition] == 1
+
+
+def test_profiled_run_matches_regular_run():
+    transitions = MergeOverlappingIntervalsGenerator(num_bits=3).merge_overlapping_intervals_transitions()
+    tape = encode_intervals([[1, 3], [3, 4], [6, 7]], num_bits=3)
+
+    profiler, result = profile(transitions, tape)
+    regular_result = TuringMachine(transitions, quiet=True).run(tape)
+
+    assert result.num_steps == regular_result.num_steps
+    assert result.cursor_position == regular_result.cursor_position
+
+
+def test_prefix_totals():
+    transitions = MergeOverlappingIntervalsGenerator(num_bits=3).merge_overlapping_intervals_transitions()
+    profiler, _ = profile(transitions, encode_intervals([[1, 3], [3, 4], [6, 7]], num_bits=3))
+
+    totals = profiler.prefix_totals(['CheckNextSetOfHours', 'CopyNextSetOfHours', 'OpeningLessThan'])
+    assert sum(total['hits'] for total in totals.values()) == profiler.num_transitions_fired
+    assert totals['CheckNextSetOfHours']['hits'] > 0
+    assert totals[OTHER_PREFIX]['hits'] > 0
+
+    by_first_word = profiler.prefix_totals()
+    assert 'Initial' in by_first_word
+
+
+def test_exports(tmpdir):
+    profiler, _ = profile(number_is_even_state_transitions, '1010')
+
+    json_file = tmpdir.join('profile.json')
+    profiler.write_json(json_file.strpath)
+    exported = json.loads(json_file.read())
+    assert exported['transitions_fired'] == 6
+    assert exported['transitions'][0]['hits'] == 2
+    assert exported['states']['onward!']['hits'] == 4
+
+    collapsed_file = tmpdir.join('profile.folded')
+    profiler.write_collapsed(collapsed_file.strpath)
+    assert 'Initial;State 1' in collapsed_file.read().splitlines()
@@ -0,0 +1,89 @@
+import sys
+
+import pytest
+
+from vim_turing_machine.constants import BLANK_CHARACTER
+from vim_turing_machine.constants import YES_FINAL_STATE
+from vim_turing_machine.tape import Tape
+from vim_turing_machine.tape import TwoWayTape
+from vim_turing_machine.turing_machine import NegativeTapePositionException
+from vim_turing_machine.turing_machine import TuringMachine
+from testing.util import move_left_to_blank
+
+
+def test_empty_tape_is_a_single_blank():
+    tape = Tape()
+    assert str(tape) == BLANK_CHARACTER
+    assert len(tape) == 1
+
+
+def test_tape_view():
+    tape = Tape('0110')
+    tape[1] = BLANK_CHARACTER
+
+    assert tape[0] == '0'
+    assert list(tape) == ['0', BLANK_CHARACTER, '1', '0']
+    assert ''.join(tape) == '0X10'
+
+    with pytest.raises(IndexError):
+        tape[4]
+
+    with pytest.raises(IndexError):
+        tape[-1]
+
+
+def test_extend_to_grows_geometrically():
+    tape = Tape('01')
+    tape.extend_to(2)
+
+    assert str(tape) == '01' + BLANK_CHARACTER
+    assert len(tape.cells) > len(tape)
+
+    capacity = len(tape.cells)
+    for position in range(3, capacity):
+        tape.extend_to(position)
+
+    assert len(tape.cells) == capacity
+    assert len(tape) == capacity
+
+
+def test_one_way_tape_cannot_grow_left():
+    with pytest.raises(IndexError):
+        Tape('01').extend_to(-1)
+
+
+def test_two_way_tape_grows_left():
+    tape = TwoWayTape('01')
+    tape.extend_to(-2)
+    tape[-2] = '1'
+
+    assert tape.start == -2
+    assert str(tape) == '1' + BLANK_CHARACTER + '01'
+    assert tape[0] == '0'
+
+
+def test_tape_uses_a_byte_per_cell():
+    num_cells = 100000
+    tape = Tape('0' * num_cells)
+    list_tape = list('0' * num_cells)
+
+    assert sys.getsizeof(tape.cells) * 7 < sys.getsizeof(list_tape)
+
+
+@pytest.mark.parametrize('compiled', [False, True])
+def test_negative_tape_position_on_one_way_tape(compiled):
+    machine = TuringMachine(move_left_to_blank, quiet=True, compiled=compiled)
+
+    with pytest.raises(NegativeTapePositionException):
+        machine.run('0110')
+
+
+@pytest.mark.parametrize('compiled', [False, True])
+def test_two_way_machine(compiled):
+    machine = TuringMachine(move_left_to_blank, quiet=True, compiled=compiled, tape_class=TwoWayTape)
+    machine.run('0110', initial_cursor_position=2)
+
+    assert machine.current_state == YES_FINAL_STATE
+    assert machine.cursor_position == -2
+    assert machine.tape.start == -2
+    assert str(machine.tape) == BLANK_CHARACTER + '10110'
@@ -0,0 +1,108 @@
+import pytest
+
+from vim_turing_machine.constants import YES_FINAL_STATE
+from vim_turing_machine.machines.is_number_even import number_is_even_state_transitions
+from vim_turing_machine.machines.merge_overlapping_intervals.encode_intervals import encode_intervals
+from vim_turing_machine.machines.merge_overlapping_intervals.merge_overlapping_intervals import MergeOverlappingIntervalsGenerator
+from vim_turing_machine.trace import TraceReader
+from vim_turing_machine.trace import TraceWriter
+from vim_turing_machine.turing_machine import TooManyStepsException
+from vim_turing_machine.turing_machine import TuringMachine
+
+
+@pytest.fixture
+def trace_file(tmpdir):
+    return tmpdir.join('machine.trace').strpath
+
+
+def write_trace(trace_file, transitions, tape, **kwargs):
+    machine = TuringMachine(transitions, quiet=True, tracer=TraceWriter(trace_file, **kwargs))
+    return machine.run(tape)
+
+
+@pytest.mark.parametrize('sample_rate', [1, 10])
+def test_replays_every_step(trace_file, sample_rate):
+    transitions = MergeOverlappingIntervalsGenerator(num_bits=3).merge_overlapping_intervals_transitions()
+    tape = encode_intervals([[1, 3], [3, 4], [6, 7]], num_bits=3)
+    result = write_trace(trace_file, transitions, tape, sample_rate=sample_rate, keyframe_interval=50)
+
+    reader = TraceReader(trace_file)
+    assert reader.num_steps == result.num_steps + 1
+    assert [step for step, _, _ in reader.iter_deltas()] == list(range(0, reader.num_steps, sample_rate))
+    assert sorted(reader.keyframes) == list(range(0, reader.num_steps, 50)) + [reader.num_steps]
+
+    expected = TuringMachine(transitions, quiet=True)
+    expected.initialize_machine(tape)
+    for step in range(reader.num_steps + 1):
+        machine = reader.configuration_at(step)
+        assert str(machine.tape) == str(expected.tape)
+        assert machine.cursor_position == expected.cursor_position
+        assert machine.current_state == expected.current_state
+
+        if step < reader.num_steps:
+            expected.step()
+
+    assert machine.current_state == YES_FINAL_STATE
+
+
+def test_deltas_record_transition_and_cell(trace_file):
+    write_trace(trace_file, number_is_even_state_transitions, '10')
+    reader = TraceReader(trace_file)
+
+    assert [(transition.previous_state, position) for _, transition, position in reader.iter_deltas()] == [
+        ('InitialState', 0),
+        ('onward!', 1),
+        ('onward!', 2),
+        ('eof', 1),
+    ]
+
+
+def test_trace_is_written_when_run_fails(trace_file):
+    machine = TuringMachine(number_is_even_state_transitions, quiet=True, tracer=TraceWriter(trace_file))
+    with pytest.raises(TooManyStepsException):
+        machine.run('1111', max_steps=2)
+
+    reader = TraceReader(trace_file)
+    assert reader.num_steps == 2
+    assert reader.configuration_at(2).cursor_position == 2
+
+
+def test_print_configuration(trace_file, capsys):
+    write_trace(trace_file, number_is_even_state_transitions, '10')
+
+    TraceReader(trace_file).print_configuration(3)
+
+    out = capsys.readouterr().out
+    assert 'Step: 3' in out
+    assert 'State: eof' in out
+
+
+def test_invalid_step(trace_file):
+    write_trace(trace_file, number_is_even_state_transitions, '10')
+
+    with pytest.raises(ValueError):
+        TraceReader(trace_file).configuration_at(100)
+
+
+def test_rebuilds_from_deltas(trace_file, monkeypatch):
+    write_trace(trace_file, number_is_even_state_transitions, '1010', keyframe_interval=100)
+    reader = TraceReader(trace_file)
+
+    def fail(machine):
+        raise AssertionError('Every step is in the trace')
+
+    monkeypatch.setattr(TuringMachine, 'step', fail)
+    machine = reader.configuration_at(4)
+    assert (machine.cursor_position, machine.current_state) == (4, 'onward!')
+
+
+def test_resumed_run_appends_to_the_trace(trace_file):
+    machine = TuringMachine(number_is_even_state_transitions, quiet=True, tracer=TraceWriter(trace_file))
+    with pytest.raises(TooManyStepsException):
+        machine.run('1010', max_steps=2)
+    result = machine.resume()
+
+    reader = TraceReader(trace_file)
+    assert reader.num_steps == result.num_steps + 1
+    assert [step for step, _, _ in reader.iter_deltas()] == list(range(reader.num_steps))
+    assert reader.configuration_at(reader.num_steps).current_state == YES_FINAL_STATE
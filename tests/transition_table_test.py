@@ -0,0 +1,90 @@
+import pytest
+
+from vim_turing_machine.constants import INITIAL_STATE
+from vim_turing_machine.machines.is_number_even import number_is_even_state_transitions
+from vim_turing_machine.struct import StateTransition
+from vim_turing_machine.transition_table import dispatch_key
+from vim_turing_machine.transition_table import TransitionTable
+from vim_turing_machine.turing_machine import DuplicateStateTransitionException
+from vim_turing_machine.turing_machine import MissingStateTransition
+from vim_turing_machine.turing_machine import TuringMachine
+
+
+def test_behaves_like_a_list_of_transitions(merge_transitions):
+    table = TransitionTable(merge_transitions)
+
+    assert len(table) == len(merge_transitions)
+    assert list(table) == merge_transitions
+    assert table[0] == merge_transitions[0]
+    assert table[-1] == merge_transitions[-1]
+    assert table[2:5] == merge_transitions[2:5]
+    assert table == merge_transitions
+    assert all(isinstance(transition, StateTransition) for transition in table)
+
+
+def test_state_names_are_stored_once(merge_transitions):
+    table = TransitionTable(merge_transitions)
+
+    states = {transition.previous_state for transition in merge_transitions} | {
+        transition.next_state for transition in merge_transitions
+    }
+    assert sorted(table.states) == sorted(states)
+    assert table[0].previous_state is table.states[table.previous_states[0]]
+
+
+def test_built_from_a_generator():
+    table = TransitionTable(transition for transition in number_is_even_state_transitions)
+    assert table == list(number_is_even_state_transitions)
+
+
+def test_from_columns():
+    table = TransitionTable.from_columns(
+        states=[INITIAL_STATE, 'YES'],
+        previous_states=[0, 0],
+        previous_characters=b'01',
+        next_states=[0, 1],
+        next_characters=b'10',
+        directions=[1, -1],
+    )
+
+    assert list(table) == [
+        StateTransition(INITIAL_STATE, '0', INITIAL_STATE, '1', 1),
+        StateTransition(INITIAL_STATE, '1', 'YES', '0', -1),
+    ]
+
+
+def test_turing_machine_stores_a_table():
+    machine = TuringMachine(list(number_is_even_state_transitions), quiet=True)
+
+    assert isinstance(machine._state_transitions, TransitionTable)
+    assert machine.run('10').num_steps == 3
+
+
+def test_turing_machine_validates_tables():
+    table = TransitionTable(list(number_is_even_state_transitions) * 2)
+
+    with pytest.raises(DuplicateStateTransitionException):
+        TuringMachine(table, quiet=True)
+
+
+def test_index():
+    table = TransitionTable(number_is_even_state_transitions)
+    index = table.index()
+
+    assert len(index) == len(table)
+    for key, transition_index in index.items():
+        transition = table[transition_index]
+        assert key == dispatch_key(table.state_ids[transition.previous_state], ord(transition.previous_character))
+
+
+def test_turing_machine_dispatches_on_the_index():
+    machine = TuringMachine(number_is_even_state_transitions, quiet=True)
+
+    machine.initialize_machine('10')
+    assert machine.get_state_transition() == number_is_even_state_transitions[2]
+    assert machine.run('10').final_state == 'YES'
+
+    machine.initialize_machine('10')
+    machine.current_state = 'Unknown'
+    with pytest.raises(MissingStateTransition):
+        machine.resume()
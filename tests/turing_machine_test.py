@@ -1,8 +1,14 @@
 import pytest
 
 from vim_turing_machine.constants import FORWARDS
+from vim_turing_machine.constants import NO_FINAL_STATE
+from vim_turing_machine.constants import YES_FINAL_STATE
+from vim_turing_machine.machines.is_number_even import number_is_even_state_transitions
 from vim_turing_machine.struct import StateTransition
 from vim_turing_machine.turing_machine import DuplicateStateTransitionException
+from vim_turing_machine.turing_machine import print_result
+from vim_turing_machine.turing_machine import TooManyStepsException
+from vim_turing_machine.turing_machine import TuringMachine
 from vim_turing_machine.turing_machine import validate_state_transitions
 
 
@@ -19,6 +25,24 @@ def test_invalid_state_transition():
         ])
 
 
+@pytest.mark.parametrize('invalid_field', [
+    {'previous_character': 'Not a valid character'},
+    {'next_character': '01'},
+    {'tape_pointer_direction': 1000},
+])
+def test_machine_with_an_invalid_state_transition(invalid_field):
+    transition = StateTransition(
+        previous_state='foo',
+        previous_character='0',
+        next_state='bar',
+        next_character='0',
+        tape_pointer_direction=FORWARDS,
+    )._replace(**invalid_field)
+
+    with pytest.raises(AssertionError):
+        TuringMachine(iter([transition]), quiet=True)
+
+
 def test_valid_states():
     validate_state_transitions(
         [
@@ -50,3 +74,68 @@ def test_duplicate_states():
     )
     with pytest.raises(DuplicateStateTransitionException):
         validate_state_transitions([state, state])
+
+
+def test_run_returns_result():
+    machine = TuringMachine(number_is_even_state_transitions, quiet=True)
+    result = machine.run('1010')
+
+    assert result.final_state == YES_FINAL_STATE
+    assert result.num_steps == 5
+    assert result.tape_length == 5
+    assert result.cursor_position == 4
+    assert result.wall_time >= 0
+
+
+@pytest.mark.parametrize('compiled', [False, True])
+@pytest.mark.parametrize('max_steps, raises', [
+    (0, True),
+    (5, True),
+    (6, False),
+])
+def test_max_steps_bounds_the_run(compiled, max_steps, raises):
+    # '1010' takes 5 steps plus the step into the final state
+    machine = TuringMachine(number_is_even_state_transitions, quiet=True, compiled=compiled)
+
+    if raises:
+        with pytest.raises(TooManyStepsException):
+            machine.run('1010', max_steps=max_steps)
+        assert machine._num_steps == max(max_steps, 1)
+    else:
+        assert machine.run('1010', max_steps=max_steps).num_steps == 5
+
+
+def test_reporter_is_opt_in(capsys):
+    reports = []
+    machine = TuringMachine(
+        number_is_even_state_transitions,
+        reporter=lambda machine, result: reports.append(result),
+    )
+    result = machine.run('1')
+
+    assert reports == [result]
+    assert capsys.readouterr().out == ''
+
+
+def test_runs_report_nothing_by_default(capsys):
+    TuringMachine(number_is_even_state_transitions).run('1')
+
+    assert capsys.readouterr().out == ''
+
+
+def test_print_result(capsys):
+    TuringMachine(number_is_even_state_transitions, reporter=print_result).run('1')
+
+    assert 'Final state: {}'.format(NO_FINAL_STATE) in capsys.readouterr().out
+
+
+def test_quiet_machines_do_not_report(capsys):
+    reports = []
+    machine = TuringMachine(
+        number_is_even_state_transitions,
+        quiet=True,
+        reporter=lambda machine, result: reports.append(result),
+    )
+    machine.run('1')
+
+    assert reports == []
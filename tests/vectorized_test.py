@@ -0,0 +1,66 @@
+import pytest
+
+from vim_turing_machine.constants import YES_FINAL_STATE
+from vim_turing_machine.machines.is_number_even import number_is_even_state_transitions
+from vim_turing_machine.machines.merge_overlapping_intervals.merge_overlapping_intervals import MergeOverlappingIntervalsGenerator
+from vim_turing_machine.turing_machine import MissingStateTransition
+from vim_turing_machine.turing_machine import TooManyStepsException
+from vim_turing_machine.turing_machine import TuringMachine
+from vim_turing_machine.vectorized import intervals_from_results
+from vim_turing_machine.vectorized import tapes_from_intervals
+from vim_turing_machine.vectorized import VectorizedTuringMachine
+
+
+def assert_matches_turing_machine(transitions, tapes, results, max_steps):
+    for tape, result in zip(tapes, results):
+        machine = TuringMachine(transitions, quiet=True)
+        try:
+            machine.run(tape, max_steps=max_steps)
+        except TooManyStepsException:
+            assert isinstance(result.error, TooManyStepsException)
+        else:
+            assert result.error is None
+
+        assert result.final_state == machine.current_state
+        assert result.num_steps == machine._num_steps
+        assert result.tape == str(machine.tape)
+
+
+def test_is_number_even():
+    tapes = ['', '1', '0', '1001', '1010', '1' * 100]
+    results = VectorizedTuringMachine(number_is_even_state_transitions).run(tapes)
+
+    assert [result.index for result in results] == list(range(len(tapes)))
+    assert_matches_turing_machine(number_is_even_state_transitions, tapes, results, max_steps=None)
+
+
+@pytest.mark.parametrize('max_steps', [None, 150])
+def test_merge_overlapping_intervals(max_steps):
+    transitions = MergeOverlappingIntervalsGenerator(num_bits=3).merge_overlapping_intervals_transitions()
+    interval_lists = [
+        [[0, 1]],
+        [[0, 1], [5, 6]],
+        [[0, 5], [2, 3]],
+        [[1, 3], [3, 4], [4, 5], [6, 7]],
+    ]
+    tapes = tapes_from_intervals(interval_lists, num_bits=3)
+
+    results = VectorizedTuringMachine(transitions).run(tapes, max_steps=max_steps)
+
+    assert_matches_turing_machine(transitions, tapes, results, max_steps=max_steps)
+    if max_steps is None:
+        assert intervals_from_results(results, num_bits=3) == [
+            [[0, 1]],
+            [[0, 1], [5, 6]],
+            [[0, 5]],
+            [[1, 5], [6, 7]],
+        ]
+
+
+def test_missing_transition_keeps_unknown_characters():
+    results = VectorizedTuringMachine(number_is_even_state_transitions).run(['10a1', '10'])
+
+    assert isinstance(results[0].error, MissingStateTransition)
+    assert results[0].error.args[0] == ('onward!', 'a')
+    assert results[0].tape == '10a1'
+    assert results[1].final_state == YES_FINAL_STATE
@@ -0,0 +1,181 @@
+import re
+
+import pytest
+
+from vim_turing_machine.constants import BACKWARDS
+from vim_turing_machine.constants import BLANK_CHARACTER
+from vim_turing_machine.constants import FORWARDS
+from vim_turing_machine.constants import INITIAL_STATE
+from vim_turing_machine.constants import YES_FINAL_STATE
+from vim_turing_machine.machines.is_number_even import ADVANCE_TO_END_OF_NUMBER
+from vim_turing_machine.machines.is_number_even import number_is_even_state_transitions
+from vim_turing_machine.machines.merge_overlapping_intervals.encode_intervals import encode_intervals
+from vim_turing_machine.machines.merge_overlapping_intervals.merge_overlapping_intervals import MergeOverlappingIntervalsGenerator
+from vim_turing_machine.struct import FusedStateTransition
+from vim_turing_machine.struct import StateTransition
+from vim_turing_machine.turing_machine import TooManyStepsException
+from vim_turing_machine.vim_constants import VIM_END_OF_TAPE
+from vim_turing_machine.vim_constants import VIM_MACHINE_FILENAME
+from vim_turing_machine.vim_machine import chain_links
+from vim_turing_machine.vim_machine import count_transition_hits
+from vim_turing_machine.vim_machine import create_dispatch_table
+from vim_turing_machine.vim_machine import dispatch_table_states
+from vim_turing_machine.vim_machine import fuse_transition_chains
+from vim_turing_machine.vim_machine import order_by_hits
+from vim_turing_machine.vim_machine import scan_states
+from vim_turing_machine.vim_machine import search_distance
+from vim_turing_machine.vim_machine import VimStateTransitionAdapter
+from vim_turing_machine.vim_machine import VimTuringMachine
+
+
+def test_count_transition_hits():
+    transitions = list(number_is_even_state_transitions)
+    hits = count_transition_hits(transitions, '1101')
+
+    # Including the transition into the final state
+    assert sum(hits.values()) == 6
+    assert set(hits) <= set(transitions)
+
+
+def test_count_transition_hits_of_failed_run():
+    # There is no transition for the x
+    hits = count_transition_hits(list(number_is_even_state_transitions), '0x1')
+    assert sum(hits.values()) == 1
+
+
+def test_count_transition_hits_stops_at_the_step_limit():
+    with pytest.raises(TooManyStepsException):
+        count_transition_hits(list(number_is_even_state_transitions), '1101', max_steps=2)
+
+
+def test_order_by_hits():
+    transitions = MergeOverlappingIntervalsGenerator(num_bits=3).merge_overlapping_intervals_transitions()
+    hits = count_transition_hits(transitions, encode_intervals([[1, 2], [2, 3], [5, 7]], 3))
+    ordered = order_by_hits(transitions, hits)
+
+    assert sorted(ordered) == sorted(transitions)
+    num_unused = len(transitions) - len(hits)
+    assert [hits[transition] for transition in ordered] == sorted(hits.values(), reverse=True) + [0] * num_unused
+    assert search_distance(ordered, hits) < search_distance(transitions, hits) / 3
+
+    # Transitions that never fire keep their order
+    assert [transition for transition in ordered if not hits[transition]] == [
+        transition for transition in transitions if not hits[transition]
+    ]
+
+
+def test_profile_guided_vim_machine(tmpdir, capsys):
+    transitions = list(number_is_even_state_transitions)
+    with tmpdir.as_cwd():
+        VimTuringMachine(transitions, quiet=True).run('1101', profile_guided=True)
+        machine = tmpdir.join(VIM_MACHINE_FILENAME).read()
+
+    hits = count_transition_hits(transitions, '1101')
+    hottest = max(transitions, key=lambda transition: hits[transition])
+    first_transition = machine.split('_s:  # State transitions\n')[1].splitlines()[0]
+
+    assert first_transition.startswith('_{}-{}:'.format(hottest.previous_state, hottest.previous_character))
+    assert 'Search distance: ' in capsys.readouterr().out
+
+
+def test_profile_guided_vim_machine_hits_the_step_limit(tmpdir, capsys):
+    transitions = list(number_is_even_state_transitions)
+    with tmpdir.as_cwd():
+        VimTuringMachine(transitions, quiet=True).run('1101', profile_guided=True, profile_max_steps=2)
+        machine = tmpdir.join(VIM_MACHINE_FILENAME).read()
+
+    first_transition = machine.split('_s:  # State transitions\n')[1].splitlines()[0]
+
+    assert first_transition.startswith('_{}-{}:'.format(transitions[0].previous_state, transitions[0].previous_character))
+    assert 'Profiling stopped after 2 steps' in capsys.readouterr().out
+
+
+def test_create_dispatch_table():
+    transitions = list(number_is_even_state_transitions)
+    table, state_lines = create_dispatch_table(transitions, first_line=10)
+    lines = table.split('\n')
+
+    assert list(state_lines) == dispatch_table_states(transitions)
+    assert state_lines[INITIAL_STATE] == 10
+    for state, line in state_lines.items():
+        entry = lines[line - 10:line - 10 + 5]
+        assert entry[0] == '# {}'.format(state)
+        assert [entry_line.split(':')[0] for entry_line in entry[1:]] == ['0', '1', 'X', VIM_END_OF_TAPE]
+
+    # Final states halt on every character
+    assert all('"_CYES\x1b`py$@"' in line for line in lines[state_lines[YES_FINAL_STATE] - 10 + 1:][:3])
+
+
+def test_line_dispatch_vim_machine(tmpdir):
+    transitions = MergeOverlappingIntervalsGenerator(num_bits=3).merge_overlapping_intervals_transitions()
+    with tmpdir.as_cwd():
+        VimTuringMachine(transitions, quiet=True).run(encode_intervals([[1, 2]], 3), line_dispatch=True)
+        # Not read as text, which would split the lines at the carriage returns
+        lines = tmpdir.join(VIM_MACHINE_FILENAME).read_binary().decode().split('\n')
+
+    # Every state is the line number of its entry in the file
+    current_state = lines[lines.index('_k:  # Current state. Usage: `k"ky$@k jumps to its dispatch entry') + 1]
+    next_states = [int(line) for line in re.findall(r'"_C(\d+)G\x1b', '\n'.join(lines))]
+    for state_line in [int(current_state[:-1])] + next_states:
+        assert lines[state_line - 1].startswith('# ')
+    assert lines[int(current_state[:-1]) - 1] == '# {}'.format(INITIAL_STATE)
+
+
+def test_chain_links():
+    transitions = list(MergeOverlappingIntervalsGenerator(num_bits=3).move_n_bits(
+        initial_state='Move',
+        direction=BACKWARDS,
+        final_state='Moved',
+        num_bits=3,
+    ))
+
+    assert chain_links(transitions) == {
+        'Move': ('MoveMovingBit1', None, BACKWARDS),
+        'MoveMovingBit1': ('MoveMovingBit2', None, BACKWARDS),
+        'MoveMovingBit2': ('Moved', None, BACKWARDS),
+    }
+
+
+def test_scan_states():
+    assert scan_states(number_is_even_state_transitions) == {ADVANCE_TO_END_OF_NUMBER: FORWARDS}
+
+
+def test_fuse_transition_chains():
+    transitions = [
+        StateTransition(INITIAL_STATE, '1', 'Move', '0', FORWARDS),
+        StateTransition('Move', '0', 'Erase', '0', FORWARDS),
+        StateTransition('Move', '1', 'Erase', '1', FORWARDS),
+        StateTransition('Erase', '0', ADVANCE_TO_END_OF_NUMBER, BLANK_CHARACTER, FORWARDS),
+        StateTransition('Erase', '1', ADVANCE_TO_END_OF_NUMBER, BLANK_CHARACTER, FORWARDS),
+    ] + list(number_is_even_state_transitions[3:])
+    fused = fuse_transition_chains(transitions)
+
+    # The links are only entered through the fused transition
+    assert fused[0] == FusedStateTransition(
+        previous_state=INITIAL_STATE,
+        previous_character='1',
+        next_state=ADVANCE_TO_END_OF_NUMBER,
+        next_character='0',
+        tape_pointer_direction=FORWARDS,
+        chain=((None, FORWARDS), (BLANK_CHARACTER, FORWARDS)),
+        scan=FORWARDS,
+    )
+    assert not {'Move', 'Erase'} & {transition.previous_state for transition in fused}
+    assert VimStateTransitionAdapter(fused[0]).to_vim() == (
+        '_{}-1:`k"_C{}\x1b`tr0`t2 rX/[X+]\rmt`ny$@"'
+    ).format(INITIAL_STATE, ADVANCE_TO_END_OF_NUMBER)
+
+
+def test_fuse_transition_chains_that_loop():
+    transitions = [
+        StateTransition(INITIAL_STATE, '0', 'Left', '0', FORWARDS),
+        StateTransition('Left', '0', 'Right', '0', BACKWARDS),
+        StateTransition('Left', '1', 'Right', '1', BACKWARDS),
+        StateTransition('Right', '0', 'Left', '0', FORWARDS),
+        StateTransition('Right', '1', 'Left', '1', FORWARDS),
+    ]
+    fused = fuse_transition_chains(transitions)
+
+    assert fused[0].next_state == 'Left'
+    assert fused[0].chain == ((None, BACKWARDS), (None, FORWARDS))
+    assert 'Left' in {transition.previous_state for transition in fused}
@@ -0,0 +1,97 @@
+from vim_turing_machine.constants import INITIAL_STATE
+from vim_turing_machine.constants import YES_FINAL_STATE
+from vim_turing_machine.machines.merge_overlapping_intervals.merge_overlapping_intervals import MergeOverlappingIntervalsGenerator
+from vim_turing_machine.optimizer import all_states
+from vim_turing_machine.vim_symbols import compact_state_names
+from vim_turing_machine.vim_symbols import decode_machine
+from vim_turing_machine.vim_symbols import load_symbols
+from vim_turing_machine.vim_symbols import to_base_36
+from vim_turing_machine.vim_symbols import write_symbols
+
+
+def test_to_base_36():
+    assert [to_base_36(number) for number in (0, 9, 10, 35, 36, 1295, 1296)] == ['0', '9', 'a', 'z', '10', 'zz', '100']
+
+
+def test_compact_state_names():
+    transitions = MergeOverlappingIntervalsGenerator(num_bits=3).merge_overlapping_intervals_transitions()
+    renamed, symbols = compact_state_names(transitions)
+    states = all_states(renamed, initial_state='0')
+
+    assert len(states) == len(all_states(transitions))
+    assert YES_FINAL_STATE in states
+    assert symbols['0'] == INITIAL_STATE
+    assert max(len(state) for state in states) <= 3
+    for transition in renamed:
+        transition.validate()
+
+    assert [
+        transition._replace(
+            previous_state=symbols.get(transition.previous_state, transition.previous_state),
+            next_state=symbols.get(transition.next_state, transition.next_state),
+        )
+        for transition in renamed
+    ] == list(transitions)
+
+
+def test_symbols_round_trip(tmpdir):
+    filename = tmpdir.join('machine.symbols.json').strpath
+    write_symbols({'0': INITIAL_STATE, '1': 'CopyBit0'}, filename)
+
+    assert load_symbols(filename) == {'0': INITIAL_STATE, '1': 'CopyBit0'}
+
+
+def test_decode_machine():
+    symbols = {'0': INITIAL_STATE, '1': 'CopyBit0', '10': 'CopyBit1'}
+    contents = '\n'.join([
+        '_s:  # State transitions',
+        '_0-1:`k"_C1',
+        '_o:  # Output',
+        '1',
+        '_k:  # Current state',
+        '1',
+        '_t:  # Current tape',
+        '10',
+        '+',
+        '_e:  # End of tape. Pointer is 1 line above this',
+        '',
+        '# vim: set whichwrap+=b,s',
+        '',
+        '10',
+        '1',
+        '+',
+        '_e:  # End of tape. Pointer is 1 line above this',
+        '0',
+        '',
+        '0',
+        '+',
+        '_e:  # End of tape. Pointer is 1 line above this',
+        'YES',
+    ])
+
+    # Tape lines that look like ids are not states
+    assert decode_machine(contents, symbols).split('\n') == [
+        '_s:  # State transitions',
+        '_0-1:`k"_C1',
+        '_o:  # Output',
+        'CopyBit0',
+        '_k:  # Current state',
+        'CopyBit0',
+        '_t:  # Current tape',
+        '10',
+        '+',
+        '_e:  # End of tape. Pointer is 1 line above this',
+        '',
+        '# vim: set whichwrap+=b,s',
+        '',
+        '10',
+        '1',
+        '+',
+        '_e:  # End of tape. Pointer is 1 line above this',
+        INITIAL_STATE,
+        '',
+        '0',
+        '+',
+        '_e:  # End of tape. Pointer is 1 line above this',
+        'YES',
+    ]
@@ -0,0 +1,232 @@
+"""Machines saved to disk so they don't have to be generated and validated again.
+
+Generating a large machine and validating every one of its transitions
+dominates the startup of short runs. An artifact stores the transitions of a
+machine that has already been validated, in a compact form:
+
+    MAGIC
+    a json header line: the state names and characters, each stored once,
+        the number of transitions and the content hash
+    the transitions as packed arrays: previous state ids, next state ids
+        (native unsigned ints), previous characters, next characters
+        (indexes into the characters) and directions (signed bytes)
+
+The file is memory mapped. The content hash is computed over the mapping and
+each column is read from it in place into a TransitionTable, without copying
+the rest of the file. The content hash covers the names and the arrays, so a
+truncated or corrupted file is rejected instead of being trusted.
+
+`load_machine` caches the artifacts of the generators in `generators()`, keyed
+by the generator name, num_bits and the source of the vim_turing_machine
+package, in the same directory as the generated code (see `codegen`).
+"""
+import hashlib
+import json
+import mmap
+import os
+import sys
+from array import array
+
+from vim_turing_machine.codegen import resolve_cache_directory
+from vim_turing_machine.tape import ENCODING
+from vim_turing_machine.transition_table import TransitionTable
+from vim_turing_machine.turing_machine import validate_state_transitions
+
+
+MAGIC = b'VTMMACHINE\n'
+VERSION = 1
+
+# How each column of transitions is packed, in file order
+STATE_TYPECODE = 'I'
+CHARACTER_TYPECODE = 'B'
+DIRECTION_TYPECODE = 'b'
+
+PACKAGE_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+
+class InvalidArtifactException(Exception):
+    pass
+
+
+def generators():
+    """Generator name -> (generator class, name of the method returning the
+    transitions). The machines are only imported when they are needed."""
+    from vim_turing_machine.machines.merge_overlapping_intervals import linear_merge_intervals
+    from vim_turing_machine.machines.merge_overlapping_intervals import merge_overlapping_intervals
+
+    method_name = 'merge_overlapping_intervals_transitions'
+    return {
+        'merge_overlapping_intervals': (merge_overlapping_intervals.MergeOverlappingIntervalsGenerator, method_name),
+        'linear_merge_overlapping_intervals': (linear_merge_intervals.LinearMergeOverlappingIntervalsGenerator, method_name),
+    }
+
+
+def save_artifact(state_transitions, filename):
+    """Validates the transitions and saves them. The file is written to a
+    temporary file first and then renamed."""
+    validate_state_transitions(state_transitions)
+
+    states = list(dict.fromkeys(
+        state
+        for transition in state_transitions
+        for state in (transition.previous_state, transition.next_state)
+    ))
+    state_ids = {state: state_id for state_id, state in enumerate(states)}
+    characters = sorted({
+        character
+        for transition in state_transitions
+        for character in (transition.previous_character, transition.next_character)
+    })
+    character_ids = {character: character_id for character_id, character in enumerate(characters)}
+
+    body = b''.join(column.tobytes() for column in (
+        array(STATE_TYPECODE, [state_ids[transition.previous_state] for transition in state_transitions]),
+        array(STATE_TYPECODE, [state_ids[transition.next_state] for transition in state_transitions]),
+        array(CHARACTER_TYPECODE, [character_ids[transition.previous_character] for transition in state_transitions]),
+        array(CHARACTER_TYPECODE, [character_ids[transition.next_character] for transition in state_transitions]),
+        array(DIRECTION_TYPECODE, [transition.tape_pointer_direction for transition in state_transitions]),
+    ))
+
+    header = json.dumps({
+        'version': VERSION,
+        'byteorder': sys.byteorder,
+        'state_itemsize': array(STATE_TYPECODE).itemsize,
+        'num_transitions': len(state_transitions),
+        'states': states,
+        'characters': characters,
+        'content_hash': content_hash(states, characters, body),
+    }).encode(ENCODING)
+
+    temporary_filename = '{}.{}.tmp'.format(filename, os.getpid())
+    with open(temporary_filename, 'wb') as f:
+        f.write(MAGIC)
+        f.write(header + b'\n')
+        f.write(body)
+
+    os.replace(temporary_filename, filename)
+
+
+def load_artifact(filename):
+    """Loads transitions saved by save_artifact. They were validated when
+    they were saved, so pass `validate=False` to TuringMachine.
+
+    :rtype: TransitionTable
+    """
+    with open(filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as contents:
+        if contents.readline() != MAGIC:
+            raise InvalidArtifactException('{} is not a machine artifact'.format(filename))
+
+        header = json.loads(contents.readline().decode(ENCODING))
+        if header['version'] != VERSION:
+            raise InvalidArtifactException('Unsupported artifact version {}'.format(header['version']))
+
+        if header['state_itemsize'] != array(STATE_TYPECODE).itemsize:
+            raise InvalidArtifactException('{} was saved on an incompatible platform'.format(filename))
+
+        body_offset = contents.tell()
+        states = header['states']
+        characters = header['characters']
+        with memoryview(contents) as view:
+            with view[body_offset:] as body:
+                if content_hash(states, characters, body) != header['content_hash']:
+                    raise InvalidArtifactException('{} is corrupted'.format(filename))
+
+            columns = read_columns(view, body_offset, header)
+
+    previous_states, next_states, previous_characters, next_characters, directions = columns
+    # Character ids -> latin-1 byte values
+    character_bytes = ''.join(characters).encode(ENCODING).ljust(256, b'\0')
+    return TransitionTable.from_columns(
+        states=states,
+        previous_states=previous_states,
+        previous_characters=previous_characters.translate(character_bytes),
+        next_states=next_states,
+        next_characters=next_characters.translate(character_bytes),
+        directions=directions,
+    )
+
+
+def read_columns(view, offset, header):
+    """Reads the columns of transitions from a memoryview of the file,
+    starting at offset. The characters are byte strings of character ids.
+
+    :rtype: [array or bytes]
+    """
+    num_transitions = header['num_transitions']
+    columns = []
+    for typecode in (STATE_TYPECODE, STATE_TYPECODE, CHARACTER_TYPECODE, CHARACTER_TYPECODE, DIRECTION_TYPECODE):
+        column = array(typecode)
+        size = column.itemsize * num_transitions
+        with view[offset:offset + size] as column_view:
+            if typecode == CHARACTER_TYPECODE:
+                column = column_view.tobytes()
+            else:
+                column.frombytes(column_view)
+                if header['byteorder'] != sys.byteorder:
+                    column.byteswap()
+        columns.append(column)
+        offset += size
+
+    return columns
+
+
+def content_hash(states, characters, body):
+    digest = hashlib.sha256()
+    digest.update(json.dumps([states, characters]).encode(ENCODING))
+    digest.update(body)
+    return digest.hexdigest()
+
+
+def artifact_filename(generator_name, num_bits, cache_directory=None):
+    """Where the artifact of a generator is cached. The name includes a hash
+    of the package's source, so that changing the generator, or anything it
+    uses, invalidates it."""
+    if generator_name not in generators():
+        raise KeyError(generator_name)
+
+    digest = hashlib.sha256()
+    digest.update('{}:{}:{}:'.format(VERSION, generator_name, num_bits).encode(ENCODING))
+    digest.update(package_source_hash().encode(ENCODING))
+
+    return os.path.join(
+        resolve_cache_directory(cache_directory),
+        '{}-{}-{}.machine'.format(generator_name, num_bits, digest.hexdigest()[:16]),
+    )
+
+
+def package_source_hash():
+    """A hash of every Python file of the vim_turing_machine package"""
+    digest = hashlib.sha256()
+    for directory, directories, filenames in os.walk(PACKAGE_DIRECTORY):
+        directories.sort()
+        for filename in sorted(filenames):
+            if filename.endswith('.py'):
+                path = os.path.join(directory, filename)
+                digest.update(os.path.relpath(path, PACKAGE_DIRECTORY).encode(ENCODING) + b'\0')
+                with open(path, 'rb') as f:
+                    digest.update(f.read())
+
+    return digest.hexdigest()
+
+
+def load_machine(generator_name, num_bits, cache_directory=None):
+    """The transitions of a generator, from the cache if possible. A cache
+    we can't write to is not an error.
+
+    :rtype: TransitionTable
+    """
+    filename = artifact_filename(generator_name, num_bits, cache_directory)
+    try:
+        return load_artifact(filename)
+    except (OSError, ValueError, KeyError, InvalidArtifactException):
+        pass
+
+    generator_class, method_name = generators()[generator_name]
+    state_transitions = getattr(generator_class(num_bits), method_name)()
+    try:
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        save_artifact(state_transitions, filename)
+    except OSError:
+        validate_state_transitions(state_transitions)
+
+    return TransitionTable(state_transitions)
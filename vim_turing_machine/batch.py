@@ -0,0 +1,81 @@
+"""Runs one machine against many tapes.
+
+The transitions are validated and compiled once in the parent process. The
+compiled machine is then shipped to every worker of a process pool once, and
+each worker only receives tapes.
+"""
+import multiprocessing
+
+from vim_turing_machine.struct import BatchResult
+from vim_turing_machine.turing_machine import MissingStateTransition
+from vim_turing_machine.turing_machine import NegativeTapePositionException
+from vim_turing_machine.turing_machine import TooManyStepsException
+from vim_turing_machine.turing_machine import TuringMachine
+
+
+# Errors that end a single run without failing the whole batch
+RUN_ERRORS = (
+    MissingStateTransition,
+    NegativeTapePositionException,
+    TooManyStepsException,
+)
+
+# The machine used by this worker process. Set by _initialize_worker.
+_worker_machine = None
+_worker_max_steps = None
+
+
+def run_batch(transitions, tapes, max_steps=None, workers=None, ordered=True, chunksize=16):
+    """Runs every tape through the machine and yields a BatchResult per tape.
+
+    :param transitions: The state transitions of the machine
+    :param tapes: An iterable of initial tapes
+    :param int max_steps: The step limit of every run
+    :param int workers: The number of processes. Defaults to the cpu count.
+        With 1 worker, the tapes are run in this process.
+    :param bool ordered: Yield results in input order. Otherwise they are
+        yielded as they complete and BatchResult.index tells them apart.
+    :param int chunksize: How many tapes are sent to a worker at once
+    """
+    machine = TuringMachine(list(transitions), quiet=True, compiled=True)
+
+    if workers == 1:
+        for index, tape in enumerate(tapes):
+            yield _run_tape(machine, max_steps, index, tape)
+        return
+
+    with multiprocessing.Pool(
+        processes=workers,
+        initializer=_initialize_worker,
+        initargs=(machine, max_steps),
+    ) as pool:
+        imap = pool.imap if ordered else pool.imap_unordered
+        yield from imap(_run_indexed_tape, enumerate(tapes), chunksize)
+
+
+def _initialize_worker(machine, max_steps):
+    global _worker_machine
+    global _worker_max_steps
+    _worker_machine = machine
+    _worker_max_steps = max_steps
+
+
+def _run_indexed_tape(indexed_tape):
+    index, tape = indexed_tape
+    return _run_tape(_worker_machine, _worker_max_steps, index, tape)
+
+
+def _run_tape(machine, max_steps, index, tape):
+    try:
+        machine.run(tape, max_steps=max_steps)
+        error = None
+    except RUN_ERRORS as e:
+        error = e
+
+    return BatchResult(
+        index=index,
+        final_state=machine.current_state,
+        num_steps=machine._num_steps,
+        tape=str(machine.tape),
+        error=error,
+    )
@@ -0,0 +1,156 @@
+"""The benchmarks. Each one has a setup function that does the untimed
+preparation and returns the function to time along with the amount of work it
+does, so that results can be reported as a rate (steps, transitions,
+intervals, ... per second).
+
+`quick` setups use small sizes so that the whole suite can run in the tests.
+"""
+import contextlib
+import io
+import os
+import random
+import tempfile
+
+from vim_turing_machine.benchmarks.struct import Benchmark
+from vim_turing_machine.machines.is_number_even import number_is_even_state_transitions
+from vim_turing_machine.machines.merge_overlapping_intervals.decode_intervals import decode_intervals
+from vim_turing_machine.machines.merge_overlapping_intervals.encode_intervals import encode_intervals
+from vim_turing_machine.machines.merge_overlapping_intervals.interval_arrays import decode_intervals_array
+from vim_turing_machine.machines.merge_overlapping_intervals.interval_arrays import encode_intervals_array
+from vim_turing_machine.machines.merge_overlapping_intervals.linear_merge_intervals import LinearMergeOverlappingIntervalsGenerator
+from vim_turing_machine.machines.merge_overlapping_intervals.merge_overlapping_intervals import MergeOverlappingIntervalsGenerator
+from vim_turing_machine.turing_machine import TuringMachine
+from vim_turing_machine.turing_machine import validate_state_transitions
+from vim_turing_machine.vim_constants import VIM_MACHINE_FILENAME
+from vim_turing_machine.vim_machine import VimTuringMachine
+
+
+# Seed for the random inputs, so every run benchmarks the same tapes
+SEED = 0
+
+
+def random_intervals(num_intervals, num_bits, seed=SEED):
+    """Sorted intervals with random bounds that fit in num_bits"""
+    generator = random.Random(seed)
+    return sorted(
+        sorted(generator.randrange(2 ** num_bits) for _ in range(2))
+        for _ in range(num_intervals)
+    )
+
+
+def merge_transitions(num_bits):
+    return MergeOverlappingIntervalsGenerator(num_bits).merge_overlapping_intervals_transitions()
+
+
+def linear_merge_transitions(num_bits):
+    return LinearMergeOverlappingIntervalsGenerator(num_bits).merge_overlapping_intervals_transitions()
+
+
+def build_generator(num_bits):
+    def setup(quick):
+        num_transitions = len(merge_transitions(num_bits))
+        return lambda: merge_transitions(num_bits), num_transitions
+    return setup
+
+
+def validate(num_bits):
+    def setup(quick):
+        transitions = merge_transitions(num_bits)
+        return lambda: validate_state_transitions(transitions), len(transitions)
+    return setup
+
+
+def run_machine(transitions, tape):
+    """Times a full run. The work is the number of steps it takes."""
+    machine = TuringMachine(transitions, quiet=True)
+    num_steps = machine.run(tape).num_steps
+    return lambda: machine.run(tape), num_steps
+
+
+def run_is_number_even(length):
+    def setup(quick):
+        return run_machine(number_is_even_state_transitions, '1' * (length // 100 if quick else length))
+    return setup
+
+
+def run_merge_overlapping_intervals(transitions, num_bits, num_intervals):
+    """:param transitions: Function from num_bits to the machine's transitions"""
+    def setup(quick):
+        intervals = random_intervals(max(num_intervals // 8, 1) if quick else num_intervals, num_bits)
+        return run_machine(transitions(num_bits), encode_intervals(intervals, num_bits))
+    return setup
+
+
+def encode(num_bits, num_intervals):
+    def setup(quick):
+        intervals = random_intervals(num_intervals // 100 if quick else num_intervals, num_bits)
+        return lambda: encode_intervals(intervals, num_bits), len(intervals)
+    return setup
+
+
+def decode(num_bits, num_intervals):
+    def setup(quick):
+        intervals = random_intervals(num_intervals // 100 if quick else num_intervals, num_bits)
+        tape = encode_intervals(intervals, num_bits)
+        return lambda: decode_intervals(tape, num_bits), len(intervals)
+    return setup
+
+
+def encode_array(num_bits, num_intervals):
+    def setup(quick):
+        intervals = random_intervals(num_intervals // 100 if quick else num_intervals, num_bits)
+        return lambda: encode_intervals_array(intervals, num_bits), len(intervals)
+    return setup
+
+
+def decode_array(num_bits, num_intervals):
+    def setup(quick):
+        intervals = random_intervals(num_intervals // 100 if quick else num_intervals, num_bits)
+        tape = encode_intervals_array(intervals, num_bits)
+        return lambda: decode_intervals_array(tape, num_bits), len(intervals)
+    return setup
+
+
+def write_vim_machine(num_bits):
+    def setup(quick):
+        transitions = merge_transitions(num_bits)
+        machine = VimTuringMachine(transitions, quiet=True)
+        tape = encode_intervals(random_intervals(4, num_bits), num_bits)
+
+        def write():
+            with tempfile.TemporaryDirectory() as directory, contextlib.redirect_stdout(io.StringIO()):
+                machine.run(tape, filename=os.path.join(directory, VIM_MACHINE_FILENAME))
+
+        return write, len(transitions)
+    return setup
+
+
+BENCHMARKS = [
+    *[
+        Benchmark('build/merge_overlapping_intervals/num_bits={}'.format(num_bits), 'transitions', build_generator(num_bits))
+        for num_bits in (3, 5, 8, 16)
+    ],
+    Benchmark('validate/merge_overlapping_intervals/num_bits=16', 'transitions', validate(16)),
+    Benchmark('run/is_number_even/length=10000', 'steps', run_is_number_even(10000)),
+    *[
+        Benchmark(
+            'run/merge_overlapping_intervals/num_bits=5/intervals={}'.format(num_intervals),
+            'steps',
+            run_merge_overlapping_intervals(merge_transitions, 5, num_intervals),
+        )
+        for num_intervals in (4, 16, 64)
+    ],
+    *[
+        Benchmark(
+            'run/linear_merge_overlapping_intervals/num_bits=5/intervals={}'.format(num_intervals),
+            'steps',
+            run_merge_overlapping_intervals(linear_merge_transitions, 5, num_intervals),
+        )
+        for num_intervals in (4, 16, 64, 1024)
+    ],
+    Benchmark('encode_intervals/num_bits=16/intervals=10000', 'intervals', encode(16, 10000)),
+    Benchmark('decode_intervals/num_bits=16/intervals=10000', 'intervals', decode(16, 10000)),
+    Benchmark('encode_intervals_array/num_bits=16/intervals=10000', 'intervals', encode_array(16, 10000)),
+    Benchmark('decode_intervals_array/num_bits=16/intervals=10000', 'intervals', decode_array(16, 10000)),
+    Benchmark('vim/merge_overlapping_intervals/num_bits=5', 'transitions', write_vim_machine(5)),
+]
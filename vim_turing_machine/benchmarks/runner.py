@@ -0,0 +1,149 @@
+"""Runs the benchmarks and compares them against a baseline.
+
+    python -m vim_turing_machine.benchmarks.runner --output results.json
+    python -m vim_turing_machine.benchmarks.runner --baseline baseline.json --threshold 0.1 --threshold 'vim/*=0.5'
+
+The baseline in BASELINE_FILENAME is the one `make benchmark` compares
+against. `make benchmark-baseline` records it again, e.g. after an intended
+slowdown or on a different machine.
+
+Results are json: the best of `repeat` timings of each benchmark, with its
+work and unit. With --baseline, every benchmark that is more than its
+threshold slower than in the baseline is reported and the exit code is 1.
+Thresholds are fractions (0.1 is 10% slower), optionally for the benchmarks
+matching a glob pattern. Everything runs offline.
+"""
+import argparse
+import fnmatch
+import json
+import os
+import sys
+import time
+
+from vim_turing_machine.benchmarks.cases import BENCHMARKS
+from vim_turing_machine.benchmarks.struct import BenchmarkRegression
+from vim_turing_machine.benchmarks.struct import BenchmarkResult
+
+
+BASELINE_FILENAME = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+DEFAULT_THRESHOLD = 0.1
+DEFAULT_REPEAT = 3
+
+
+def run_benchmarks(patterns=None, repeat=DEFAULT_REPEAT, quick=False, benchmarks=BENCHMARKS):
+    """Runs the benchmarks whose names match any of the glob patterns (all of
+    them by default)
+
+    :rtype: [BenchmarkResult]
+    """
+    results = []
+    for benchmark in benchmarks:
+        if patterns and not any(fnmatch.fnmatch(benchmark.name, pattern) for pattern in patterns):
+            continue
+
+        function, work = benchmark.setup(quick)
+        timings = []
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - start_time)
+
+        results.append(BenchmarkResult(benchmark.name, min(timings), work, benchmark.unit))
+
+    return results
+
+
+def write_results(results, filename):
+    with open(filename, 'w') as f:
+        json.dump({result.name: result._asdict() for result in results}, f, indent=4, sort_keys=True)
+        f.write('\n')
+
+
+def load_results(filename):
+    """:rtype: [BenchmarkResult]"""
+    with open(filename) as f:
+        return [BenchmarkResult(**result) for result in json.load(f).values()]
+
+
+def threshold_for(name, thresholds, default=DEFAULT_THRESHOLD):
+    """The threshold of the last pattern in thresholds that matches name"""
+    threshold = default
+    for pattern, pattern_threshold in thresholds:
+        if fnmatch.fnmatch(name, pattern):
+            threshold = pattern_threshold
+    return threshold
+
+
+def compare(results, baseline, thresholds=(), default_threshold=DEFAULT_THRESHOLD):
+    """Benchmarks that got slower than the baseline by more than their
+    threshold. Benchmarks missing from either side, or that did a different
+    amount of work (e.g. --quick against a full baseline), are skipped.
+
+    :param thresholds: (glob pattern, threshold) pairs
+    :rtype: [BenchmarkRegression]
+    """
+    baseline_by_name = {result.name: result for result in baseline}
+    regressions = []
+    for result in results:
+        baseline_result = baseline_by_name.get(result.name)
+        if baseline_result is None or baseline_result.work != result.work:
+            continue
+
+        threshold = threshold_for(result.name, thresholds, default_threshold)
+        if result.seconds > baseline_result.seconds * (1 + threshold):
+            regressions.append(BenchmarkRegression(
+                name=result.name,
+                baseline_seconds=baseline_result.seconds,
+                seconds=result.seconds,
+                threshold=threshold,
+            ))
+
+    return regressions
+
+
+def parse_threshold(value):
+    """'0.1' or 'pattern=0.1' -> (pattern, threshold)"""
+    pattern, _, threshold = value.rpartition('=')
+    return pattern or '*', float(threshold)
+
+
+def print_results(results):
+    for result in results:
+        print('{:<72} {:>10.4f}s {:>14,.0f} {}/s'.format(result.name, result.seconds, result.rate, result.unit))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('patterns', nargs='*', help='Only run the benchmarks matching these glob patterns')
+    parser.add_argument('--output', help='Write the results to this json file')
+    parser.add_argument('--baseline', help='Compare against the results in this json file')
+    parser.add_argument(
+        '--threshold',
+        action='append',
+        type=parse_threshold,
+        default=[],
+        help='Allowed slowdown as a fraction, optionally as PATTERN=FRACTION. Can be repeated.',
+    )
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--quick', action='store_true', help='Use small inputs')
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.patterns, repeat=args.repeat, quick=args.quick)
+    print_results(results)
+
+    if args.output:
+        write_results(results, args.output)
+
+    if args.baseline:
+        regressions = compare(results, load_results(args.baseline), args.threshold)
+        for regression in regressions:
+            print('Regression: {}'.format(regression))
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
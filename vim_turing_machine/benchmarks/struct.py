@@ -0,0 +1,45 @@
+from collections import namedtuple
+
+
+class Benchmark(namedtuple('Benchmark', [
+    'name',
+    'unit',
+    'setup',
+])):
+    """`setup(quick)` prepares the benchmark and returns the function to time
+    and how many `unit`s of work one call of it does"""
+
+
+class BenchmarkResult(namedtuple('BenchmarkResult', [
+    'name',
+    'seconds',
+    'work',
+    'unit',
+])):
+    """The best time of a benchmark, in seconds"""
+
+    @property
+    def rate(self):
+        return self.work / self.seconds if self.seconds else float('inf')
+
+
+class BenchmarkRegression(namedtuple('BenchmarkRegression', [
+    'name',
+    'baseline_seconds',
+    'seconds',
+    'threshold',
+])):
+    """A benchmark that got more than `threshold` (a fraction) slower"""
+
+    @property
+    def slowdown(self):
+        return self.seconds / self.baseline_seconds - 1
+
+    def __str__(self):
+        return '{}: {:.4g}s -> {:.4g}s ({:+.0%}, threshold {:+.0%})'.format(
+            self.name,
+            self.baseline_seconds,
+            self.seconds,
+            self.slowdown,
+            self.threshold,
+        )
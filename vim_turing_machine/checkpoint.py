@@ -0,0 +1,77 @@
+"""Snapshots of a TuringMachine's configuration.
+
+A checkpoint holds the tape, cursor, current state and step count, along with
+a hash of the transitions so that it can't be resumed on a different machine.
+It is written to a temporary file first and then renamed, so a crash while
+saving leaves the previous checkpoint intact.
+
+File layout: MAGIC, a json header line, then the raw tape bytes.
+"""
+import hashlib
+import json
+import os
+
+from vim_turing_machine.tape import ENCODING
+
+
+MAGIC = b'VTMCHECKPOINT\n'
+VERSION = 1
+
+
+class CheckpointMismatchException(Exception):
+    pass
+
+
+def transitions_hash(state_transitions):
+    """A hash of the transitions that doesn't depend on their order"""
+    digest = hashlib.sha256()
+    for transition in sorted(state_transitions):
+        digest.update(json.dumps(list(transition)).encode(ENCODING))
+    return digest.hexdigest()
+
+
+def save_checkpoint(machine, filename):
+    header = json.dumps({
+        'version': VERSION,
+        'transitions_hash': machine.transitions_hash,
+        'blank': machine.tape.blank,
+        'two_way': machine.tape.two_way,
+        'tape_start': machine.tape.start,
+        'cursor_position': machine.cursor_position,
+        'current_state': machine.current_state,
+        'num_steps': machine._num_steps,
+    }).encode(ENCODING)
+
+    temporary_filename = '{}.tmp'.format(filename)
+    with open(temporary_filename, 'wb') as f:
+        f.write(MAGIC)
+        f.write(header + b'\n')
+        f.write(machine.tape.to_bytes())
+
+    os.replace(temporary_filename, filename)
+
+
+def load_checkpoint(machine, filename):
+    """Restores the configuration of machine from a checkpoint. Call
+    `machine.resume()` afterwards to continue the run."""
+    with open(filename, 'rb') as f:
+        if f.readline() != MAGIC:
+            raise CheckpointMismatchException('{} is not a checkpoint'.format(filename))
+
+        header = json.loads(f.readline().decode(ENCODING))
+        cells = bytearray(f.read())
+
+    if header['version'] != VERSION:
+        raise CheckpointMismatchException('Unsupported checkpoint version {}'.format(header['version']))
+
+    if header['transitions_hash'] != machine.transitions_hash:
+        raise CheckpointMismatchException('{} was saved by a different machine'.format(filename))
+
+    if header['two_way'] != machine.tape.two_way:
+        raise CheckpointMismatchException('{} was saved with a different tape type'.format(filename))
+
+    machine.tape = machine._tape_class(blank=header['blank'])
+    machine.tape.load(cells, start=header['tape_start'])
+    machine.cursor_position = header['cursor_position']
+    machine.current_state = header['current_state']
+    machine._num_steps = header['num_steps']
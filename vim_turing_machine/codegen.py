@@ -0,0 +1,230 @@
+"""Generates a specialized Python function that runs a fixed set of transitions.
+
+Every state becomes its own block of code that branches directly on the byte
+under the head and has the write, move and next state of every transition
+inlined as constants. The blocks are selected with a binary tree of `if`s on
+the state id, so a step costs a handful of integer comparisons instead of a
+hash lookup.
+
+Compiling the generated source is the slow part, so the code object is
+cached on disk, keyed by a hash of the transitions. Later processes load it
+with marshal without generating anything. The cache lives in
+$VIM_TURING_MACHINE_CACHE, or ~/.cache/vim_turing_machine by default.
+"""
+import hashlib
+import marshal
+import os
+import sys
+
+from vim_turing_machine.checkpoint import transitions_hash
+from vim_turing_machine.constants import BACKWARDS
+from vim_turing_machine.constants import BLANK_CHARACTER
+from vim_turing_machine.constants import FINAL_STATES
+from vim_turing_machine.constants import FORWARDS
+from vim_turing_machine.constants import HALTED
+from vim_turing_machine.constants import INITIAL_STATE
+from vim_turing_machine.constants import MISSING
+from vim_turing_machine.constants import NEGATIVE
+from vim_turing_machine.constants import TOO_MANY_STEPS
+from vim_turing_machine.tape import ENCODING
+
+
+# Bump this whenever the generated code changes
+CODEGEN_VERSION = 1
+
+CACHE_DIRECTORY_VARIABLE = 'VIM_TURING_MACHINE_CACHE'
+DEFAULT_CACHE_DIRECTORY = os.path.join('~', '.cache', 'vim_turing_machine')
+
+FUNCTION_NAME = 'run_machine'
+
+INDENT = '    '
+
+# What the generated function returns: status and the new configuration
+RESULT = '({}, index, lowest, shift, {}, num_steps)'
+
+
+class GeneratedMachine(object):
+
+    def __init__(self, state_transitions, blank_character=BLANK_CHARACTER, cache_directory=None):
+        self.states = sorted({INITIAL_STATE} | {
+            state
+            for transition in state_transitions
+            for state in (transition.previous_state, transition.next_state)
+        })
+        self.state_ids = {state: state_id for state_id, state in enumerate(self.states)}
+
+        key = cache_key(state_transitions, blank_character)
+        code = load_cached_code(key, cache_directory)
+        if code is None:
+            source = generate_source(state_transitions, self.state_ids, blank_character)
+            code = compile(source, '<generated machine {}>'.format(key[:12]), 'exec')
+            save_cached_code(key, code, cache_directory)
+
+        namespace = {}
+        exec(code, namespace)
+        self.run_machine = namespace[FUNCTION_NAME]
+
+
+def cache_key(state_transitions, blank_character):
+    digest = hashlib.sha256()
+    digest.update('{}:{}:{}:'.format(
+        CODEGEN_VERSION,
+        sys.implementation.cache_tag,
+        blank_character,
+    ).encode(ENCODING))
+    digest.update(transitions_hash(state_transitions).encode(ENCODING))
+    return digest.hexdigest()
+
+
+def resolve_cache_directory(cache_directory=None):
+    if cache_directory is None:
+        cache_directory = os.environ.get(CACHE_DIRECTORY_VARIABLE, DEFAULT_CACHE_DIRECTORY)
+    return os.path.expanduser(cache_directory)
+
+
+def cache_filename(key, cache_directory=None):
+    return os.path.join(resolve_cache_directory(cache_directory), '{}.marshal'.format(key))
+
+
+def load_cached_code(key, cache_directory=None):
+    try:
+        with open(cache_filename(key, cache_directory), 'rb') as f:
+            return marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+
+def save_cached_code(key, code, cache_directory=None):
+    """Saves the code object. A cache we can't write to is not an error."""
+    filename = cache_filename(key, cache_directory)
+    temporary_filename = '{}.{}.tmp'.format(filename, os.getpid())
+    try:
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        with open(temporary_filename, 'wb') as f:
+            marshal.dump(code, f)
+        os.replace(temporary_filename, filename)
+    except OSError:
+        pass
+
+
+def generate_source(state_transitions, state_ids, blank_character):
+    """Returns the source of
+
+        run_machine(tape, index, lowest, state, num_steps, limit, two_way)
+            -> (status, index, lowest, shift, state, num_steps)
+
+    which runs the machine on a bytearray of characters. `lowest` is the
+    lowest index of `tape` that is on the tape and `shift` is how many cells
+    were added to the left of it.
+    """
+    transitions_by_state = [[] for _ in state_ids]
+    for transition in state_transitions:
+        transitions_by_state[state_ids[transition.previous_state]].append(transition)
+
+    lines = [
+        'def {}(tape, index, lowest, state, num_steps, limit, two_way):'.format(FUNCTION_NAME),
+        '    shift = 0',
+        '    while num_steps < limit:',
+        '        symbol = tape[index]',
+    ]
+    lines.extend(_state_tree(transitions_by_state, state_ids, blank_character, 0, len(state_ids), depth=2))
+    lines.append('    return ' + RESULT.format(TOO_MANY_STEPS, 'state'))
+
+    return '\n'.join(lines) + '\n'
+
+
+def _state_tree(transitions_by_state, state_ids, blank_character, low, high, depth):
+    """Emits a binary search on the state id for the states in [low, high)"""
+    indent = INDENT * depth
+
+    if high - low <= 1:
+        return _state_block(transitions_by_state[low] if high > low else [], state_ids, blank_character, depth)
+
+    middle = (low + high) // 2
+    return [
+        '{}if state < {}:'.format(indent, middle),
+        *_state_tree(transitions_by_state, state_ids, blank_character, low, middle, depth + 1),
+        '{}else:'.format(indent),
+        *_state_tree(transitions_by_state, state_ids, blank_character, middle, high, depth + 1),
+    ]
+
+
+def _state_block(transitions, state_ids, blank_character, depth):
+    indent = INDENT * depth
+    lines = []
+
+    if transitions:
+        lines.append('{}# {!r}'.format(indent, transitions[0].previous_state))
+
+    loops = [transition for transition in transitions if _is_loop(transition)]
+    if loops and len({transition.tape_pointer_direction for transition in loops}) == 1:
+        # "Move until symbol" loops run in a tight inner loop that doesn't go
+        # back through the state dispatch for every cell.
+        body = INDENT * (depth + 1)
+        lines.append('{}while ({}) and num_steps < limit:'.format(
+            indent,
+            ' or '.join('symbol == {}'.format(ord(transition.previous_character)) for transition in loops),
+        ))
+        lines.extend(_move(loops[0].tape_pointer_direction, blank_character, body))
+        lines.extend([
+            body + 'num_steps += 1',
+            body + 'symbol = tape[index]',
+            indent + 'if num_steps >= limit:',
+            body + 'return ' + RESULT.format(TOO_MANY_STEPS, 'state'),
+        ])
+
+    for transition in transitions:
+        body = INDENT * (depth + 1)
+        lines.append('{}if symbol == {}:'.format(indent, ord(transition.previous_character)))
+
+        if transition.next_character != transition.previous_character:
+            lines.append('{}tape[index] = {}'.format(body, ord(transition.next_character)))
+
+        lines.extend(_move(transition.tape_pointer_direction, blank_character, body))
+
+        next_state_id = state_ids[transition.next_state]
+        if transition.next_state in FINAL_STATES:
+            lines.append(body + 'return ' + RESULT.format(HALTED, next_state_id))
+        else:
+            lines.extend([
+                body + 'state = {}'.format(next_state_id),
+                body + 'num_steps += 1',
+                body + 'continue',
+            ])
+
+    lines.append(indent + 'return ' + RESULT.format(MISSING, 'state'))
+    return lines
+
+
+def _is_loop(transition):
+    return (
+        transition.previous_state == transition.next_state and
+        transition.previous_character == transition.next_character and
+        transition.tape_pointer_direction in (FORWARDS, BACKWARDS)
+    )
+
+
+def _move(direction, blank_character, indent):
+    """Moves the head and grows the tape if it ran off of it"""
+    if direction == FORWARDS:
+        return [
+            indent + 'index += 1',
+            indent + 'if index == len(tape):',
+            indent + INDENT + 'tape.append({})'.format(ord(blank_character)),
+        ]
+    elif direction == BACKWARDS:
+        return [
+            indent + 'index -= 1',
+            indent + 'if index < lowest:',
+            indent + INDENT + 'if index < 0:',
+            indent + INDENT * 2 + 'if not two_way:',
+            indent + INDENT * 3 + 'return ' + RESULT.format(NEGATIVE, 'state'),
+            indent + INDENT * 2 + 'growth = len(tape)',
+            indent + INDENT * 2 + 'tape[0:0] = bytes([{}]) * growth'.format(ord(blank_character)),
+            indent + INDENT * 2 + 'index += growth',
+            indent + INDENT * 2 + 'lowest += growth',
+            indent + INDENT * 2 + 'shift += growth',
+            indent + INDENT + 'lowest = index',
+        ]
+    else:
+        return []
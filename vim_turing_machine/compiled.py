@@ -0,0 +1,160 @@
+"""Compiles a list of StateTransitions into flat, integer indexed tables.
+
+States and tape symbols are interned to small integers once. A transition is
+then looked up by indexing the tables with `state_id * num_symbols + symbol_id`
+instead of hashing a (state name, character) tuple on every step.
+
+States that loop on themselves while moving in one direction without changing
+the tape ("move until symbol") are detected here as well so that the engine
+can skip over the whole run of cells with a single bytearray search.
+"""
+from vim_turing_machine.constants import BLANK_CHARACTER
+from vim_turing_machine.constants import DO_NOT_MOVE
+from vim_turing_machine.constants import FINAL_STATES
+from vim_turing_machine.constants import FORWARDS
+from vim_turing_machine.constants import INITIAL_STATE
+
+
+# Marks a (state, symbol) pair that has no transition
+MISSING_TRANSITION = -1
+
+
+class CompiledMachine(object):
+
+    def __init__(self, state_transitions, blank_character=BLANK_CHARACTER):
+        self.states = [INITIAL_STATE]
+        self.state_ids = {INITIAL_STATE: 0}
+        self.symbols = [blank_character]
+        self.symbol_ids = {blank_character: 0}
+
+        for transition in state_transitions:
+            self._intern_state(transition.previous_state)
+            self._intern_state(transition.next_state)
+            self._intern_symbol(transition.previous_character)
+            self._intern_symbol(transition.next_character)
+
+        # Characters that no transition knows about are read as this symbol.
+        # Its column is always empty so it raises a MissingStateTransition.
+        self.unknown_symbol_id = len(self.symbols)
+        self.num_symbols = len(self.symbols) + 1
+        self.blank_symbol_id = 0
+
+        num_entries = len(self.states) * self.num_symbols
+        self.next_states = [MISSING_TRANSITION] * num_entries
+        self.next_symbols = [0] * num_entries
+        self.directions = [0] * num_entries
+
+        for transition in state_transitions:
+            index = self.index(
+                self.state_ids[transition.previous_state],
+                self.symbol_ids[transition.previous_character],
+            )
+            self.next_states[index] = self.state_ids[transition.next_state]
+            self.next_symbols[index] = self.symbol_ids[transition.next_character]
+            self.directions[index] = transition.tape_pointer_direction
+
+        self.is_final = [state in FINAL_STATES for state in self.states]
+
+        self._compile_scans(state_transitions)
+
+        encode_table = bytearray([self.unknown_symbol_id]) * 256
+        for symbol, symbol_id in self.symbol_ids.items():
+            encode_table[ord(symbol)] = symbol_id
+        self._encode_table = bytes(encode_table)
+        self._decode_table = bytes(
+            [ord(symbol) for symbol in self.symbols] +
+            [0] * (256 - len(self.symbols))
+        )
+
+    def _compile_scans(self, state_transitions):
+        """Finds the states that keep their state and symbol while moving in a
+        single direction. `is_scan` marks the transitions of those loops,
+        `scan_directions` holds the direction of each state and
+        `scan_stop_symbols` the symbols that end the loop."""
+        loop_directions = [set() for _ in self.states]
+        loop_symbols = [set() for _ in self.states]
+
+        for transition in state_transitions:
+            if (
+                transition.previous_state == transition.next_state and
+                transition.previous_character == transition.next_character and
+                transition.tape_pointer_direction != DO_NOT_MOVE
+            ):
+                state_id = self.state_ids[transition.previous_state]
+                loop_directions[state_id].add(transition.tape_pointer_direction)
+                loop_symbols[state_id].add(self.symbol_ids[transition.previous_character])
+
+        self.is_scan = [False] * len(self.next_states)
+        self.scan_directions = [DO_NOT_MOVE] * len(self.states)
+        self.scan_stop_symbols = [()] * len(self.states)
+
+        for state_id, directions in enumerate(loop_directions):
+            if len(directions) != 1:
+                # Either no loop at all, or it changes direction depending on
+                # the symbol, which we can't do as a single search.
+                continue
+
+            self.scan_directions[state_id] = directions.pop()
+            self.scan_stop_symbols[state_id] = tuple(
+                symbol_id
+                for symbol_id in range(self.num_symbols)
+                if symbol_id not in loop_symbols[state_id]
+            )
+            for symbol_id in loop_symbols[state_id]:
+                self.is_scan[self.index(state_id, symbol_id)] = True
+
+    def scan_distance(self, tape, index_on_tape, state_id, lowest):
+        """Returns how many times a scanning state will move onto another cell
+        that it loops on, starting from index_on_tape. The move after that
+        lands on a stop symbol or past the end of the tape, so the caller
+        should run it as a regular step.
+
+        :param bytearray tape: The symbol ids on the tape
+        :param int lowest: The lowest index of tape that is on the tape
+        """
+        if self.scan_directions[state_id] == FORWARDS:
+            stop = len(tape)
+            for symbol_id in self.scan_stop_symbols[state_id]:
+                found = tape.find(symbol_id, index_on_tape + 1, stop)
+                if found != -1:
+                    stop = found
+
+            return stop - index_on_tape - 1
+        else:
+            stop = lowest - 1
+            for symbol_id in self.scan_stop_symbols[state_id]:
+                found = tape.rfind(symbol_id, stop + 1, index_on_tape)
+                if found != -1:
+                    stop = found
+
+            return index_on_tape - stop - 1
+
+    def _intern_state(self, state):
+        if state not in self.state_ids:
+            self.state_ids[state] = len(self.states)
+            self.states.append(state)
+
+    def _intern_symbol(self, symbol):
+        if symbol not in self.symbol_ids:
+            self.symbol_ids[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+
+    def index(self, state_id, symbol_id):
+        return state_id * self.num_symbols + symbol_id
+
+    def encode_tape(self, tape):
+        """Converts a Tape into a bytearray of symbol ids"""
+        return bytearray(tape.to_bytes().translate(self._encode_table))
+
+    def decode_tape(self, symbol_ids, original_cells, shift=0):
+        """Converts symbol ids back to tape bytes. Unknown symbols are never
+        rewritten by the machine, so they are read back from the original
+        cells. `shift` is how many cells were added before the original tape."""
+        cells = bytearray(symbol_ids.translate(self._decode_table))
+
+        index = symbol_ids.find(self.unknown_symbol_id)
+        while index != -1:
+            cells[index] = original_cells[index - shift]
+            index = symbol_ids.find(self.unknown_symbol_id, index + 1)
+
+        return cells
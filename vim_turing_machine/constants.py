@@ -16,3 +16,9 @@ BACKWARDS = -1
 VALID_CHARACTERS = {'0', '1', BLANK_CHARACTER}
 
 INVALID_STATE_CHARACTERS = ['_', '-', ':']
+
+# Why a compiled run stopped
+HALTED = 0
+MISSING = 1
+NEGATIVE = 2
+TOO_MANY_STEPS = 3
@@ -7,6 +7,7 @@ from vim_turing_machine.constants import YES_FINAL_STATE
 from vim_turing_machine.struct import BACKWARDS
 from vim_turing_machine.struct import FORWARDS
 from vim_turing_machine.struct import StateTransition
+from vim_turing_machine.turing_machine import print_result
 from vim_turing_machine.turing_machine import TuringMachine
 
 
@@ -85,5 +86,5 @@ number_is_even_state_transitions = (
 
 
 if __name__ == '__main__':
-    even_odd_turing_machine = TuringMachine(number_is_even_state_transitions, debug=True)
+    even_odd_turing_machine = TuringMachine(number_is_even_state_transitions, debug=True, reporter=print_result)
     even_odd_turing_machine.run(initial_tape=sys.argv[1])
@@ -1,28 +1,78 @@
 """Decodes a binary string to a json representation of the intervals
 after the merge overlapping intervals turing machine have processed them. Reads
-json from the command line and outputs the initial tape."""
+json from the command line and outputs the initial tape.
+
+    python -m vim_turing_machine.machines.merge_overlapping_intervals.decode_intervals TAPE NUM_BITS
+
+With `-` as the tape, it is read from stdin in chunks and the intervals are
+written as they are decoded, so the size of the tape isn't limited by memory.
+"""
 import json
 import sys
 
 from vim_turing_machine.constants import BITS_PER_NUMBER
 from vim_turing_machine.constants import BLANK_CHARACTER
+from vim_turing_machine.machines.merge_overlapping_intervals.encode_intervals import CHUNK_SIZE
+
+
+# Characters of the tape that aren't bits
+IGNORED_CHARACTERS = str.maketrans('', '', BLANK_CHARACTER + ' \n')
 
 
 def decode_intervals(intervals, num_bits=BITS_PER_NUMBER):
-    result = []
-    clean_intervals = intervals.replace(BLANK_CHARACTER, '').replace(' ', '')
-    index = 0
-    while index < len(clean_intervals):
-        begin = clean_intervals[index:index + num_bits]
-        begin = int(begin, 2)
-        index += num_bits
-        end = clean_intervals[index:index + num_bits]
-        end = int(end, 2)
-        index += num_bits
-        result.append([begin, end])
+    return list(iter_decoded_intervals([intervals], num_bits))
+
+
+def iter_decoded_intervals(chunks, num_bits=BITS_PER_NUMBER):
+    """Decodes a tape that is split into chunks anywhere, one interval at a
+    time
+
+    :rtype: iterator of [begin, end]
+    """
+    interval_length = 2 * num_bits
+    bits = ''
+    for chunk in chunks:
+        bits += chunk.translate(IGNORED_CHARACTERS)
+
+        num_complete_bits = len(bits) - len(bits) % interval_length
+        for index in range(0, num_complete_bits, interval_length):
+            yield [int(bits[index:index + num_bits], 2), int(bits[index + num_bits:index + interval_length], 2)]
 
-    return result
+        bits = bits[num_complete_bits:]
+
+    if bits:
+        raise ValueError('The tape ends in the middle of an interval: {}'.format(bits))
+
+
+def read_tape(f, chunk_size=CHUNK_SIZE):
+    """:rtype: iterator of str"""
+    return iter(lambda: f.read(chunk_size), '')
+
+
+def write_intervals(intervals, f, chunk_size=CHUNK_SIZE):
+    """Writes the intervals as a json array, a chunk of about chunk_size
+    characters at a time"""
+    separator = '['
+    chunk = []
+    chunk_length = 0
+    for begin, end in intervals:
+        encoded = '{}[{}, {}]'.format(separator, begin, end)
+        separator = ', '
+        chunk.append(encoded)
+        chunk_length += len(encoded)
+        if chunk_length >= chunk_size:
+            f.write(''.join(chunk))
+            chunk = []
+            chunk_length = 0
+
+    chunk.append('[]\n' if separator == '[' else ']\n')
+    f.write(''.join(chunk))
 
 
 if __name__ == '__main__':
-    print(json.dumps(decode_intervals(sys.argv[1], int(sys.argv[2]))))
+    num_bits = int(sys.argv[2])
+
+    if sys.argv[1] == '-':
+        write_intervals(iter_decoded_intervals(read_tape(sys.stdin), num_bits), sys.stdout)
+    else:
+        print(json.dumps(decode_intervals(sys.argv[1], num_bits)))
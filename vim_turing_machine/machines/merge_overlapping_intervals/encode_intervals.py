@@ -1,19 +1,38 @@
 """Encodes a json representation of the intervals into the 5-bit binary
 representation used by the merge overlapping intervals turing machine. It
-takes input from stdin and outputs the initial tape."""
-import json
+takes input from stdin and outputs the initial tape.
+
+    python -m vim_turing_machine.machines.merge_overlapping_intervals.encode_intervals [num_bits] [input_file]
+
+The input is either a json array of intervals or one interval per line, e.g.
+`[1, 2]` or `1 2`. It is read and written in chunks, so the size of the tape
+isn't limited by memory.
+"""
+import re
 import sys
 
 from vim_turing_machine.constants import BITS_PER_NUMBER
 
 
+# Characters read or written at a time by the streaming functions
+CHUNK_SIZE = 1 << 20
+
+# A number or an interval, as opposed to a bracket or a comma
+VALUE = 'value'
+
+# Numbers, brackets, commas and newlines, or anything that can't be part of a
+# list of intervals
+TOKEN_PATTERN = re.compile(r'\d+|[\[\],\n]|[^\d\s\[\],]+')
+
+
 def encode_intervals(intervals, num_bits=BITS_PER_NUMBER):
-    result = ''
-    for (begin, end) in intervals:
-        result += encode_in_x_bits(begin, num_bits)
-        result += encode_in_x_bits(end, num_bits)
+    return ''.join(iter_encoded_intervals(intervals, num_bits))
 
-    return result
+
+def iter_encoded_intervals(intervals, num_bits=BITS_PER_NUMBER):
+    """Encodes the intervals one at a time"""
+    for (begin, end) in intervals:
+        yield encode_in_x_bits(begin, num_bits) + encode_in_x_bits(end, num_bits)
 
 
 def encode_in_x_bits(number, num_bits):
@@ -24,5 +43,120 @@ def encode_in_x_bits(number, num_bits):
     return '0' * (num_bits - len(encoded)) + encoded
 
 
+def read_intervals(f, chunk_size=CHUNK_SIZE):
+    """Reads intervals from a file as they are needed. The file is a json
+    array of intervals or has one interval per line, with or without
+    brackets. Inside brackets the numbers and intervals are separated by
+    exactly one comma, like in json. Raises ValueError for anything else,
+    like an interval that doesn't have exactly two numbers.
+
+    :rtype: iterator of [begin, end]
+    """
+    depth = 0
+    numbers = []
+    # Whether the list that is open at depth 1 is a list of intervals
+    has_intervals = False
+    # The last of '[', ',' and VALUE inside the innermost open list
+    previous = None
+
+    for token in _read_tokens(f, chunk_size):
+        if token == ',':
+            if depth == 0 or previous != VALUE:
+                raise ValueError('Unexpected ,')
+            previous = token
+            continue
+
+        if depth and previous == VALUE and token not in (']', '\n'):
+            raise ValueError('Missing , before {}'.format(token))
+
+        if token == '[':
+            if numbers or depth == 2:
+                raise ValueError('Intervals can\'t be nested')
+            has_intervals = depth == 1
+            depth += 1
+            previous = token
+        elif token == ']':
+            if depth == 0:
+                raise ValueError('Unmatched ]')
+            if previous == ',':
+                raise ValueError('Unexpected , before ]')
+            if depth == 2 or numbers:
+                yield _interval(numbers)
+            numbers = []
+            depth -= 1
+            previous = VALUE
+        elif token == '\n':
+            if depth == 0 and numbers:
+                yield _interval(numbers)
+                numbers = []
+        elif depth == 1 and has_intervals:
+            raise ValueError('Numbers must be in an interval: {}'.format(token))
+        else:
+            numbers.append(token)
+            previous = VALUE
+
+    if depth:
+        raise ValueError('Unmatched [')
+    if numbers:
+        yield _interval(numbers)
+
+
+def _interval(numbers):
+    if len(numbers) != 2:
+        raise ValueError('An interval has two numbers, not {}'.format(numbers))
+    return list(numbers)
+
+
+def _read_tokens(f, chunk_size):
+    """Yields the numbers as ints and the brackets, commas and newlines as
+    strs"""
+    partial_number = ''
+    while True:
+        chunk = f.read(chunk_size)
+        text = partial_number + chunk
+
+        # A number at the end of a chunk can continue in the next one
+        partial_number = ''
+        if chunk and text[-1:].isdigit():
+            keep = len(text) - len(text.rstrip('0123456789'))
+            text, partial_number = text[:-keep], text[-keep:]
+
+        for match in TOKEN_PATTERN.finditer(text):
+            token = match.group()
+            if token.isdigit():
+                yield int(token)
+            elif token in '[],\n':
+                yield token
+            else:
+                raise ValueError('Invalid interval: {!r}'.format(token))
+
+        if not chunk:
+            return
+
+
+def write_tape(intervals, f, num_bits=BITS_PER_NUMBER, chunk_size=CHUNK_SIZE):
+    """Writes the tape of the intervals in chunks of about chunk_size
+    characters"""
+    interval_length = 2 * num_bits
+    intervals_per_chunk = max(chunk_size // interval_length, 1)
+
+    chunk = []
+    for encoded in iter_encoded_intervals(intervals, num_bits):
+        chunk.append(encoded)
+        if len(chunk) == intervals_per_chunk:
+            f.write(''.join(chunk))
+            chunk = []
+
+    f.write(''.join(chunk))
+
+
 if __name__ == '__main__':
-    print(encode_intervals(json.load(sys.stdin)))
+    num_bits = int(sys.argv[1]) if len(sys.argv) > 1 else BITS_PER_NUMBER
+
+    if len(sys.argv) > 2 and sys.argv[2] != '-':
+        with open(sys.argv[2]) as f:
+            write_tape(read_intervals(f), sys.stdout, num_bits)
+    else:
+        write_tape(read_intervals(sys.stdin), sys.stdout, num_bits)
+
+    sys.stdout.write('\n')
@@ -0,0 +1,75 @@
+"""Encodes and decodes many intervals at once with numpy.
+
+The same tapes as encode_intervals and decode_intervals, but from and to an
+(N, 2) array of integers. Tapes are uint8 arrays of characters, so
+`tape.tobytes().decode()` is the tape as a string.
+
+Requires numpy: pip install vim-turing-machine[numpy]
+"""
+import numpy
+
+from vim_turing_machine.constants import BITS_PER_NUMBER
+from vim_turing_machine.constants import BLANK_CHARACTER
+
+
+# Numbers are unpacked from and packed into 64 bit integers, and have to fit
+# in an int64
+WORD_BITS = 64
+MAX_BITS = 63
+
+ZERO = ord('0')
+IGNORED_CHARACTERS = numpy.frombuffer((BLANK_CHARACTER + ' \n').encode(), dtype=numpy.uint8)
+
+
+def encode_intervals_array(intervals, num_bits=BITS_PER_NUMBER):
+    """:param intervals: Anything numpy can turn into an (N, 2) integer array
+    :rtype: numpy.ndarray of uint8 characters, with 2 * num_bits per interval
+    """
+    assert 0 < num_bits <= MAX_BITS
+    numbers = numpy.asarray(intervals, dtype=numpy.int64).reshape(-1, 2)
+
+    if numbers.size:
+        assert numbers.min() >= 0, 'Negative numbers can\'t be encoded'
+        assert numbers.max() < 1 << num_bits, '{} doesn\'t fit in {} bits'.format(numbers.max(), num_bits)
+
+    # Big endian, so that the bits of every number come out most significant
+    # first. Only the low bytes that can hold num_bits are unpacked.
+    num_bytes = (num_bits + 7) // 8
+    words = numbers.astype('>u8').view(numpy.uint8).reshape(-1, WORD_BITS // 8)
+    low_bytes = numpy.ascontiguousarray(words[:, WORD_BITS // 8 - num_bytes:])
+    bits = numpy.unpackbits(low_bytes).reshape(-1, 8 * num_bytes)[:, 8 * num_bytes - num_bits:]
+
+    return (bits + numpy.uint8(ZERO)).ravel()
+
+
+def decode_intervals_array(tape, num_bits=BITS_PER_NUMBER):
+    """Blanks, spaces and newlines are skipped, like decode_intervals does
+
+    :param tape: A str, bytes or uint8 array of characters
+    :rtype: numpy.ndarray of shape (N, 2)
+    """
+    assert 0 < num_bits <= MAX_BITS
+    if isinstance(tape, str):
+        tape = tape.encode()
+    characters = numpy.frombuffer(tape, dtype=numpy.uint8) if isinstance(tape, bytes) else numpy.asarray(tape)
+
+    # '0' and '1' become 0 and 1, and everything else wraps around to more than 1
+    bits = characters - numpy.uint8(ZERO)
+    is_bit = bits <= 1
+    if not is_bit.all():
+        if not numpy.isin(characters[~is_bit], IGNORED_CHARACTERS).all():
+            raise ValueError('The tape has characters that are not bits')
+        bits = bits[is_bit]
+
+    if bits.size % (2 * num_bits):
+        raise ValueError('The tape ends in the middle of an interval')
+
+    # Pack every number into whole bytes, and those into the low bytes of a
+    # big endian word
+    num_bytes = (num_bits + 7) // 8
+    padded = numpy.zeros((bits.size // num_bits, 8 * num_bytes), dtype=numpy.uint8)
+    padded[:, 8 * num_bytes - num_bits:] = bits.reshape(-1, num_bits)
+    words = numpy.zeros((padded.shape[0], WORD_BITS // 8), dtype=numpy.uint8)
+    words[:, WORD_BITS // 8 - num_bytes:] = numpy.packbits(padded).reshape(-1, num_bytes)
+
+    return words.view('>u8').astype(numpy.int64).reshape(-1, 2)
@@ -0,0 +1,492 @@
+"""A merge overlapping intervals machine whose head travel per interval doesn't
+depend on the number of intervals.
+
+MergeOverlappingIntervalsGenerator copies every bit to an output array after
+the input, so each interval costs a trip across the whole tape and the total
+number of steps grows quadratically with the number of intervals. This
+machine merges in place instead. The tape always looks like
+
+    MERGED<Blanks>CURRENT NEXT REST
+
+where CURRENT is the interval being merged into, NEXT is the interval right
+after it and MERGED are the intervals that are done. The head only ever moves
+between the start of CURRENT (P below) and the end of NEXT:
+
+* If NEXT starts after CURRENT ends, CURRENT is done and NEXT becomes CURRENT.
+* Otherwise NEXT is overwritten with the merged interval and CURRENT is
+  erased, leaving blanks between MERGED and the new CURRENT.
+
+Every step of the machine stays within 4 * num_bits cells of P and P only moves
+forwards, so the steps per interval are O(num_bits ** 2) regardless of the
+number of intervals. The tape uses the same encoding as
+MergeOverlappingIntervalsGenerator: encode_intervals produces the initial
+tape and decode_intervals reads the result, which skips the blanks.
+"""
+import json
+import sys
+
+from vim_turing_machine.constants import BITS_PER_NUMBER
+from vim_turing_machine.constants import BLANK_CHARACTER
+from vim_turing_machine.constants import INITIAL_STATE
+from vim_turing_machine.constants import VALID_CHARACTERS
+from vim_turing_machine.constants import YES_FINAL_STATE
+from vim_turing_machine.machines.merge_overlapping_intervals.decode_intervals import decode_intervals
+from vim_turing_machine.machines.merge_overlapping_intervals.encode_intervals import encode_intervals
+from vim_turing_machine.machines.merge_overlapping_intervals.merge_overlapping_intervals import invert_bit
+from vim_turing_machine.struct import BACKWARDS
+from vim_turing_machine.struct import DO_NOT_MOVE
+from vim_turing_machine.struct import FORWARDS
+from vim_turing_machine.struct import StateTransition
+from vim_turing_machine.turing_machine import TuringMachine
+
+
+class LinearMergeOverlappingIntervalsGenerator(object):
+    def __init__(self, num_bits=BITS_PER_NUMBER):
+        self._num_bits = num_bits
+
+    def merge_overlapping_intervals_transitions(self):
+        """This is the main orchestration point of the program. Every block
+        starts and ends with the cursor at P, the beginning of CURRENT."""
+        num_bits = self._num_bits
+
+        # Offsets of the numbers from P
+        CURRENT_OPENING = 0
+        CURRENT_CLOSING = num_bits
+        NEXT_OPENING = 2 * num_bits
+        NEXT_CLOSING = 3 * num_bits
+
+        CHECK_NEXT_INTERVAL = 'CheckNextInterval'
+        COMPARE_NEXT_OPENING = 'CompareNextOpening'
+        ADVANCE_TO_NEXT_INTERVAL = 'AdvanceToNextInterval'
+        MERGE = 'Merge'
+        KEEP_NEXT_CLOSING = 'KeepNextClosing'
+        KEEP_CURRENT_CLOSING = 'KeepCurrentClosing'
+        ERASE_CURRENT_CLOSING = 'EraseCurrentClosing'
+        COPY_CURRENT_CLOSING = 'CopyCurrentClosing'
+
+        transitions = [
+            StateTransition(
+                previous_state=INITIAL_STATE,
+                previous_character=character,
+                next_state=CHECK_NEXT_INTERVAL,
+                next_character=character,
+                tape_pointer_direction=DO_NOT_MOVE,
+            )
+            for character in sorted(VALID_CHARACTERS)
+        ]
+
+        # Stop if there is no NEXT. This also handles an empty tape.
+        transitions.extend(
+            self.check_for_number(
+                initial_state=CHECK_NEXT_INTERVAL,
+                offset=NEXT_OPENING,
+                found_state=COMPARE_NEXT_OPENING,
+                missing_state=YES_FINAL_STATE,
+            )
+        )
+
+        # CURRENT and NEXT overlap if NEXT opens before CURRENT closes
+        transitions.extend(
+            self.compare_numbers(
+                initial_state=COMPARE_NEXT_OPENING,
+                first_offset=CURRENT_CLOSING,
+                second_offset=NEXT_OPENING,
+                greater_than_or_equal_to_state=MERGE,
+                less_than_state=ADVANCE_TO_NEXT_INTERVAL,
+            )
+        )
+
+        # NEXT becomes CURRENT
+        transitions.extend(
+            self.move_n_cells(
+                initial_state=ADVANCE_TO_NEXT_INTERVAL,
+                direction=FORWARDS,
+                final_state=CHECK_NEXT_INTERVAL,
+                num_cells=NEXT_OPENING,
+            )
+        )
+
+        # The merged interval closes at the larger of the two closing values
+        transitions.extend(
+            self.compare_numbers(
+                initial_state=MERGE,
+                first_offset=CURRENT_CLOSING,
+                second_offset=NEXT_CLOSING,
+                greater_than_or_equal_to_state=KEEP_CURRENT_CLOSING,
+                less_than_state=KEEP_NEXT_CLOSING,
+            )
+        )
+
+        # Either way, the merged interval opens at CURRENT's opening value.
+        # Moving it into NEXT erases it from CURRENT.
+        transitions.extend(
+            self.copy_number(
+                initial_state=KEEP_NEXT_CLOSING,
+                source_offset=CURRENT_OPENING,
+                destination_offset=NEXT_OPENING,
+                final_state=ERASE_CURRENT_CLOSING,
+            )
+        )
+        transitions.extend(
+            self.erase_number(
+                initial_state=ERASE_CURRENT_CLOSING,
+                offset=CURRENT_CLOSING,
+                final_state=ADVANCE_TO_NEXT_INTERVAL,
+            )
+        )
+
+        transitions.extend(
+            self.copy_number(
+                initial_state=KEEP_CURRENT_CLOSING,
+                source_offset=CURRENT_OPENING,
+                destination_offset=NEXT_OPENING,
+                final_state=COPY_CURRENT_CLOSING,
+            )
+        )
+        transitions.extend(
+            self.copy_number(
+                initial_state=COPY_CURRENT_CLOSING,
+                source_offset=CURRENT_CLOSING,
+                destination_offset=NEXT_CLOSING,
+                final_state=ADVANCE_TO_NEXT_INTERVAL,
+            )
+        )
+
+        return transitions
+
+    def move_n_cells(self, initial_state, direction, final_state, num_cells):
+        """Moves 'num_cells' in the specified direction over any characters.
+        Moving 0 cells takes one step that doesn't move."""
+        if num_cells == 0:
+            return [
+                StateTransition(
+                    previous_state=initial_state,
+                    previous_character=character,
+                    next_state=final_state,
+                    next_character=character,
+                    tape_pointer_direction=DO_NOT_MOVE,
+                )
+                for character in sorted(VALID_CHARACTERS)
+            ]
+
+        def state_name(cell_index):
+            if cell_index == 0:
+                return initial_state
+            elif cell_index == num_cells:
+                return final_state
+            else:
+                return '{}MovingCell{}'.format(initial_state, cell_index)
+
+        return [
+            StateTransition(
+                previous_state=state_name(cell_index),
+                previous_character=character,
+                next_state=state_name(cell_index + 1),
+                next_character=character,
+                tape_pointer_direction=direction,
+            )
+            for cell_index in range(num_cells)
+            for character in sorted(VALID_CHARACTERS)
+        ]
+
+    def return_to_start(self, prefix, final_state, max_offset):
+        """States that move back to P from any offset up to max_offset and
+        then enter final_state. Use `return_state(prefix, final_state, offset)`
+        to enter them from `offset`."""
+        transitions = []
+        for offset in range(1, max_offset + 1):
+            transitions.extend(
+                StateTransition(
+                    previous_state=self.return_state(prefix, final_state, offset),
+                    previous_character=character,
+                    next_state=self.return_state(prefix, final_state, offset - 1),
+                    next_character=character,
+                    tape_pointer_direction=BACKWARDS,
+                )
+                for character in sorted(VALID_CHARACTERS)
+            )
+
+        return transitions
+
+    def return_state(self, prefix, final_state, offset):
+        if offset == 0:
+            return final_state
+        else:
+            return '{}ReturningTo{}From{}'.format(prefix, final_state, offset)
+
+    def check_for_number(self, initial_state, offset, found_state, missing_state):
+        """Checks whether there is a number at offset.
+
+        Precondition: The cursor is at P
+        Postcondition: The cursor is at P in the found_state, or at offset in
+            the missing_state
+        """
+        LOOKING = '{}Looking'.format(initial_state)
+
+        transitions = self.move_n_cells(
+            initial_state=initial_state,
+            direction=FORWARDS,
+            final_state=LOOKING,
+            num_cells=offset,
+        )
+
+        transitions.append(
+            StateTransition(
+                previous_state=LOOKING,
+                previous_character=BLANK_CHARACTER,
+                next_state=missing_state,
+                next_character=BLANK_CHARACTER,
+                tape_pointer_direction=DO_NOT_MOVE,
+            )
+        )
+
+        transitions.extend(
+            StateTransition(
+                previous_state=LOOKING,
+                previous_character=bit_value,
+                next_state=self.return_state(initial_state, found_state, offset - 1),
+                next_character=bit_value,
+                tape_pointer_direction=BACKWARDS,
+            )
+            for bit_value in ['0', '1']
+        )
+        transitions.extend(self.return_to_start(initial_state, found_state, offset - 1))
+
+        return transitions
+
+    def compare_numbers(self, initial_state, first_offset, second_offset, greater_than_or_equal_to_state, less_than_state):
+        """
+        If the number at first_offset is greater than or equal to the number
+        at second_offset, this ends in the greater_than_or_equal_to_state.
+        Otherwise it ends in the less_than_state. The numbers are compared
+        from the most significant bit, carrying the bit of the first number
+        over to the second number in the state.
+
+        Precondition: The cursor is at P
+        Postcondition: The cursor is at P
+        """
+        distance = second_offset - first_offset
+
+        def about_to_read_first_bit_state(bit_index):
+            return '{}BitIndex{}'.format(initial_state, bit_index)
+
+        def already_have_one_bit_state(bit_index, bit_value):
+            return '{}BitIndex{}BitValue{}'.format(initial_state, bit_index, bit_value)
+
+        def about_to_compare_bits_state(bit_index, bit_value):
+            return '{}BitIndex{}CompareWithBitValue{}'.format(initial_state, bit_index, bit_value)
+
+        def next_bit_state(bit_index):
+            return '{}BitIndex{}Equal'.format(initial_state, bit_index)
+
+        transitions = self.move_n_cells(
+            initial_state=initial_state,
+            direction=FORWARDS,
+            final_state=about_to_read_first_bit_state(bit_index=0),
+            num_cells=first_offset,
+        )
+
+        for bit_index in range(self._num_bits):
+            is_last_bit = bit_index == self._num_bits - 1
+
+            for bit_value in ['0', '1']:
+                # Read the bit of the first number
+                transitions.append(
+                    StateTransition(
+                        previous_state=about_to_read_first_bit_state(bit_index),
+                        previous_character=bit_value,
+                        next_state=already_have_one_bit_state(bit_index, bit_value),
+                        next_character=bit_value,
+                        tape_pointer_direction=FORWARDS,
+                    )
+                )
+
+                # Then go to the equivalent bit in the other number. We already
+                # moved 1 space in that direction.
+                transitions.extend(
+                    self.move_n_cells(
+                        initial_state=already_have_one_bit_state(bit_index, bit_value),
+                        direction=FORWARDS,
+                        final_state=about_to_compare_bits_state(bit_index, bit_value),
+                        num_cells=distance - 1,
+                    )
+                )
+
+                # If the bits are equal, go back to the next bit of the first
+                # number. If this was the last bit, the numbers are equal.
+                transitions.append(
+                    StateTransition(
+                        previous_state=about_to_compare_bits_state(bit_index, bit_value),
+                        previous_character=bit_value,
+                        next_state=(
+                            self.return_state(initial_state, greater_than_or_equal_to_state, second_offset + bit_index - 1)
+                            if is_last_bit
+                            else next_bit_state(bit_index)
+                        ),
+                        next_character=bit_value,
+                        tape_pointer_direction=BACKWARDS,
+                    )
+                )
+
+                # If they are not, the bit of the first number decides
+                transitions.append(
+                    StateTransition(
+                        previous_state=about_to_compare_bits_state(bit_index, bit_value),
+                        previous_character=invert_bit(bit_value),
+                        next_state=self.return_state(
+                            initial_state,
+                            greater_than_or_equal_to_state if bit_value == '1' else less_than_state,
+                            second_offset + bit_index - 1,
+                        ),
+                        next_character=invert_bit(bit_value),
+                        tape_pointer_direction=BACKWARDS,
+                    )
+                )
+
+            if not is_last_bit:
+                transitions.extend(
+                    self.move_n_cells(
+                        initial_state=next_bit_state(bit_index),
+                        direction=BACKWARDS,
+                        final_state=about_to_read_first_bit_state(bit_index + 1),
+                        num_cells=distance - 2,
+                    )
+                )
+
+        max_offset = second_offset + self._num_bits - 2
+        transitions.extend(self.return_to_start(initial_state, greater_than_or_equal_to_state, max_offset))
+        transitions.extend(self.return_to_start(initial_state, less_than_state, max_offset))
+
+        return transitions
+
+    def copy_number(self, initial_state, source_offset, destination_offset, final_state):
+        """Moves the number at source_offset to destination_offset, replacing
+        the source with blanks.
+
+        Precondition: The cursor is at P
+        Postcondition: The cursor is at P
+        """
+        distance = destination_offset - source_offset
+
+        def about_to_read_bit_state(bit_index):
+            return '{}CopyingBitIndex{}'.format(initial_state, bit_index)
+
+        def carrying_bit_state(bit_index, bit_value):
+            return '{}CopyingBitIndex{}BitValue{}'.format(initial_state, bit_index, bit_value)
+
+        def about_to_write_bit_state(bit_index, bit_value):
+            return '{}WritingBitIndex{}BitValue{}'.format(initial_state, bit_index, bit_value)
+
+        def wrote_bit_state(bit_index):
+            return '{}WroteBitIndex{}'.format(initial_state, bit_index)
+
+        transitions = self.move_n_cells(
+            initial_state=initial_state,
+            direction=FORWARDS,
+            final_state=about_to_read_bit_state(bit_index=0),
+            num_cells=source_offset,
+        )
+
+        for bit_index in range(self._num_bits):
+            is_last_bit = bit_index == self._num_bits - 1
+
+            for bit_value in ['0', '1']:
+                transitions.append(
+                    StateTransition(
+                        previous_state=about_to_read_bit_state(bit_index),
+                        previous_character=bit_value,
+                        next_state=carrying_bit_state(bit_index, bit_value),
+                        next_character=BLANK_CHARACTER,
+                        tape_pointer_direction=FORWARDS,
+                    )
+                )
+
+                transitions.extend(
+                    self.move_n_cells(
+                        initial_state=carrying_bit_state(bit_index, bit_value),
+                        direction=FORWARDS,
+                        final_state=about_to_write_bit_state(bit_index, bit_value),
+                        num_cells=distance - 1,
+                    )
+                )
+
+                transitions.extend(
+                    StateTransition(
+                        previous_state=about_to_write_bit_state(bit_index, bit_value),
+                        previous_character=character,
+                        next_state=(
+                            self.return_state(initial_state, final_state, destination_offset + bit_index - 1)
+                            if is_last_bit
+                            else wrote_bit_state(bit_index)
+                        ),
+                        next_character=bit_value,
+                        tape_pointer_direction=BACKWARDS,
+                    )
+                    for character in sorted(VALID_CHARACTERS)
+                )
+
+            if not is_last_bit:
+                transitions.extend(
+                    self.move_n_cells(
+                        initial_state=wrote_bit_state(bit_index),
+                        direction=BACKWARDS,
+                        final_state=about_to_read_bit_state(bit_index + 1),
+                        num_cells=distance - 2,
+                    )
+                )
+
+        transitions.extend(
+            self.return_to_start(initial_state, final_state, destination_offset + self._num_bits - 2)
+        )
+
+        return transitions
+
+    def erase_number(self, initial_state, offset, final_state):
+        """Replaces the number at offset with blanks.
+
+        Precondition: The cursor is at P
+        Postcondition: The cursor is at P
+        """
+        def state_name(bit_index):
+            return '{}ErasingBit{}'.format(initial_state, bit_index)
+
+        transitions = self.move_n_cells(
+            initial_state=initial_state,
+            direction=FORWARDS,
+            final_state=state_name(bit_index=0),
+            num_cells=offset,
+        )
+
+        for bit_index in range(self._num_bits):
+            transitions.extend(
+                StateTransition(
+                    previous_state=state_name(bit_index),
+                    previous_character=bit_value,
+                    next_state=(
+                        state_name(bit_index + 1)
+                        if bit_index < self._num_bits - 1
+                        else self.return_state(initial_state, final_state, offset + bit_index - 1)
+                    ),
+                    next_character=BLANK_CHARACTER,
+                    tape_pointer_direction=FORWARDS if bit_index < self._num_bits - 1 else BACKWARDS,
+                )
+                for bit_value in ['0', '1']
+            )
+
+        transitions.extend(self.return_to_start(initial_state, final_state, offset + self._num_bits - 2))
+
+        return transitions
+
+
+if __name__ == '__main__':
+    input_string = json.loads(sys.argv[1])
+    num_bits = int(sys.argv[2])
+
+    initial_tape = encode_intervals(input_string, num_bits)
+
+    gen = LinearMergeOverlappingIntervalsGenerator(num_bits)
+    merge_overlapping_intervals = TuringMachine(gen.merge_overlapping_intervals_transitions(), quiet=True)
+    result = merge_overlapping_intervals.run(initial_tape=initial_tape)
+
+    print(decode_intervals(str(merge_overlapping_intervals.tape), num_bits))
+    print('Steps: {}'.format(result.num_steps))
@@ -24,6 +24,7 @@ from vim_turing_machine.struct import BACKWARDS
 from vim_turing_machine.struct import DO_NOT_MOVE
 from vim_turing_machine.struct import FORWARDS
 from vim_turing_machine.struct import StateTransition
+from vim_turing_machine.turing_machine import print_result
 from vim_turing_machine.turing_machine import TuringMachine
 
 
@@ -673,7 +674,11 @@ if __name__ == '__main__':
     initial_tape = encode_intervals(input_string, num_bits)
 
     gen = MergeOverlappingIntervalsGenerator(num_bits)
-    merge_overlapping_intervals = TuringMachine(gen.merge_overlapping_intervals_transitions(), debug=True)
+    merge_overlapping_intervals = TuringMachine(
+        gen.merge_overlapping_intervals_transitions(),
+        debug=True,
+        reporter=print_result,
+    )
     merge_overlapping_intervals.run(initial_tape=initial_tape, max_steps=5000)
 
-    print(decode_intervals(''.join(merge_overlapping_intervals.tape), num_bits))
+    print(decode_intervals(str(merge_overlapping_intervals.tape), num_bits))
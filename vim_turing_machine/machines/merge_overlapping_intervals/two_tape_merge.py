@@ -0,0 +1,294 @@
+"""A merge overlapping intervals machine with an input tape and an output tape.
+
+Tape 0 holds the intervals from encode_intervals and tape 1 starts out empty
+and ends up holding the merged intervals, which decode_intervals reads. The
+input head only moves forwards apart from backing up over a single number, and
+the output head never goes further back than the last merged interval, so every
+interval takes O(num_bits) steps.
+
+For every interval (a, b) on the input, with (_, c) the last merged interval:
+
+* If c < a, the interval is copied to the output.
+* Otherwise it overlaps, and b replaces c if c < b.
+
+`lower_to_single_tape` compiles the machine so that TuringMachine and
+VimTuringMachine can run it, although the simulation costs more steps since
+a single head has to walk between the two.
+"""
+import json
+import sys
+from itertools import product
+
+from vim_turing_machine.constants import BACKWARDS
+from vim_turing_machine.constants import BITS_PER_NUMBER
+from vim_turing_machine.constants import BLANK_CHARACTER
+from vim_turing_machine.constants import DO_NOT_MOVE
+from vim_turing_machine.constants import FORWARDS
+from vim_turing_machine.constants import INITIAL_STATE
+from vim_turing_machine.constants import VALID_CHARACTERS
+from vim_turing_machine.constants import YES_FINAL_STATE
+from vim_turing_machine.machines.merge_overlapping_intervals.decode_intervals import decode_intervals
+from vim_turing_machine.machines.merge_overlapping_intervals.encode_intervals import encode_intervals
+from vim_turing_machine.multi_tape import MultiTapeTuringMachine
+from vim_turing_machine.struct import MultiTapeStateTransition
+
+
+INPUT_TAPE = 0
+OUTPUT_TAPE = 1
+NUM_TAPES = 2
+
+BITS = ('0', '1')
+
+
+class TwoTapeMergeOverlappingIntervalsGenerator(object):
+    def __init__(self, num_bits=BITS_PER_NUMBER):
+        self._num_bits = num_bits
+
+    def merge_overlapping_intervals_transitions(self):
+        """Every block starts with the input head at the beginning of an
+        interval. The output head is at the end of the output, except in
+        the comparisons."""
+        num_bits = self._num_bits
+
+        COPY_INTERVAL = INITIAL_STATE
+        CHECK_NEXT_INTERVAL = 'CheckNextInterval'
+        COMPARE_OPENING = 'CompareOpening'
+        NO_OVERLAP = 'NoOverlap'
+        OVERLAP = 'Overlap'
+        COMPARE_CLOSING = 'CompareClosing'
+        REPLACE_CLOSING = 'ReplaceClosing'
+        COPY_CLOSING = 'CopyClosing'
+
+        # The first interval is always copied
+        transitions = self.check_for_interval(
+            initial_state=COPY_INTERVAL,
+            found_state='{}Copying'.format(COPY_INTERVAL),
+            missing_state=YES_FINAL_STATE,
+        )
+        transitions.extend(
+            self.copy_bits(
+                initial_state='{}Copying'.format(COPY_INTERVAL),
+                final_state=CHECK_NEXT_INTERVAL,
+                num_bits=2 * num_bits,
+            )
+        )
+
+        # Moves back to the closing number of the last merged interval
+        transitions.extend(
+            self.check_for_interval(
+                initial_state=CHECK_NEXT_INTERVAL,
+                found_state='{}Found'.format(CHECK_NEXT_INTERVAL),
+                missing_state=YES_FINAL_STATE,
+            )
+        )
+        transitions.extend(
+            self.move_n_cells(
+                initial_state='{}Found'.format(CHECK_NEXT_INTERVAL),
+                directions=(DO_NOT_MOVE, BACKWARDS),
+                final_state=COMPARE_OPENING,
+                num_cells=num_bits,
+            )
+        )
+
+        # The intervals overlap if the opening number isn't after the closing number
+        transitions.extend(
+            self.compare_numbers(
+                initial_state=COMPARE_OPENING,
+                input_less_than_or_equal_state=OVERLAP,
+                input_greater_than_state=NO_OVERLAP,
+            )
+        )
+
+        # Copy the whole interval
+        transitions.extend(
+            self.move_n_cells(
+                initial_state=NO_OVERLAP,
+                directions=(BACKWARDS, DO_NOT_MOVE),
+                final_state='{}Copying'.format(COPY_INTERVAL),
+                num_cells=num_bits,
+            )
+        )
+
+        transitions.extend(
+            self.move_n_cells(
+                initial_state=OVERLAP,
+                directions=(DO_NOT_MOVE, BACKWARDS),
+                final_state=COMPARE_CLOSING,
+                num_cells=num_bits,
+            )
+        )
+
+        # Keep the larger closing number
+        transitions.extend(
+            self.compare_numbers(
+                initial_state=COMPARE_CLOSING,
+                input_less_than_or_equal_state=CHECK_NEXT_INTERVAL,
+                input_greater_than_state=REPLACE_CLOSING,
+            )
+        )
+        transitions.extend(
+            self.move_n_cells(
+                initial_state=REPLACE_CLOSING,
+                directions=(BACKWARDS, BACKWARDS),
+                final_state=COPY_CLOSING,
+                num_cells=num_bits,
+            )
+        )
+        transitions.extend(
+            self.copy_bits(
+                initial_state=COPY_CLOSING,
+                final_state=CHECK_NEXT_INTERVAL,
+                num_bits=num_bits,
+            )
+        )
+
+        return transitions
+
+    def transitions_for_characters(self, previous_state, characters, next_state, next_characters, directions):
+        """A transition for every combination of characters. None in
+        characters matches any character, and None in next_characters
+        keeps whatever character was read.
+
+        :param characters: One entry per tape, as in MultiTapeStateTransition
+        """
+        options = [
+            sorted(VALID_CHARACTERS) if character is None else [character]
+            for character in characters
+        ]
+
+        return [
+            MultiTapeStateTransition(
+                previous_state=previous_state,
+                previous_characters=previous_characters,
+                next_state=next_state,
+                next_characters=tuple(
+                    previous_character if next_character is None else next_character
+                    for previous_character, next_character in zip(previous_characters, next_characters)
+                ),
+                tape_pointer_directions=directions,
+            )
+            for previous_characters in product(*options)
+        ]
+
+    def check_for_interval(self, initial_state, found_state, missing_state):
+        """Checks whether the input head is on an interval without moving"""
+        transitions = self.transitions_for_characters(
+            initial_state,
+            (BLANK_CHARACTER, None),
+            missing_state,
+            (None, None),
+            (DO_NOT_MOVE, DO_NOT_MOVE),
+        )
+        for bit in BITS:
+            transitions.extend(
+                self.transitions_for_characters(
+                    initial_state,
+                    (bit, None),
+                    found_state,
+                    (None, None),
+                    (DO_NOT_MOVE, DO_NOT_MOVE),
+                )
+            )
+
+        return transitions
+
+    def move_n_cells(self, initial_state, directions, final_state, num_cells):
+        """Moves the heads in the directions num_cells times"""
+        def state_name(cell_index):
+            if cell_index == 0:
+                return initial_state
+            elif cell_index == num_cells:
+                return final_state
+            else:
+                return '{}MovingCell{}'.format(initial_state, cell_index)
+
+        transitions = []
+        for cell_index in range(num_cells):
+            transitions.extend(
+                self.transitions_for_characters(
+                    state_name(cell_index),
+                    (None, None),
+                    state_name(cell_index + 1),
+                    (None, None),
+                    directions,
+                )
+            )
+
+        return transitions
+
+    def copy_bits(self, initial_state, final_state, num_bits):
+        """Copies num_bits bits from the input to the output"""
+        def state_name(bit_index):
+            if bit_index == 0:
+                return initial_state
+            elif bit_index == num_bits:
+                return final_state
+            else:
+                return '{}CopyingBit{}'.format(initial_state, bit_index)
+
+        transitions = []
+        for bit_index in range(num_bits):
+            for bit in BITS:
+                transitions.extend(
+                    self.transitions_for_characters(
+                        state_name(bit_index),
+                        (bit, None),
+                        state_name(bit_index + 1),
+                        (bit, bit),
+                        (FORWARDS, FORWARDS),
+                    )
+                )
+
+        return transitions
+
+    def compare_numbers(self, initial_state, input_less_than_or_equal_state, input_greater_than_state):
+        """Compares the number under the input head with the number under
+        the output head, most significant bit first. Both heads end up after
+        their numbers."""
+        num_bits = self._num_bits
+
+        def state_name(bit_index, comparison):
+            if bit_index == 0:
+                return initial_state
+            elif bit_index == num_bits:
+                if comparison == 'Greater':
+                    return input_greater_than_state
+                return input_less_than_or_equal_state
+            else:
+                return '{}Bit{}{}'.format(initial_state, bit_index, comparison)
+
+        transitions = []
+        for bit_index in range(num_bits):
+            comparisons = ['Equal'] if bit_index == 0 else ['Equal', 'Less', 'Greater']
+            for comparison in comparisons:
+                for input_bit, output_bit in product(BITS, BITS):
+                    if comparison == 'Equal' and input_bit != output_bit:
+                        next_comparison = 'Greater' if input_bit > output_bit else 'Less'
+                    else:
+                        next_comparison = comparison
+
+                    transitions.append(
+                        MultiTapeStateTransition(
+                            previous_state=state_name(bit_index, comparison),
+                            previous_characters=(input_bit, output_bit),
+                            next_state=state_name(bit_index + 1, next_comparison),
+                            next_characters=(input_bit, output_bit),
+                            tape_pointer_directions=(FORWARDS, FORWARDS),
+                        )
+                    )
+
+        return transitions
+
+
+if __name__ == '__main__':
+    input_string = json.loads(sys.argv[1])
+    num_bits = int(sys.argv[2])
+
+    initial_tape = encode_intervals(input_string, num_bits)
+
+    gen = TwoTapeMergeOverlappingIntervalsGenerator(num_bits)
+    merge_overlapping_intervals = MultiTapeTuringMachine(gen.merge_overlapping_intervals_transitions(), NUM_TAPES)
+    result = merge_overlapping_intervals.run(initial_tapes=[initial_tape, ''])
+
+    print(decode_intervals(str(merge_overlapping_intervals.tapes[OUTPUT_TAPE]), num_bits))
+    print('Steps: {}'.format(result.num_steps))
@@ -3,15 +3,29 @@ import sys
 
 from vim_turing_machine.machines.merge_overlapping_intervals.encode_intervals import encode_intervals
 from vim_turing_machine.machines.merge_overlapping_intervals.merge_overlapping_intervals import MergeOverlappingIntervalsGenerator
+from vim_turing_machine.optimizer import optimize_transitions
 from vim_turing_machine.vim_machine import VimTuringMachine
 
 
 if __name__ == '__main__':
     input_string = json.loads(sys.argv[1])
     num_bits = int(sys.argv[2])
+    profile_guided = '--profile-guided' in sys.argv[3:]
+    line_dispatch = '--line-dispatch' in sys.argv[3:]
+    compact_states = '--compact-states' in sys.argv[3:]
+    fuse_chains = '--fuse-chains' in sys.argv[3:]
 
     initial_tape = encode_intervals(input_string, num_bits)
 
     gen = MergeOverlappingIntervalsGenerator(num_bits)
-    merge_overlapping_intervals = VimTuringMachine(gen.merge_overlapping_intervals_transitions(), debug=False)
-    merge_overlapping_intervals.run(initial_tape=initial_tape)
+    transitions, report = optimize_transitions(gen.merge_overlapping_intervals_transitions())
+    print(report)
+
+    merge_overlapping_intervals = VimTuringMachine(transitions, debug=False)
+    merge_overlapping_intervals.run(
+        initial_tape=initial_tape,
+        profile_guided=profile_guided,
+        line_dispatch=line_dispatch,
+        compact_states=compact_states,
+        fuse_chains=fuse_chains,
+    )
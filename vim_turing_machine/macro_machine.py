@@ -0,0 +1,162 @@
+"""Runs a machine a block of k cells at a time.
+
+The tape is split into blocks of `block_size` cells. The first time the head
+enters a block with some contents, in some state, at some side of the block,
+the base machine is simulated inside the block until the head leaves it. The
+result (new contents, exit side, new state and number of base steps) is
+memoized, so the next time the same situation comes up the whole block is
+done in one step. Step counts are the exact number of base machine steps.
+
+When a step limit would be hit inside a block, or the machine loops forever
+inside one, that block is simulated one base step at a time instead so that
+the configuration at the limit is exact.
+
+Only tapes that are infinite to the right are supported.
+"""
+from vim_turing_machine.constants import BLANK_CHARACTER
+from vim_turing_machine.constants import FINAL_STATES
+from vim_turing_machine.constants import HALTED
+from vim_turing_machine.constants import MISSING
+from vim_turing_machine.constants import NEGATIVE
+from vim_turing_machine.constants import TOO_MANY_STEPS
+from vim_turing_machine.tape import ENCODING
+
+
+# The head left the block
+MOVED = 4
+# The machine never leaves the block
+LOOPING = 5
+
+
+class MacroMachine(object):
+
+    def __init__(self, state_transitions, block_size, blank_character=BLANK_CHARACTER):
+        self.block_size = block_size
+        self._blank_block = blank_character.encode(ENCODING) * block_size
+        self._mapping = {
+            (transition.previous_state, ord(transition.previous_character)): (
+                transition.next_state,
+                ord(transition.next_character),
+                transition.tape_pointer_direction,
+                transition.next_state in FINAL_STATES,
+            )
+            for transition in state_transitions
+        }
+        # (state, block, position) -> block result
+        self._block_results = {}
+
+    @property
+    def num_cached_blocks(self):
+        return len(self._block_results)
+
+    def run(self, tape, cursor_position, state, num_steps, limit):
+        """Runs the machine on the tape. The tape is updated in place.
+
+        :rtype: (status, cursor_position, state, num_steps)
+        """
+        block_size = self.block_size
+        cells = tape.to_bytes()
+        end = len(cells)
+        blocks = [
+            (cells[start:start + block_size] + self._blank_block)[:block_size]
+            for start in range(0, len(cells), block_size)
+        ]
+        block_index, position = divmod(cursor_position, block_size)
+        while len(blocks) <= block_index:
+            blocks.append(self._blank_block)
+        block_results = self._block_results
+
+        if num_steps >= limit:
+            return TOO_MANY_STEPS, cursor_position, state, num_steps
+
+        while True:
+            key = (state, blocks[block_index], position)
+            result = block_results.get(key)
+            if result is None:
+                result = block_results[key] = self._simulate_block(*key)
+
+            status, next_state, block, next_position, steps, max_position = result
+
+            if (
+                status == LOOPING or
+                num_steps + steps >= limit or
+                # Moving off the left of the tape is an error, not a step, even
+                # when the same step enters a final state
+                (block_index == 0 and next_position < 0)
+            ):
+                status, next_state, block, next_position, steps, max_position = self._simulate_block(
+                    state,
+                    blocks[block_index],
+                    position,
+                    budget=limit - num_steps,
+                    left_edge=block_index == 0,
+                )
+
+            blocks[block_index] = block
+            num_steps += steps
+            state = next_state
+            end = max(end, block_index * block_size + max_position + 1)
+            cursor_position = block_index * block_size + next_position
+
+            if status != MOVED:
+                break
+            elif next_position < 0:
+                block_index -= 1
+                position = block_size - 1
+            else:
+                block_index += 1
+                position = 0
+                if block_index == len(blocks):
+                    blocks.append(self._blank_block)
+
+        if end > len(blocks) * block_size:
+            blocks.append(self._blank_block)
+        tape.load(bytearray(b''.join(blocks)[:end]))
+
+        return status, cursor_position, state, num_steps
+
+    def _simulate_block(self, state, block, position, budget=None, left_edge=False):
+        """Runs the base machine inside one block.
+
+        :param int budget: Stop with TOO_MANY_STEPS after this many steps
+        :param bool left_edge: This is the first block of the tape, so
+            moving off its left side is NEGATIVE
+        :rtype: (status, state, block, position, steps, max_position) where
+            position may be -1 or block_size if the head left the block
+        """
+        mapping = self._mapping
+        block_size = self.block_size
+        cells = bytearray(block)
+        steps = 0
+        max_position = position
+        seen = set()
+
+        while True:
+            transition = mapping.get((state, cells[position]))
+            if transition is None:
+                return MISSING, state, bytes(cells), position, steps, max_position
+
+            next_state, next_character, direction, is_final = transition
+            cells[position] = next_character
+            position += direction
+            max_position = max(max_position, position)
+
+            if position < 0 and left_edge:
+                return NEGATIVE, state, bytes(cells), position, steps, max_position
+
+            state = next_state
+            if is_final:
+                return HALTED, state, bytes(cells), position, steps, max_position
+
+            steps += 1
+            if budget is not None and steps >= budget:
+                return TOO_MANY_STEPS, state, bytes(cells), position, steps, max_position
+
+            if not 0 <= position < block_size:
+                return MOVED, state, bytes(cells), position, steps, max_position
+
+            if budget is None:
+                configuration = (state, position, bytes(cells))
+                if configuration in seen:
+                    return LOOPING, state, block, position, steps, max_position
+                seen.add(configuration)
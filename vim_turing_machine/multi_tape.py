@@ -0,0 +1,357 @@
+"""Machines with several tapes, each with its own head.
+
+`MultiTapeTuringMachine` runs MultiTapeStateTransitions directly.
+`lower_to_single_tape` compiles them to ordinary StateTransitions so that
+they can be run by TuringMachine or written out by VimTuringMachine.
+
+The single tape stores the k tapes interleaved. Every position of the k tapes
+becomes a block of 2k cells, which holds a head marker and a character for
+each tape:
+
+    marker of tape 0, character of tape 0, marker of tape 1, ...
+
+A marker is '1' where the head of that tape is, and '0' or blank elsewhere.
+All of these are ordinary characters, so the single tape machine needs no
+extra alphabet.
+
+Each step of the multi tape machine is simulated in two sweeps. The read sweep
+starts at or left of the leftmost head and moves right, collecting the
+character under every head, until it has seen all k heads. The write sweep
+then moves left, writing the new character under every head and moving its
+marker. A marker that moves right is placed with a short trip into the next
+block. A marker that moves left is placed when the sweep reaches the next
+block on the left. The sweep ends at the start of the block with the
+leftmost head, which is where the next read sweep starts. Both sweeps only
+cover the blocks between the leftmost and the rightmost head.
+"""
+import sys
+import time
+from collections import defaultdict
+
+from vim_turing_machine.constants import BACKWARDS
+from vim_turing_machine.constants import BLANK_CHARACTER
+from vim_turing_machine.constants import DO_NOT_MOVE
+from vim_turing_machine.constants import FINAL_STATES
+from vim_turing_machine.constants import FORWARDS
+from vim_turing_machine.constants import INITIAL_STATE
+from vim_turing_machine.constants import VALID_CHARACTERS
+from vim_turing_machine.struct import RunResult
+from vim_turing_machine.struct import StateTransition
+from vim_turing_machine.tape import Tape
+from vim_turing_machine.turing_machine import DuplicateStateTransitionException
+from vim_turing_machine.turing_machine import MissingStateTransition
+from vim_turing_machine.turing_machine import NegativeTapePositionException
+from vim_turing_machine.turing_machine import TooManyStepsException
+
+
+HEAD_MARKER = '1'
+NO_HEAD_MARKER = '0'
+
+
+class MultiTapeTuringMachine(object):
+
+    def __init__(self, state_transitions, num_tapes):
+        validate_multi_tape_state_transitions(state_transitions, num_tapes)
+
+        self.num_tapes = num_tapes
+        self._state_transitions = state_transitions
+        self._state_transition_mapping = {
+            (transition.previous_state, tuple(transition.previous_characters)): transition
+            for transition in state_transitions
+        }
+        self.initialize_machine([''] * num_tapes)
+
+    def initialize_machine(self, tapes):
+        assert len(tapes) == self.num_tapes
+        self.tapes = [Tape(tape, blank=BLANK_CHARACTER) for tape in tapes]
+        self.cursor_positions = [0] * self.num_tapes
+        self.current_state = INITIAL_STATE
+        self._num_steps = 0
+
+    def step(self):
+        characters = tuple(
+            tape[cursor_position]
+            for tape, cursor_position in zip(self.tapes, self.cursor_positions)
+        )
+        transition = self._state_transition_mapping.get((self.current_state, characters))
+        if transition is None:
+            raise MissingStateTransition((self.current_state, characters))
+
+        for index, tape in enumerate(self.tapes):
+            tape[self.cursor_positions[index]] = transition.next_characters[index]
+            self.cursor_positions[index] += transition.tape_pointer_directions[index]
+
+            if self.cursor_positions[index] < 0:
+                raise NegativeTapePositionException
+
+            tape.extend_to(self.cursor_positions[index])
+
+        self.current_state = transition.next_state
+
+    def run(self, initial_tapes, max_steps=None):
+        """Runs the machine until it reaches a final state. Steps are counted
+        the same way as TuringMachine.run.
+
+        :param [str] initial_tapes: The initial contents of every tape. All
+            heads start at position 0.
+        :rtype: RunResult, with a tuple of the tape lengths and of the cursor
+            positions
+        """
+        self.initialize_machine(initial_tapes)
+        limit = sys.maxsize if max_steps is None else max(max_steps, 1)
+
+        start_time = time.perf_counter()
+        while True:
+            self.step()
+            if self.current_state in FINAL_STATES:
+                break
+
+            self._num_steps += 1
+            if self._num_steps >= limit:
+                raise TooManyStepsException
+
+        return RunResult(
+            final_state=self.current_state,
+            num_steps=self._num_steps,
+            tape_length=tuple(len(tape) for tape in self.tapes),
+            cursor_position=tuple(self.cursor_positions),
+            wall_time=time.perf_counter() - start_time,
+        )
+
+
+def validate_multi_tape_state_transitions(state_transitions, num_tapes):
+    seen = defaultdict(list)
+
+    for transition in state_transitions:
+        transition.validate()
+        assert len(transition.previous_characters) == num_tapes
+
+        key = (transition.previous_state, tuple(transition.previous_characters))
+        seen[key].append(transition)
+
+    for transitions in seen.values():
+        if len(transitions) > 1:
+            raise DuplicateStateTransitionException(transitions)
+
+
+def encode_tapes(tapes):
+    """The single tape that holds these tapes, with every head at position 0"""
+    length = max([len(tape) for tape in tapes] + [1])
+    cells = []
+    for position in range(length):
+        for tape in tapes:
+            cells.append(HEAD_MARKER if position == 0 else NO_HEAD_MARKER)
+            cells.append(tape[position] if position < len(tape) else BLANK_CHARACTER)
+
+    return ''.join(cells)
+
+
+def decode_tapes(tape, num_tapes):
+    """Splits a single tape into the tapes it holds and their head positions
+
+    :rtype: ([str], [int])
+    """
+    block_size = 2 * num_tapes
+    tapes = []
+    cursor_positions = []
+    for index in range(num_tapes):
+        markers = tape[2 * index::block_size]
+        tapes.append(tape[2 * index + 1::block_size])
+        cursor_positions.append(markers.find(HEAD_MARKER))
+
+    return tapes, cursor_positions
+
+
+def lower_to_single_tape(state_transitions, num_tapes):
+    """Compiles multi tape transitions to single tape transitions that run on
+    the tape from `encode_tapes`. Only the states that can be reached from
+    the initial state are generated.
+
+    :rtype: [StateTransition]
+    """
+    return _Lowering(state_transitions, num_tapes).transitions()
+
+
+class _Lowering(object):
+    """The states of the single tape machine are tuples, which are turned
+    into state names at the end:
+
+    ('read', state, offset, characters, saw_head): Reading the block cell at
+        `offset`. `characters` has the character under each head, or None
+        for the heads that haven't been seen yet, and saw_head is whether
+        the marker right before this cell was set.
+    ('sweep', action, offset, remaining, pending): Writing, at `offset`, what
+        a transition does: its (next state, next characters, directions).
+        `remaining` are the tapes whose heads haven't been written yet and
+        `pending` are the tapes whose markers have to be placed in the next
+        block on the left.
+    ('write', action, offset, remaining, pending): On the character
+        cell of a head, about to write it.
+    ('out', ...) and ('back', ...): Placing a marker in the next block on
+        the right, and coming back.
+    ('rewind', state, offset): Moving to the start of the block before the
+        next read sweep.
+    """
+
+    def __init__(self, state_transitions, num_tapes):
+        self._num_tapes = num_tapes
+        self._block_size = 2 * num_tapes
+        # Transitions that do the same thing share their write sweep
+        self._actions = {
+            (transition.previous_state, tuple(transition.previous_characters)): (
+                transition.next_state,
+                tuple(transition.next_characters),
+                tuple(transition.tape_pointer_directions),
+            )
+            for transition in state_transitions
+        }
+        self._names = {}
+
+    def transitions(self):
+        start = self._read_state(INITIAL_STATE)
+        seen = {start}
+        pending_states = [start]
+        transitions = []
+
+        while pending_states:
+            state = pending_states.pop()
+            for character in sorted(VALID_CHARACTERS):
+                action = self._action(state, character)
+                if action is None:
+                    continue
+
+                next_character, direction, next_state = action
+                transitions.append(StateTransition(
+                    previous_state=self._name(state),
+                    previous_character=character,
+                    next_state=self._name(next_state),
+                    next_character=next_character,
+                    tape_pointer_direction=direction,
+                ))
+
+                if isinstance(next_state, tuple) and next_state not in seen:
+                    seen.add(next_state)
+                    pending_states.append(next_state)
+
+        return transitions
+
+    def _name(self, state):
+        if not isinstance(state, tuple):
+            return state
+
+        name = self._names.get(state)
+        if name is None:
+            if state == self._read_state(INITIAL_STATE):
+                name = INITIAL_STATE
+            else:
+                name = 'Lowered{}{}'.format(state[0].capitalize(), len(self._names))
+            self._names[state] = name
+        return name
+
+    def _read_state(self, state):
+        """Where every read sweep starts"""
+        if state in FINAL_STATES:
+            return state
+        return ('read', state, 0, (None,) * self._num_tapes, False)
+
+    def _action(self, state, character):
+        """(character to write, direction, next state) for the single tape
+        machine in `state` reading `character`, or None if there is no
+        transition"""
+        return getattr(self, '_{}_action'.format(state[0]))(character, *state[1:])
+
+    def _read_action(self, character, state, offset, characters, saw_head):
+        tape_index, is_character_cell = divmod(offset, 2)
+
+        if not is_character_cell:
+            return character, FORWARDS, ('read', state, offset + 1, characters, character == HEAD_MARKER)
+
+        if saw_head:
+            characters = characters[:tape_index] + (character,) + characters[tape_index + 1:]
+
+        if None in characters:
+            return character, FORWARDS, ('read', state, (offset + 1) % self._block_size, characters, False)
+
+        action = self._actions.get((state, characters))
+        if action is None:
+            return None
+
+        remaining = frozenset(range(self._num_tapes))
+        return character, BACKWARDS, ('sweep', action, offset - 1, remaining, frozenset())
+
+    def _sweep_action(self, character, action, offset, remaining, pending):
+        tape_index, is_character_cell = divmod(offset, 2)
+
+        if is_character_cell:
+            return character, BACKWARDS, ('sweep', action, offset - 1, remaining, pending)
+
+        if tape_index in pending:
+            return self._continue(HEAD_MARKER, action, offset, remaining, pending - {tape_index})
+
+        if character == HEAD_MARKER and tape_index in remaining:
+            direction = action[2][tape_index]
+            if direction == BACKWARDS:
+                pending = pending | {tape_index}
+
+            return (
+                HEAD_MARKER if direction == DO_NOT_MOVE else NO_HEAD_MARKER,
+                FORWARDS,
+                ('write', action, offset + 1, remaining - {tape_index}, pending),
+            )
+
+        return self._continue(character, action, offset, remaining, pending)
+
+    def _write_action(self, character, action, offset, remaining, pending):
+        tape_index = offset // 2
+        _, next_characters, directions = action
+        next_character = next_characters[tape_index]
+
+        if directions[tape_index] == FORWARDS:
+            # The marker goes in the same cell of the next block
+            return next_character, FORWARDS, self._out_state(
+                action, tape_index, remaining, pending, self._block_size - 2,
+            )
+
+        return next_character, BACKWARDS, ('continue', action, offset - 1, remaining, pending)
+
+    def _out_state(self, action, tape_index, remaining, pending, num_cells):
+        return ('out', action, tape_index, remaining, pending, num_cells)
+
+    def _out_action(self, character, action, tape_index, remaining, pending, num_cells):
+        if num_cells:
+            return character, FORWARDS, self._out_state(action, tape_index, remaining, pending, num_cells - 1)
+
+        return HEAD_MARKER, BACKWARDS, self._back_state(
+            action, tape_index, remaining, pending, self._block_size - 1,
+        )
+
+    def _back_state(self, action, tape_index, remaining, pending, num_cells):
+        if num_cells == 0:
+            return ('continue', action, 2 * tape_index, remaining, pending)
+        return ('back', action, tape_index, remaining, pending, num_cells)
+
+    def _back_action(self, character, action, tape_index, remaining, pending, num_cells):
+        return character, BACKWARDS, self._back_state(action, tape_index, remaining, pending, num_cells - 1)
+
+    def _continue_action(self, character, action, offset, remaining, pending):
+        return self._continue(character, action, offset, remaining, pending)
+
+    def _continue(self, character, action, offset, remaining, pending):
+        """Writes character and moves on to the left, unless every head has
+        been written, in which case the step is done"""
+        if remaining or pending:
+            return character, BACKWARDS, ('sweep', action, (offset - 1) % self._block_size, remaining, pending)
+
+        next_state = action[0]
+        if next_state in FINAL_STATES or offset == 0:
+            return character, DO_NOT_MOVE, self._read_state(next_state)
+
+        return character, BACKWARDS, self._rewind_state(next_state, offset - 1)
+
+    def _rewind_state(self, state, offset):
+        if offset == 0:
+            return self._read_state(state)
+        return ('rewind', state, offset)
+
+    def _rewind_action(self, character, state, offset):
+        return character, BACKWARDS, self._rewind_state(state, offset - 1)
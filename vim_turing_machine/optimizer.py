@@ -0,0 +1,146 @@
+"""Shrinks a list of transitions without changing what the machine does.
+
+The generators build their machines out of helpers that each emit every
+state they could possibly need, so the resulting machines contain states that
+are never entered and families of states that behave identically. This pass
+
+1. drops every state that can't be reached from the initial state,
+2. drops transitions out of final states, which never fire because the
+   machine halts as soon as it enters one, and
+3. merges equivalent states by partition refinement: states start out in one
+   block (final states each get their own), and blocks are split until all
+   states in a block write the same characters, move the same way and go to
+   the same blocks for every character.
+
+The optimized machine takes exactly the same steps on every tape. Only the
+names in MissingStateTransition errors can differ, since merged states are
+renamed to one of their members.
+"""
+import sys
+
+from vim_turing_machine.constants import FINAL_STATES
+from vim_turing_machine.constants import INITIAL_STATE
+from vim_turing_machine.struct import OptimizationReport
+
+
+def optimize_transitions(state_transitions, initial_state=INITIAL_STATE):
+    """Returns the smaller transitions and an OptimizationReport
+
+    :rtype: ([StateTransition], OptimizationReport)
+    """
+    reachable = reachable_states(state_transitions, initial_state)
+    pruned = [
+        transition
+        for transition in state_transitions
+        if transition.previous_state in reachable and transition.previous_state not in FINAL_STATES
+    ]
+    optimized = merge_equivalent_states(pruned, initial_state)
+
+    report = OptimizationReport(
+        num_states_before=len(all_states(state_transitions, initial_state)),
+        num_states_after=len(all_states(optimized, initial_state)),
+        num_transitions_before=len(state_transitions),
+        num_transitions_after=len(optimized),
+    )
+    return optimized, report
+
+
+def all_states(state_transitions, initial_state=INITIAL_STATE):
+    return {initial_state} | {
+        state
+        for transition in state_transitions
+        for state in (transition.previous_state, transition.next_state)
+    }
+
+
+def reachable_states(state_transitions, initial_state=INITIAL_STATE):
+    """The states that can be entered by starting from initial_state"""
+    successors = {}
+    for transition in state_transitions:
+        successors.setdefault(transition.previous_state, set()).add(transition.next_state)
+
+    reachable = {initial_state}
+    pending = [initial_state]
+    while pending:
+        for state in successors.get(pending.pop(), ()):
+            if state not in reachable:
+                reachable.add(state)
+                pending.append(state)
+
+    return reachable
+
+
+def merge_equivalent_states(state_transitions, initial_state=INITIAL_STATE):
+    """Replaces every group of equivalent states by one of them. The
+    initial and final states keep their names, other groups are named after
+    the member that appears first in state_transitions."""
+    transitions_by_state = {}
+    for transition in state_transitions:
+        transitions_by_state.setdefault(transition.previous_state, {})[transition.previous_character] = transition
+
+    # Ordered by first appearance, so the representatives are predictable
+    states = list(dict.fromkeys(
+        state
+        for transition in state_transitions
+        for state in (transition.previous_state, transition.next_state)
+    ))
+    characters = sorted({transition.previous_character for transition in state_transitions})
+
+    block_of = {
+        state: state if state in FINAL_STATES else None
+        for state in states
+    }
+    num_blocks = len(set(block_of.values()))
+    while True:
+        signatures = {}
+        next_block_of = {}
+        for state in states:
+            if state in FINAL_STATES:
+                signature = state
+            else:
+                transitions = transitions_by_state.get(state, {})
+                signature = (block_of[state],) + tuple(
+                    (
+                        transitions[character].next_character,
+                        transitions[character].tape_pointer_direction,
+                        block_of[transitions[character].next_state],
+                    ) if character in transitions else None
+                    for character in characters
+                )
+            next_block_of[state] = signatures.setdefault(signature, len(signatures))
+
+        block_of = next_block_of
+        if len(signatures) == num_blocks:
+            break
+        num_blocks = len(signatures)
+
+    representatives = {}
+    for state in [initial_state] + FINAL_STATES + states:
+        if state in block_of:
+            representatives.setdefault(block_of[state], state)
+
+    def rename(state):
+        return representatives[block_of[state]]
+
+    merged = {}
+    for transition in state_transitions:
+        renamed = transition._replace(
+            previous_state=rename(transition.previous_state),
+            next_state=rename(transition.next_state),
+        )
+        merged.setdefault((renamed.previous_state, renamed.previous_character), renamed)
+
+    return list(merged.values())
+
+
+if __name__ == '__main__':
+    # Only the command line needs a machine to optimize
+    from vim_turing_machine.machines.merge_overlapping_intervals import merge_overlapping_intervals
+
+    num_bits = int(sys.argv[1])
+
+    generator = merge_overlapping_intervals.MergeOverlappingIntervalsGenerator(num_bits)
+    transitions = generator.merge_overlapping_intervals_transitions()
+    _, report = optimize_transitions(transitions)
+
+    print(report)
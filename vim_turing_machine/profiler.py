@@ -0,0 +1,149 @@
+"""Counts where a TuringMachine spends its steps.
+
+Pass a Profiler to the TuringMachine to enable it:
+
+    profiler = Profiler()
+    TuringMachine(transitions, profiler=profiler).run(tape)
+    profiler.write_json('profile.json')
+    profiler.write_collapsed('profile.folded')
+
+The machine only counts how often every transition fires. Per state totals and
+head travel are derived from those counts afterwards. The collapsed stack file
+splits state names into their CamelCase words, which follows how the
+generators build state names out of the name of the calling sub-machine, and
+can be fed to flamegraph.pl or speedscope.
+
+A machine without a profiler runs its regular loop, so profiling costs nothing
+when it is disabled.
+"""
+import json
+import re
+import sys
+from collections import Counter
+from collections import defaultdict
+
+from vim_turing_machine.artifact import load_machine
+from vim_turing_machine.machines.merge_overlapping_intervals.encode_intervals import encode_intervals
+from vim_turing_machine.turing_machine import TuringMachine
+
+
+# Splits 'InitialStateCopy1Bit0' into ['Initial', 'State', 'Copy1', 'Bit0']
+STATE_NAME_WORD = re.compile(r'[A-Z]+(?![a-z])\d*|[A-Z]?[^A-Z]+')
+
+OTHER_PREFIX = '<other>'
+
+
+class Profiler(object):
+
+    def __init__(self):
+        self.transition_hits = Counter()
+
+    def start(self, machine):
+        pass
+
+    def record(self, num_transitions, transition, cursor_position, tape):
+        self.transition_hits[transition] += 1
+
+    def finish(self, machine):
+        pass
+
+    @property
+    def num_transitions_fired(self):
+        """Every fired transition, including the one into the final state"""
+        return sum(self.transition_hits.values())
+
+    @property
+    def head_travel(self):
+        return sum(
+            hits * abs(transition.tape_pointer_direction)
+            for transition, hits in self.transition_hits.items()
+        )
+
+    def state_totals(self):
+        """Returns {state: {'hits': int, 'head_travel': int}}"""
+        totals = defaultdict(lambda: {'hits': 0, 'head_travel': 0})
+
+        for transition, hits in self.transition_hits.items():
+            total = totals[transition.previous_state]
+            total['hits'] += hits
+            total['head_travel'] += hits * abs(transition.tape_pointer_direction)
+
+        return dict(totals)
+
+    def prefix_totals(self, prefixes=None, num_words=1):
+        """Groups the state totals by the beginning of the state names.
+
+        :param [str] prefixes: The prefixes to group by. A state is counted in
+            the longest prefix it starts with, or OTHER_PREFIX if none match.
+        :param int num_words: Without prefixes, group by this many CamelCase
+            words of the state name.
+        """
+        totals = defaultdict(lambda: {'hits': 0, 'head_travel': 0})
+
+        for state, state_total in self.state_totals().items():
+            if prefixes is None:
+                prefix = ''.join(split_state_name(state)[:num_words])
+            else:
+                prefix = max(
+                    (prefix for prefix in prefixes if state.startswith(prefix)),
+                    key=len,
+                    default=OTHER_PREFIX,
+                )
+
+            totals[prefix]['hits'] += state_total['hits']
+            totals[prefix]['head_travel'] += state_total['head_travel']
+
+        return dict(totals)
+
+    def to_json(self, prefixes=None):
+        return {
+            'transitions_fired': self.num_transitions_fired,
+            'head_travel': self.head_travel,
+            'transitions': [
+                {
+                    'previous_state': transition.previous_state,
+                    'previous_character': transition.previous_character,
+                    'next_state': transition.next_state,
+                    'next_character': transition.next_character,
+                    'tape_pointer_direction': transition.tape_pointer_direction,
+                    'hits': hits,
+                }
+                for transition, hits in self.transition_hits.most_common()
+            ],
+            'states': self.state_totals(),
+            'prefixes': self.prefix_totals(prefixes),
+        }
+
+    def write_json(self, filename, prefixes=None):
+        with open(filename, 'w') as f:
+            json.dump(self.to_json(prefixes), f, indent=2, sort_keys=True)
+
+    def collapsed_stacks(self):
+        """Returns lines in the 'frame;frame;frame count' format"""
+        return [
+            '{} {}'.format(';'.join(split_state_name(state)), total['hits'])
+            for state, total in sorted(self.state_totals().items())
+        ]
+
+    def write_collapsed(self, filename):
+        with open(filename, 'w') as f:
+            for line in self.collapsed_stacks():
+                f.write(line + '\n')
+
+
+def split_state_name(state):
+    return STATE_NAME_WORD.findall(state) or [state]
+
+
+if __name__ == '__main__':
+    intervals = json.loads(sys.argv[1])
+    num_bits = int(sys.argv[2])
+    output_prefix = sys.argv[3]
+
+    profiler = Profiler()
+    transitions = load_machine('merge_overlapping_intervals', num_bits)
+    machine = TuringMachine(transitions, quiet=True, profiler=profiler, validate=False)
+    machine.run(initial_tape=encode_intervals(intervals, num_bits))
+
+    profiler.write_json('{}.json'.format(output_prefix))
+    profiler.write_collapsed('{}.folded'.format(output_prefix))
@@ -24,3 +24,80 @@ class StateTransition(namedtuple('StateTransition', [
 
             if invalid_char in self.next_state:
                 raise AssertionError('{} is in {}'.format(invalid_char, self.next_state))
+
+
+class MultiTapeStateTransition(namedtuple('MultiTapeStateTransition', [
+    'previous_state',
+    'previous_characters',
+    'next_state',
+    'next_characters',
+    'tape_pointer_directions',
+])):
+    """A transition of a machine with one head per tape. The characters and
+    directions are tuples with one entry per tape."""
+
+    def validate(self):
+        assert len(self.previous_characters) == len(self.next_characters) == len(self.tape_pointer_directions)
+        for previous_character, next_character, tape_pointer_direction in zip(
+            self.previous_characters,
+            self.next_characters,
+            self.tape_pointer_directions,
+        ):
+            StateTransition(
+                previous_state=self.previous_state,
+                previous_character=previous_character,
+                next_state=self.next_state,
+                next_character=next_character,
+                tape_pointer_direction=tape_pointer_direction,
+            ).validate()
+
+
+class FusedStateTransition(namedtuple('FusedStateTransition', [
+    'previous_state',
+    'previous_character',
+    'next_state',
+    'next_character',
+    'tape_pointer_direction',
+    'chain',
+    'scan',
+])):
+    """A transition followed by a chain of states that move the head the same
+    way whatever they read. `chain` has a (character, direction) pair per
+    state of the chain, where the character is the one it writes, or None if
+    it leaves the tape as it is. `next_state` is the state after the chain.
+    If that state moves over bits until it reads a blank, `scan` is the
+    direction it moves in, and DO_NOT_MOVE otherwise."""
+
+
+class BatchResult(namedtuple('BatchResult', [
+    'index',
+    'final_state',
+    'num_steps',
+    'tape',
+    'error',
+])):
+    """The outcome of running one tape of a batch. `error` is the exception
+    that stopped the machine (e.g. TooManyStepsException or
+    MissingStateTransition), or None if it reached a final state."""
+
+
+class RunResult(namedtuple('RunResult', [
+    'final_state',
+    'num_steps',
+    'tape_length',
+    'cursor_position',
+    'wall_time',
+])):
+    """The outcome of TuringMachine.run. `wall_time` is in seconds."""
+
+
+class OptimizationReport(namedtuple('OptimizationReport', [
+    'num_states_before',
+    'num_states_after',
+    'num_transitions_before',
+    'num_transitions_after',
+])):
+    """How much `optimize_transitions` shrank a machine"""
+
+    def __str__(self):
+        return 'States: {} -> {}, transitions: {} -> {}'.format(*self)
@@ -0,0 +1,88 @@
+"""Tape backends for the TuringMachine.
+
+Cells are stored one byte per character in a bytearray instead of a list of
+one character strings. The buffer grows in geometric chunks so running off the
+end of the tape is amortized O(1).
+
+Positions are logical: position 0 is the first cell of the initial tape. A
+`TwoWayTape` can also grow to the left, in which case `start` becomes negative.
+"""
+from vim_turing_machine.constants import BLANK_CHARACTER
+
+
+# Characters are stored as their latin-1 byte value
+ENCODING = 'latin-1'
+
+MINIMUM_GROWTH = 64
+
+
+class Tape(object):
+    """A tape that is infinitely long in the right direction."""
+
+    two_way = False
+
+    def __init__(self, initial_tape=(), blank=BLANK_CHARACTER):
+        self.blank = blank
+        self._blank_byte = blank.encode(ENCODING)
+
+        cells = ''.join(initial_tape).encode(ENCODING) or self._blank_byte
+        self.load(bytearray(cells))
+
+    def load(self, cells, start=0):
+        """Replaces the contents of the tape. `cells` becomes the tape from
+        position `start` to the end of the tape."""
+        self.cells = cells
+        self.offset = -start  # Index in `cells` of position 0
+        self.start = start
+        self.end = start + len(cells)
+
+    def extend_to(self, position):
+        """Makes sure that position is on the tape by filling with blanks"""
+        if position >= self.end:
+            index = position + self.offset
+            if index >= len(self.cells):
+                growth = max(index + 1 - len(self.cells), len(self.cells), MINIMUM_GROWTH)
+                self.cells.extend(self._blank_byte * growth)
+            self.end = position + 1
+        elif position < self.start:
+            self._extend_left_to(position)
+
+    def _extend_left_to(self, position):
+        raise IndexError(position)
+
+    def __getitem__(self, position):
+        if not self.start <= position < self.end:
+            raise IndexError(position)
+        return chr(self.cells[position + self.offset])
+
+    def __setitem__(self, position, character):
+        if not self.start <= position < self.end:
+            raise IndexError(position)
+        self.cells[position + self.offset] = ord(character)
+
+    def __len__(self):
+        return self.end - self.start
+
+    def __iter__(self):
+        return iter(str(self))
+
+    def __str__(self):
+        return self.to_bytes().decode(ENCODING)
+
+    def to_bytes(self):
+        """The contents of the tape from start to end"""
+        return bytes(self.cells[self.start + self.offset:self.end + self.offset])
+
+
+class TwoWayTape(Tape):
+    """A tape that is infinitely long in both directions."""
+
+    two_way = True
+
+    def _extend_left_to(self, position):
+        index = position + self.offset
+        if index < 0:
+            growth = max(-index, len(self.cells), MINIMUM_GROWTH)
+            self.cells[0:0] = self._blank_byte * growth
+            self.offset += growth
+        self.start = position
@@ -0,0 +1,269 @@
+"""A compact binary execution trace, and a reader that replays it.
+
+Unlike `debug=True`, which prints the whole tape on every step, the trace only
+records what changed: the id of the transition that fired and the position of
+the cell it wrote. The symbol written and the head move follow from the
+transition. Deltas can be sampled, and a full copy of the tape (a keyframe) is
+written periodically and at the end of the run.
+
+Steps are numbered by how many transitions have fired, so the configuration at
+step 0 is the initial tape. The reader rebuilds the configuration at any step
+from the closest keyframe before it, by applying the deltas after the keyframe
+if every step was recorded. Since machines are deterministic, it runs the
+transitions stored in the trace forward from the keyframe otherwise.
+
+The reader only keeps the offsets of the keyframes in memory. Deltas are
+read from the file as they are needed.
+
+Resuming a run appends to the trace that the run started.
+
+File layout (little endian):
+
+    MAGIC, uint32 version, uint32 header length, header json
+    b'D' uint64 step, uint32 transition id, int64 position
+    b'K' uint64 step, int64 cursor, int64 tape start, uint32 state id,
+         uint64 tape length, tape bytes
+
+Usage: python -m vim_turing_machine.trace <trace file> [step]
+"""
+import json
+import os
+import struct
+import sys
+
+from vim_turing_machine.struct import StateTransition
+from vim_turing_machine.tape import TwoWayTape
+from vim_turing_machine.turing_machine import TuringMachine
+
+
+MAGIC = b'VTMTRACE'
+VERSION = 1
+
+HEADER = struct.Struct('<8sII')
+DELTA = struct.Struct('<QIq')
+KEYFRAME = struct.Struct('<QqqIQ')
+
+DELTA_RECORD = b'D'
+KEYFRAME_RECORD = b'K'
+
+
+class TraceWriter(object):
+
+    def __init__(self, filename, sample_rate=1, keyframe_interval=10000):
+        """
+        :param int sample_rate: Record the delta of every sample_rate'th step
+        :param int keyframe_interval: Write the full tape every this many steps
+        """
+        self._filename = filename
+        self._sample_rate = sample_rate
+        self._keyframe_interval = keyframe_interval
+        self._file = None
+
+    def start(self, machine):
+        """Starts a new trace, or appends to the trace of the run if it is
+        being resumed"""
+        self._num_transitions = machine._num_steps
+        if machine._num_steps and os.path.exists(self._filename):
+            with open(self._filename, 'rb') as f:
+                header = read_header(f, self._filename)
+            self._start_ids(header['states'], [StateTransition(*transition) for transition in header['transitions']])
+            self._file = open(self._filename, 'ab')
+            return
+
+        transitions = list(machine._state_transitions)
+        self._start_ids(
+            sorted({
+                state
+                for transition in transitions
+                for state in (transition.previous_state, transition.next_state)
+            } | {machine.current_state}),
+            transitions,
+        )
+
+        header = json.dumps({
+            'blank': machine.tape.blank,
+            'sample_rate': self._sample_rate,
+            'keyframe_interval': self._keyframe_interval,
+            'states': self._states,
+            'transitions': [list(transition) for transition in transitions],
+        }).encode('utf-8')
+
+        self._file = open(self._filename, 'wb')
+        self._file.write(HEADER.pack(MAGIC, VERSION, len(header)))
+        self._file.write(header)
+
+    def _start_ids(self, states, transitions):
+        self._transition_ids = {
+            transition: transition_id
+            for transition_id, transition in enumerate(transitions)
+        }
+        self._states = states
+        self._state_ids = {state: state_id for state_id, state in enumerate(self._states)}
+
+    def record(self, num_transitions, transition, cursor_position, tape):
+        if num_transitions % self._keyframe_interval == 0:
+            self._write_keyframe(num_transitions, cursor_position, transition.previous_state, tape)
+
+        if num_transitions % self._sample_rate == 0:
+            self._file.write(DELTA_RECORD)
+            self._file.write(DELTA.pack(num_transitions, self._transition_ids[transition], cursor_position))
+
+        self._num_transitions = num_transitions + 1
+
+    def finish(self, machine):
+        self._write_keyframe(
+            self._num_transitions,
+            machine.cursor_position,
+            machine.current_state,
+            machine.tape,
+        )
+        self._file.close()
+
+    def _write_keyframe(self, num_transitions, cursor_position, state, tape):
+        cells = tape.to_bytes()
+        self._file.write(KEYFRAME_RECORD)
+        self._file.write(KEYFRAME.pack(
+            num_transitions,
+            cursor_position,
+            tape.start,
+            self._state_ids[state],
+            len(cells),
+        ))
+        self._file.write(cells)
+
+
+class TraceReader(object):
+
+    def __init__(self, filename):
+        self._filename = filename
+        # Step -> file offset of its keyframe
+        self.keyframes = {}
+
+        with open(filename, 'rb') as f:
+            header = read_header(f, filename)
+            self.blank = header['blank']
+            self.sample_rate = header['sample_rate']
+            self.keyframe_interval = header['keyframe_interval']
+            self.states = header['states']
+            self.transitions = [StateTransition(*transition) for transition in header['transitions']]
+            self._records_offset = f.tell()
+
+            for record_type, record in read_records(f):
+                if record_type == KEYFRAME_RECORD:
+                    step, offset = record
+                    self.keyframes[step] = offset
+
+        self.num_steps = max(self.keyframes)
+
+    def iter_deltas(self):
+        """The sampled steps, read from the file one at a time
+
+        :rtype: iterator of (step, StateTransition, position)
+        """
+        with open(self._filename, 'rb') as f:
+            f.seek(self._records_offset)
+            for record_type, record in read_records(f):
+                if record_type == DELTA_RECORD:
+                    step, transition_id, position = record
+                    yield step, self.transitions[transition_id], position
+
+    def configuration_at(self, step):
+        """Returns a TuringMachine whose tape, cursor and state are the ones
+        after `step` transitions have fired."""
+        if not 0 <= step <= self.num_steps:
+            raise ValueError('Step {} is not in the trace (0 to {})'.format(step, self.num_steps))
+
+        keyframe_step = max(
+            keyframe_step
+            for keyframe_step in self.keyframes
+            if keyframe_step <= step
+        )
+
+        with open(self._filename, 'rb') as f:
+            machine = self._load_keyframe(f, keyframe_step)
+            if keyframe_step < step and self.sample_rate == 1:
+                self._apply_deltas(f, machine, keyframe_step, step)
+                return machine
+
+        for _ in range(step - keyframe_step):
+            machine.step()
+
+        return machine
+
+    def print_configuration(self, step):
+        print('Step: {}'.format(step))
+        self.configuration_at(step).print_tape()
+
+    def _load_keyframe(self, f, step):
+        f.seek(self.keyframes[step])
+        _, cursor_position, tape_start, state_id, tape_length = KEYFRAME.unpack(f.read(KEYFRAME.size))
+        cells = bytearray(f.read(tape_length))
+
+        machine = TuringMachine(self.transitions, quiet=True, tape_class=TwoWayTape)
+        machine.tape = TwoWayTape(blank=self.blank)
+        machine.tape.load(cells, start=tape_start)
+        machine.cursor_position = cursor_position
+        machine.current_state = self.states[state_id]
+
+        return machine
+
+    def _apply_deltas(self, f, machine, from_step, to_step):
+        """Applies the deltas of the steps from from_step up to to_step, which
+        follow the keyframe that f has just been read from"""
+        for record_type, record in read_records(f):
+            if record_type != DELTA_RECORD or record[0] < from_step:
+                continue
+
+            delta_step, transition_id, position = record
+            if delta_step >= to_step:
+                return
+
+            transition = self.transitions[transition_id]
+            machine.tape[position] = transition.next_character
+            machine.cursor_position = position + transition.tape_pointer_direction
+            machine.tape.extend_to(machine.cursor_position)
+            machine.current_state = transition.next_state
+
+
+def read_header(f, filename):
+    """Reads the header at the start of a trace
+
+    :rtype: dict
+    """
+    magic, version, header_length = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('{} is not a version {} trace'.format(filename, VERSION))
+
+    return json.loads(f.read(header_length).decode('utf-8'))
+
+
+def read_records(f):
+    """Reads the records from the current position of f to the end, without
+    the tapes of the keyframes
+
+    :rtype: iterator of (DELTA_RECORD, (step, transition id, position)) and
+        (KEYFRAME_RECORD, (step, file offset))
+    """
+    while True:
+        record_type = f.read(1)
+        if not record_type:
+            return
+        elif record_type == DELTA_RECORD:
+            yield record_type, DELTA.unpack(f.read(DELTA.size))
+        elif record_type == KEYFRAME_RECORD:
+            offset = f.tell()
+            step, _, _, _, tape_length = KEYFRAME.unpack(f.read(KEYFRAME.size))
+            yield record_type, (step, offset)
+            f.seek(offset + KEYFRAME.size + tape_length)
+        else:
+            raise ValueError('Corrupt trace record {!r}'.format(record_type))
+
+
+if __name__ == '__main__':
+    reader = TraceReader(sys.argv[1])
+
+    if len(sys.argv) > 2:
+        reader.print_configuration(int(sys.argv[2]))
+    else:
+        for keyframe_step in sorted(reader.keyframes):
+            reader.print_configuration(keyframe_step)
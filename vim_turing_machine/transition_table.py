@@ -0,0 +1,129 @@
+"""Columnar storage for the transitions of a machine.
+
+A list of StateTransitions keeps five objects per transition, and the
+generators build a fresh string for the state names of every one of them. A
+TransitionTable stores each state name once and the transitions as columns:
+arrays of state ids, and byte arrays of characters and directions. It behaves
+like a read only sequence of StateTransitions, which are built on demand, so
+it can be passed anywhere a list of transitions is expected.
+"""
+from array import array
+
+from vim_turing_machine.struct import StateTransition
+
+
+class TransitionTable(object):
+
+    def __init__(self, state_transitions=()):
+        """
+        :param state_transitions: Any iterable of StateTransitions, e.g. a
+            generator. It is consumed once without building a list.
+        """
+        self.states = []
+        self.state_ids = {}
+        self.previous_states = array('I')
+        self.next_states = array('I')
+        self.previous_characters = bytearray()
+        self.next_characters = bytearray()
+        self.directions = array('b')
+
+        self.extend(state_transitions)
+
+    @classmethod
+    def from_columns(cls, states, previous_states, previous_characters, next_states, next_characters, directions):
+        """Builds a table from columns that are already interned, e.g. when
+        loading an artifact. Characters are latin-1 byte values. Arrays of
+        the right type are used as they are instead of being copied."""
+        table = cls()
+        table.states = list(states)
+        table.state_ids = {state: state_id for state_id, state in enumerate(table.states)}
+        table.previous_states = as_array('I', previous_states)
+        table.next_states = as_array('I', next_states)
+        table.previous_characters = bytearray(previous_characters)
+        table.next_characters = bytearray(next_characters)
+        table.directions = as_array('b', directions)
+        return table
+
+    def intern(self, state):
+        """The id of a state, adding it to the table if it is new"""
+        state_id = self.state_ids.get(state)
+        if state_id is None:
+            state_id = self.state_ids[state] = len(self.states)
+            self.states.append(state)
+        return state_id
+
+    def append(self, transition):
+        self.previous_states.append(self.intern(transition.previous_state))
+        self.next_states.append(self.intern(transition.next_state))
+        self.previous_characters.append(ord(transition.previous_character))
+        self.next_characters.append(ord(transition.next_character))
+        self.directions.append(transition.tape_pointer_direction)
+
+    def extend(self, state_transitions):
+        for transition in state_transitions:
+            self.append(transition)
+
+    def index(self):
+        """Maps every (previous state id, previous character) pair to the
+        index of its transition. The pair is packed into one int with
+        `dispatch_key`, so the index holds no tuples or transitions.
+
+        :rtype: {int: int}
+        """
+        return {
+            dispatch_key(state_id, character): index
+            for index, (state_id, character) in enumerate(zip(self.previous_states, self.previous_characters))
+        }
+
+    def __len__(self):
+        return len(self.directions)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        return StateTransition(
+            previous_state=self.states[self.previous_states[index]],
+            previous_character=chr(self.previous_characters[index]),
+            next_state=self.states[self.next_states[index]],
+            next_character=chr(self.next_characters[index]),
+            tape_pointer_direction=self.directions[index],
+        )
+
+    def __iter__(self):
+        states = self.states
+        for previous_state, previous_character, next_state, next_character, direction in zip(
+            self.previous_states,
+            self.previous_characters,
+            self.next_states,
+            self.next_characters,
+            self.directions,
+        ):
+            yield StateTransition(
+                previous_state=states[previous_state],
+                previous_character=chr(previous_character),
+                next_state=states[next_state],
+                next_character=chr(next_character),
+                tape_pointer_direction=direction,
+            )
+
+    def __eq__(self, other):
+        if not isinstance(other, (TransitionTable, list, tuple)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
+
+    def __repr__(self):
+        return '{}({} transitions, {} states)'.format(type(self).__name__, len(self), len(self.states))
+
+
+def dispatch_key(state_id, character):
+    """Packs a state id and a character byte into the key of `index`"""
+    return state_id << 8 | character
+
+
+def as_array(typecode, values):
+    if isinstance(values, array) and values.typecode == typecode:
+        return values
+    return array(typecode, values)
@@ -1,10 +1,33 @@
+import copy
+import sys
+import time
 from collections import defaultdict
 
 import colored
 
+from vim_turing_machine.checkpoint import load_checkpoint
+from vim_turing_machine.checkpoint import save_checkpoint
+from vim_turing_machine.checkpoint import transitions_hash
+from vim_turing_machine.codegen import GeneratedMachine
+from vim_turing_machine.compiled import CompiledMachine
+from vim_turing_machine.compiled import MISSING_TRANSITION
 from vim_turing_machine.constants import BLANK_CHARACTER
 from vim_turing_machine.constants import FINAL_STATES
 from vim_turing_machine.constants import INITIAL_STATE
+from vim_turing_machine.constants import MISSING
+from vim_turing_machine.constants import NEGATIVE
+from vim_turing_machine.constants import TOO_MANY_STEPS
+from vim_turing_machine.macro_machine import MacroMachine
+from vim_turing_machine.struct import RunResult
+from vim_turing_machine.tape import ENCODING
+from vim_turing_machine.tape import Tape
+from vim_turing_machine.transition_table import dispatch_key
+from vim_turing_machine.transition_table import TransitionTable
+
+
+# Values of TuringMachine's `compiled` argument
+COMPILED_TABLES = 'tables'
+COMPILED_PYTHON = 'python'
 
 
 class NegativeTapePositionException(Exception):
@@ -23,106 +46,633 @@ class TooManyStepsException(Exception):
     pass
 
 
+class InfiniteLoopDetected(Exception):
+
+    def __init__(self, cycle_length, entry_step):
+        super().__init__(cycle_length, entry_step)
+        self.cycle_length = cycle_length
+        self.entry_step = entry_step
+
+    def __str__(self):
+        return 'The machine repeats every {} steps starting at step {}'.format(
+            self.cycle_length,
+            self.entry_step,
+        )
+
+
 class TuringMachine(object):
 
-    def __init__(self, state_transitions, debug=False, quiet=False):
-        validate_state_transitions(state_transitions)
+    def __init__(
+        self,
+        state_transitions,
+        debug=False,
+        quiet=False,
+        compiled=False,
+        tape_class=Tape,
+        reporter=None,
+        profiler=None,
+        tracer=None,
+        detect_loops=False,
+        macro_block_size=None,
+        validate=True,
+    ):
+        """
+        :param state_transitions: A TransitionTable, or any iterable of
+            StateTransitions, which is stored in a TransitionTable.
+        :param bool quiet: Don't report the result of a run, even with a
+            reporter
+        :param reporter: Called with the machine and the RunResult after every
+            successful run, e.g. `print_result`. Runs only return their
+            RunResult by default.
+        :param Profiler profiler: Record every transition that fires.
+        :param TraceWriter tracer: Write an execution trace of every run.
+            Profiling and tracing use their own interpreter loop, so they
+            override `compiled`.
+        :param bool detect_loops: Raise InfiniteLoopDetected as soon as a
+            configuration repeats instead of running until max_steps. Loops
+            that keep growing the tape are not detected.
+        :param compiled: Run with the integer indexed transition tables
+            from `CompiledMachine` (True or COMPILED_TABLES) or with a Python
+            function generated for these transitions (COMPILED_PYTHON)
+            instead of looking up every step in a dict. The debug mode always
+            uses the step-by-step interpreter.
+        :param type tape_class: The tape backend. Use `TwoWayTape` to let the
+            tape grow to the left instead of raising NegativeTapePositionException.
+        :param int macro_block_size: Run blocks of this many cells at a time
+            with a `MacroMachine`, which memoizes what the machine does to
+            each block. Overrides `compiled`. Only supported on one way tapes.
+        :param bool validate: Check the transitions. Machines loaded from an
+            artifact were validated when it was saved and can skip this.
+        """
+        if isinstance(state_transitions, TransitionTable):
+            if validate:
+                validate_state_transitions(state_transitions)
+        else:
+            # The columns of the table only fit valid characters and
+            # directions, so the transitions are checked before they are packed
+            state_transitions = list(state_transitions)
+            if validate:
+                validate_state_transitions(state_transitions)
+            state_transitions = TransitionTable(state_transitions)
+
+        if macro_block_size is not None:
+            if macro_block_size < 1:
+                raise ValueError('macro_block_size must be at least 1')
+            if tape_class.two_way:
+                raise ValueError('Macro machines only support one way tapes')
 
         self._state_transitions = state_transitions
-        self._state_transition_mapping = {
-            (state.previous_state, state.previous_character): state
-            for state in state_transitions
+        # Dispatches on the columns of the table instead of a StateTransition
+        # per transition
+        self._transition_index = state_transitions.index()
+        self._final_state_ids = {
+            state_transitions.state_ids[state]
+            for state in FINAL_STATES
+            if state in state_transitions.state_ids
         }
+        self._transitions_hash = None
         self._debug = debug
+        self._detect_loops = detect_loops
         self._quiet = quiet
+        self._reporter = None if quiet else reporter
+        self._observers = [
+            observer
+            for observer in (profiler, tracer)
+            if observer is not None
+        ]
+        self._tape_class = tape_class
+        self._compiled = None
+        self._generated = None
+        self._macro = None
+        if macro_block_size is not None:
+            self._macro = MacroMachine(state_transitions, macro_block_size, blank_character=BLANK_CHARACTER)
+        elif compiled == COMPILED_PYTHON:
+            self._generated = GeneratedMachine(state_transitions, blank_character=BLANK_CHARACTER)
+        elif compiled:
+            self._compiled = CompiledMachine(state_transitions, blank_character=BLANK_CHARACTER)
         self.initialize_machine(tape=[])
 
     def initialize_machine(self, tape, initial_cursor_position=0):
-        if tape:
-            self.tape = list(tape)[:]  # Copy the initial tape since we mutate it
-        else:
-            self.tape = [BLANK_CHARACTER]
+        self.tape = self._tape_class(tape, blank=BLANK_CHARACTER)
 
         self.cursor_position = initial_cursor_position
         self.current_state = INITIAL_STATE
         self._num_steps = 0
 
     def get_state_transition(self):
-        try:
-            return self._state_transition_mapping[
-                (self.current_state, self.tape[self.cursor_position])
-            ]
-        except KeyError:
+        state_id = self._state_transitions.state_ids.get(self.current_state)
+        index = None
+        if state_id is not None:
+            index = self._transition_index.get(dispatch_key(state_id, ord(self.tape[self.cursor_position])))
+
+        if index is None:
             raise MissingStateTransition(
                 (self.current_state, self.tape[self.cursor_position])
             )
+        return self._state_transitions[index]
+
+    def _current_state_id(self):
+        """The id of the current state in the transition table, for the loops
+        that dispatch on ids"""
+        state_id = self._state_transitions.state_ids.get(self.current_state)
+        if state_id is None:
+            raise MissingStateTransition((self.current_state, self.tape[self.cursor_position]))
+        return state_id
 
     def step(self):
         """This implements an infinitely long tape in the right direction, but
-        will error if you go beyond position 0"""
+        will error if you go beyond position 0 unless the tape is two way"""
         transition = self.get_state_transition()
 
         self.tape[self.cursor_position] = transition.next_character
 
         self.cursor_position += transition.tape_pointer_direction
 
-        if self.cursor_position < 0:
+        if self.cursor_position < 0 and not self.tape.two_way:
             raise NegativeTapePositionException
 
-        # Make sure we haven't run more than 1 past the end of the tape. This
-        # should never happen since we append to the tape over time.
-        assert self.cursor_position <= len(self.tape)
-
-        if self.cursor_position >= len(self.tape):
-            # Fake the infinite tape by adding a blank character under the
-            # cursor.
-            self.tape.append(BLANK_CHARACTER)
+        # Fake the infinite tape by adding a blank character under the cursor.
+        self.tape.extend_to(self.cursor_position)
 
         self.current_state = transition.next_state
 
-        if self.current_state in FINAL_STATES:
-            self.final_state()
-        elif self._debug:
-            self.print_tape()
+    def is_halted(self):
+        return self.current_state in FINAL_STATES
+
+    @property
+    def transitions_hash(self):
+        if self._transitions_hash is None:
+            self._transitions_hash = transitions_hash(self._state_transitions)
+        return self._transitions_hash
+
+    def save_checkpoint(self, filename):
+        save_checkpoint(self, filename)
+
+    def load_checkpoint(self, filename):
+        """Restores a configuration saved by save_checkpoint. Continue running
+        it with `resume`."""
+        load_checkpoint(self, filename)
+
+    def run(
+        self,
+        initial_tape,
+        max_steps=None,
+        initial_cursor_position=0,
+        checkpoint_file=None,
+        checkpoint_interval=None,
+    ):
+        """Runs the machine until it reaches a final state.
+
+        The step that enters the final state is not counted. A run raises
+        TooManyStepsException once it has taken max_steps other steps.
+
+        :param str checkpoint_file: Save the configuration to this file every
+            checkpoint_interval steps and when the step limit is hit.
+        :rtype: RunResult
+        """
+        self.initialize_machine(initial_tape, initial_cursor_position=initial_cursor_position)
 
-    def final_state(self):
-        if not self._quiet:
-            print('Program complete. Final state: {}'.format(self.current_state))
-            print(
-                'The program completed in {} steps using a machine with {} transitions'.format(
-                    self._num_steps,
-                    len(self._state_transitions)
-                )
-            )
-            self.print_tape()
+        return self.resume(
+            max_steps=max_steps,
+            checkpoint_file=checkpoint_file,
+            checkpoint_interval=checkpoint_interval,
+        )
 
-        raise StopIteration
+    def resume(self, max_steps=None, checkpoint_file=None, checkpoint_interval=None):
+        """Continues running from the current configuration, e.g. after
+        load_checkpoint or after a run hit its step limit. max_steps counts
+        the steps taken before resuming as well.
 
-    def run(self, initial_tape, max_steps=None, initial_cursor_position=0):
-        self.initialize_machine(initial_tape, initial_cursor_position=initial_cursor_position)
+        :rtype: RunResult
+        """
+        # Running at least one step keeps the semantics of max_steps=0 the
+        # same as checking the limit after every step.
+        limit = sys.maxsize if max_steps is None else max(max_steps, 1)
+
+        for observer in self._observers:
+            observer.start(self)
+
+        start_time = time.perf_counter()
+        try:
+            if checkpoint_file is None:
+                self._run_until(limit)
+            else:
+                self._run_with_checkpoints(limit, checkpoint_file, checkpoint_interval)
+        finally:
+            for observer in self._observers:
+                observer.finish(self)
 
+        result = RunResult(
+            final_state=self.current_state,
+            num_steps=self._num_steps,
+            tape_length=len(self.tape),
+            cursor_position=self.cursor_position,
+            wall_time=time.perf_counter() - start_time,
+        )
+
+        if self._reporter is not None:
+            self._reporter(self, result)
+
+        return result
+
+    def _run_until(self, limit):
         if self._debug:
+            self._run_debug(limit)
+        elif self._observers:
+            self._run_observed(limit)
+        elif self._detect_loops:
+            self._run_detecting_loops(limit)
+        elif self._macro is not None:
+            self._run_macro(limit)
+        elif self._compiled is not None:
+            self._run_compiled(limit)
+        elif self._generated is not None:
+            self._run_generated(limit)
+        else:
+            self._run_interpreted(limit)
+
+    def _run_with_checkpoints(self, limit, checkpoint_file, checkpoint_interval):
+        """Runs in segments of checkpoint_interval steps and saves a checkpoint
+        after each of them"""
+        while True:
+            if checkpoint_interval is None:
+                segment_limit = limit
+            else:
+                segment_limit = min(limit, self._num_steps + checkpoint_interval)
+
+            try:
+                self._run_until(segment_limit)
+                return
+            except TooManyStepsException:
+                self.save_checkpoint(checkpoint_file)
+                if segment_limit == limit:
+                    raise
+
+    def _run_debug(self, limit):
+        """Steps one at a time and prints the tape after every step"""
+        if self._num_steps >= limit:
+            raise TooManyStepsException
+
+        self.print_tape()
+
+        while True:
+            self.step()
+
+            if self.is_halted():
+                return
+
             self.print_tape()
 
+            self._num_steps += 1
+            if self._num_steps >= limit:
+                raise TooManyStepsException
+
+    def _run_interpreted(self, limit):
+        """Same semantics as repeatedly calling `step`, but keeps the
+        configuration in local variables and bounds the loop by the step limit.
+        It dispatches on state ids and reads and writes the tape's bytes."""
+        table = self._state_transitions
+        index = self._transition_index
+        next_states = table.next_states
+        next_characters = table.next_characters
+        directions = table.directions
+        final_state_ids = self._final_state_ids
+        tape = self.tape
+        cells = tape.cells
+        two_way = tape.two_way
+        cursor_position = self.cursor_position
+        state = self._current_state_id()
+        num_steps = self._num_steps
+
         try:
-            while(True):
-                self.step()
-                self._num_steps += 1
+            for num_steps in range(num_steps, limit):
+                # The offset only changes when a two way tape grows left
+                cell = cursor_position + tape.offset
+                transition = index.get(state << 8 | cells[cell])
+                if transition is None:
+                    raise MissingStateTransition((table.states[state], tape[cursor_position]))
 
-                if max_steps is not None and self._num_steps >= max_steps:
-                    raise TooManyStepsException
-        except StopIteration:
-            pass
+                cells[cell] = next_characters[transition]
+                cursor_position += directions[transition]
+
+                if cursor_position < 0 and not two_way:
+                    raise NegativeTapePositionException
+
+                tape.extend_to(cursor_position)
+                state = next_states[transition]
+
+                if state in final_state_ids:
+                    return
+            else:
+                num_steps = max(num_steps, limit)
+                raise TooManyStepsException
+        finally:
+            self.cursor_position = cursor_position
+            self.current_state = table.states[state]
+            self._num_steps = num_steps
+
+    def _run_observed(self, limit):
+        """The same loop as `_run_interpreted`, but shows every transition to
+        the observers (profiler and tracer) before it is applied. It is kept
+        separate so that the other loops don't pay for observing.
+
+        Observers have `start(machine)`, `record(num_transitions, transition,
+        cursor_position, tape)` and `finish(machine)` methods, where
+        num_transitions counts every transition fired so far. `resume` calls
+        start and finish around the whole run.
+        """
+        observers = self._observers
+        table = self._state_transitions
+        index = self._transition_index
+        final_state_ids = self._final_state_ids
+        tape = self.tape
+        cells = tape.cells
+        two_way = tape.two_way
+        cursor_position = self.cursor_position
+        state = self._current_state_id()
+        num_steps = self._num_steps
+
+        try:
+            for num_steps in range(num_steps, limit):
+                cell = cursor_position + tape.offset
+                transition_index = index.get(state << 8 | cells[cell])
+                if transition_index is None:
+                    raise MissingStateTransition((table.states[state], tape[cursor_position]))
+
+                # Observers get a StateTransition, which is only built here
+                transition = table[transition_index]
+                for observer in observers:
+                    observer.record(num_steps, transition, cursor_position, tape)
+
+                cells[cell] = table.next_characters[transition_index]
+                cursor_position += transition.tape_pointer_direction
+
+                if cursor_position < 0 and not two_way:
+                    raise NegativeTapePositionException
+
+                tape.extend_to(cursor_position)
+                state = table.next_states[transition_index]
+
+                if state in final_state_ids:
+                    return
+            else:
+                num_steps = max(num_steps, limit)
+                raise TooManyStepsException
+        finally:
+            self.cursor_position = cursor_position
+            self.current_state = table.states[state]
+            self._num_steps = num_steps
+
+    def _run_detecting_loops(self, limit):
+        """The same loop as `_run_interpreted`, but fingerprints every
+        configuration by its state, cursor and a hash of the tape that is
+        updated on every write. It uses Brent's algorithm: the configuration
+        is saved after 1, 2, 4, 8, ... steps and every step is compared with
+        the saved one, so memory stays bounded. Fingerprint matches are
+        confirmed by comparing the tapes."""
+        table = self._state_transitions
+        index = self._transition_index
+        next_states = table.next_states
+        next_characters = table.next_characters
+        directions = table.directions
+        final_state_ids = self._final_state_ids
+        tape = self.tape
+        cells = tape.cells
+        two_way = tape.two_way
+        blank = tape.blank
+        cursor_position = self.cursor_position
+        state = self._current_state_id()
+        num_steps = self._num_steps
+
+        start = (self.tape.to_bytes(), self.tape.start, cursor_position, self.current_state, num_steps)
+        tape_hash = 0
+        for position, character in enumerate(tape, tape.start):
+            tape_hash ^= cell_hash(position, character, blank)
+
+        saved = (state, cursor_position, tape_hash)
+        saved_contents = tape_contents(tape)
+        saved_step = num_steps
+        power = 1
+
+        try:
+            for num_steps in range(num_steps, limit):
+                cell = cursor_position + tape.offset
+                previous_character = cells[cell]
+                transition = index.get(state << 8 | previous_character)
+                if transition is None:
+                    raise MissingStateTransition((table.states[state], tape[cursor_position]))
+
+                next_character = next_characters[transition]
+                if previous_character != next_character:
+                    tape_hash ^= (
+                        cell_hash(cursor_position, chr(previous_character), blank) ^
+                        cell_hash(cursor_position, chr(next_character), blank)
+                    )
+
+                cells[cell] = next_character
+                cursor_position += directions[transition]
+
+                if cursor_position < 0 and not two_way:
+                    raise NegativeTapePositionException
+
+                tape.extend_to(cursor_position)
+                state = next_states[transition]
+
+                if state in final_state_ids:
+                    return
+
+                configuration = (state, cursor_position, tape_hash)
+                if configuration == saved and tape_contents(tape) == saved_contents:
+                    cycle_length = num_steps + 1 - saved_step
+                    raise InfiniteLoopDetected(
+                        cycle_length=cycle_length,
+                        entry_step=self._find_cycle_entry(start, cycle_length),
+                    )
+
+                if num_steps + 1 - saved_step == power:
+                    saved = configuration
+                    saved_contents = tape_contents(tape)
+                    saved_step = num_steps + 1
+                    power *= 2
+            else:
+                num_steps = max(num_steps, limit)
+                raise TooManyStepsException
+        finally:
+            self.cursor_position = cursor_position
+            self.current_state = table.states[state]
+            self._num_steps = num_steps
+
+    def _find_cycle_entry(self, start, cycle_length):
+        """Runs two copies of the machine from the start configuration, one
+        cycle_length steps ahead of the other. They first meet at the step
+        where the cycle begins."""
+        lead, lag = [self._copy_configuration(*start) for _ in range(2)]
+        for _ in range(cycle_length):
+            lead.step()
+
+        entry_step = start[-1]
+        while not (
+            lead.current_state == lag.current_state and
+            lead.cursor_position == lag.cursor_position and
+            tape_contents(lead.tape) == tape_contents(lag.tape)
+        ):
+            lead.step()
+            lag.step()
+            entry_step += 1
+
+        return entry_step
+
+    def _copy_configuration(self, cells, tape_start, cursor_position, state, num_steps):
+        machine = copy.copy(self)
+        machine.tape = self._tape_class(blank=self.tape.blank)
+        machine.tape.load(bytearray(cells), start=tape_start)
+        machine.cursor_position = cursor_position
+        machine.current_state = state
+        machine._num_steps = num_steps
+        return machine
+
+    def _run_compiled(self, limit):
+        """Same semantics as repeatedly calling `step`, but dispatches through
+        the flat tables of the compiled machine."""
+        compiled = self._compiled
+        next_states = compiled.next_states
+        next_symbols = compiled.next_symbols
+        directions = compiled.directions
+        is_scan = compiled.is_scan
+        is_final = compiled.is_final
+        num_symbols = compiled.num_symbols
+        blank_symbol_id = compiled.blank_symbol_id
+        two_way = self.tape.two_way
+
+        original_cells = self.tape.to_bytes()
+        tape = compiled.encode_tape(self.tape)
+        shift = 0  # Number of cells added to the left of the original tape
+        origin = self.tape.start  # Position of tape[0]
+        lowest = 0  # Lowest index of tape that is on the tape
+        index_on_tape = self.cursor_position - origin
+        state = compiled.state_ids[self.current_state]
+        num_steps = self._num_steps
+
+        try:
+            while num_steps < limit:
+                index = state * num_symbols + tape[index_on_tape]
+
+                if is_scan[index]:
+                    # Run all but the last step of a "move until symbol" loop
+                    # at once. Each skipped cell still counts as a step.
+                    distance = compiled.scan_distance(tape, index_on_tape, state, lowest)
+                    if num_steps + distance >= limit:
+                        index_on_tape += (limit - num_steps) * directions[index]
+                        num_steps = limit
+                        raise TooManyStepsException
+
+                    index_on_tape += distance * directions[index]
+                    num_steps += distance
+                    index = state * num_symbols + tape[index_on_tape]
+
+                next_state = next_states[index]
+                if next_state == MISSING_TRANSITION:
+                    break
+
+                tape[index_on_tape] = next_symbols[index]
+                index_on_tape += directions[index]
+
+                if index_on_tape < lowest:
+                    if index_on_tape < 0:
+                        if not two_way:
+                            raise NegativeTapePositionException
+
+                        growth = len(tape)
+                        tape[0:0] = bytes([blank_symbol_id]) * growth
+                        index_on_tape += growth
+                        lowest += growth
+                        shift += growth
+                        origin -= growth
+
+                    lowest = index_on_tape
+                elif index_on_tape == len(tape):
+                    tape.append(blank_symbol_id)
+
+                state = next_state
+
+                if is_final[state]:
+                    break
+
+                num_steps += 1
+            else:
+                raise TooManyStepsException
+        finally:
+            self.tape.load(
+                compiled.decode_tape(tape[lowest:], original_cells, shift=shift - lowest),
+                start=origin + lowest,
+            )
+            self.cursor_position = index_on_tape + origin
+            self.current_state = compiled.states[state]
+            self._num_steps = num_steps
+
+        if not is_final[state]:
+            raise MissingStateTransition(
+                (self.current_state, self.tape[self.cursor_position])
+            )
+
+    def _run_generated(self, limit):
+        """Runs the function that codegen generated for these transitions"""
+        generated = self._generated
+        state = generated.state_ids.get(self.current_state)
+        if state is None:
+            raise MissingStateTransition((self.current_state, self.tape[self.cursor_position]))
+
+        tape = bytearray(self.tape.to_bytes())
+        origin = self.tape.start
+
+        status, index, lowest, shift, state, self._num_steps = generated.run_machine(
+            tape,
+            self.cursor_position - origin,
+            0,
+            state,
+            self._num_steps,
+            limit,
+            self.tape.two_way,
+        )
+
+        origin -= shift
+        self.tape.load(tape[lowest:], start=origin + lowest)
+        self.cursor_position = index + origin
+        self.current_state = generated.states[state]
+
+        if status == MISSING:
+            raise MissingStateTransition((self.current_state, self.tape[self.cursor_position]))
+        elif status == NEGATIVE:
+            raise NegativeTapePositionException
+        elif status == TOO_MANY_STEPS:
+            raise TooManyStepsException
+
+    def _run_macro(self, limit):
+        """Runs block by block with the macro machine"""
+        status, self.cursor_position, self.current_state, self._num_steps = self._macro.run(
+            self.tape,
+            self.cursor_position,
+            self.current_state,
+            self._num_steps,
+            limit,
+        )
+
+        if status == MISSING:
+            raise MissingStateTransition((self.current_state, self.tape[self.cursor_position]))
+        elif status == NEGATIVE:
+            raise NegativeTapePositionException
+        elif status == TOO_MANY_STEPS:
+            raise TooManyStepsException
 
     def print_tape(self):
         tape = ''
-        for i, character in enumerate(self.tape):
+        for i, character in enumerate(self.tape, self.tape.start):
             if i == self.cursor_position:
                 tape += '{}{}{}{}'.format(colored.bg('red'), colored.fg('white'), character, colored.attr('reset'))
             else:
                 tape += character
 
-            if i != len(self.tape) - 1:
+            if i != self.tape.end - 1:
                 tape += ' | '
 
         print(tape)
@@ -130,6 +680,37 @@ class TuringMachine(object):
         print()  # Add empty line
 
 
+def cell_hash(position, character, blank):
+    """The contribution of one cell to the tape hash. Blank cells don't
+    contribute, so growing the tape doesn't change the hash."""
+    if character == blank:
+        return 0
+    return hash((position, character))
+
+
+def tape_contents(tape):
+    """The tape without the blanks at either end, and where it begins"""
+    cells = tape.to_bytes()
+    blank = tape.blank.encode(ENCODING)
+    stripped = cells.lstrip(blank)
+    if not stripped:
+        return 0, stripped
+
+    return tape.start + len(cells) - len(stripped), stripped.rstrip(blank)
+
+
+def print_result(machine, result):
+    """A reporter that prints the final state and tape of a run"""
+    print('Program complete. Final state: {}'.format(result.final_state))
+    print(
+        'The program completed in {} steps using a machine with {} transitions'.format(
+            result.num_steps,
+            len(machine._state_transitions)
+        )
+    )
+    machine.print_tape()
+
+
 def validate_state_transitions(state_transitions):
     seen = defaultdict(list)
 
@@ -0,0 +1,174 @@
+"""Runs one machine over many tapes in lockstep with numpy.
+
+The N tapes are held as a single 2-D uint8 array of symbol ids, with one row
+per tape. The heads, states and step counts are int arrays. Every step gathers
+the symbols under the heads, looks the transitions up in the compiled tables
+and scatters the results back. Lanes that have halted are masked out.
+
+Requires numpy: pip install vim-turing-machine[numpy]
+"""
+import numpy
+
+from vim_turing_machine.compiled import CompiledMachine
+from vim_turing_machine.constants import BITS_PER_NUMBER
+from vim_turing_machine.constants import BLANK_CHARACTER
+from vim_turing_machine.machines.merge_overlapping_intervals.interval_arrays import decode_intervals_array
+from vim_turing_machine.machines.merge_overlapping_intervals.interval_arrays import encode_intervals_array
+from vim_turing_machine.struct import BatchResult
+from vim_turing_machine.tape import ENCODING
+from vim_turing_machine.turing_machine import MissingStateTransition
+from vim_turing_machine.turing_machine import NegativeTapePositionException
+from vim_turing_machine.turing_machine import TooManyStepsException
+from vim_turing_machine.turing_machine import validate_state_transitions
+
+
+# Lane statuses
+RUNNING = 0
+HALTED = 1
+MISSING = 2
+NEGATIVE = 3
+TOO_MANY_STEPS = 4
+
+
+class VectorizedTuringMachine(object):
+
+    def __init__(self, state_transitions, blank_character=BLANK_CHARACTER):
+        validate_state_transitions(state_transitions)
+
+        self._compiled = compiled = CompiledMachine(state_transitions, blank_character=blank_character)
+        self._next_states = numpy.array(compiled.next_states, dtype=numpy.int64)
+        self._next_symbols = numpy.array(compiled.next_symbols, dtype=numpy.uint8)
+        self._directions = numpy.array(compiled.directions, dtype=numpy.int64)
+        self._is_final = numpy.array(compiled.is_final, dtype=bool)
+        self._encode_table = numpy.frombuffer(compiled._encode_table, dtype=numpy.uint8)
+        self._decode_table = numpy.frombuffer(compiled._decode_table, dtype=numpy.uint8)
+        self._blank_byte = ord(blank_character)
+
+    def run(self, initial_tapes, max_steps=None):
+        """Runs every tape to completion and returns a BatchResult per tape, in
+        the same order. Final tapes and step counts are the same as running
+        each tape through TuringMachine.run.
+
+        :param [str] initial_tapes: The initial tapes
+        :param int max_steps: The step limit of every lane
+        :rtype: [BatchResult]
+        """
+        compiled = self._compiled
+        num_tapes = len(initial_tapes)
+
+        raw_tapes, lengths = self._to_array(initial_tapes)
+        tapes = self._encode_table[raw_tapes]
+        heads = numpy.zeros(num_tapes, dtype=numpy.int64)
+        states = numpy.zeros(num_tapes, dtype=numpy.int64)  # The initial state is always 0
+        num_steps = numpy.zeros(num_tapes, dtype=numpy.int64)
+        statuses = numpy.full(num_tapes, RUNNING, dtype=numpy.int8)
+
+        active = numpy.arange(num_tapes)
+        while active.size:
+            indices = states[active] * compiled.num_symbols + tapes[active, heads[active]]
+            next_states = self._next_states[indices]
+
+            missing = next_states < 0
+            if missing.any():
+                statuses[active[missing]] = MISSING
+                keep = ~missing
+                active = active[keep]
+                indices = indices[keep]
+                next_states = next_states[keep]
+
+            tapes[active, heads[active]] = self._next_symbols[indices]
+            new_heads = heads[active] + self._directions[indices]
+
+            negative = new_heads < 0
+            heads[active] = new_heads
+            if negative.any():
+                statuses[active[negative]] = NEGATIVE
+                keep = ~negative
+                active = active[keep]
+                next_states = next_states[keep]
+                new_heads = new_heads[keep]
+
+            # Fake the infinite tape by growing every row when a head runs off
+            # the end of the array.
+            if new_heads.size and new_heads.max() >= tapes.shape[1]:
+                tapes, raw_tapes = self._grow(tapes, raw_tapes)
+            lengths[active] = numpy.maximum(lengths[active], new_heads + 1)
+
+            states[active] = next_states
+            final = self._is_final[next_states]
+            if final.any():
+                statuses[active[final]] = HALTED
+                active = active[~final]
+
+            num_steps[active] += 1
+            if max_steps is not None:
+                too_many = num_steps[active] >= max_steps
+                if too_many.any():
+                    statuses[active[too_many]] = TOO_MANY_STEPS
+                    active = active[~too_many]
+
+        final_tapes = numpy.where(
+            tapes == compiled.unknown_symbol_id,
+            raw_tapes,
+            self._decode_table[tapes],
+        )
+
+        results = []
+        for index in range(num_tapes):
+            tape = final_tapes[index, :lengths[index]].tobytes().decode(ENCODING)
+            results.append(BatchResult(
+                index=index,
+                final_state=compiled.states[states[index]],
+                num_steps=int(num_steps[index]),
+                tape=tape,
+                error=self._error(statuses[index], states[index], tape, heads[index]),
+            ))
+
+        return results
+
+    def _to_array(self, initial_tapes):
+        """Packs the tapes into one blank padded 2-D array"""
+        encoded = [
+            ''.join(tape).encode(ENCODING) or bytes([self._blank_byte])
+            for tape in initial_tapes
+        ]
+        lengths = numpy.array([len(tape) for tape in encoded], dtype=numpy.int64)
+        width = int(lengths.max()) + 1 if encoded else 1
+
+        raw_tapes = numpy.full((len(encoded), width), self._blank_byte, dtype=numpy.uint8)
+        for row, tape in enumerate(encoded):
+            raw_tapes[row, :len(tape)] = numpy.frombuffer(tape, dtype=numpy.uint8)
+
+        return raw_tapes, lengths
+
+    def _grow(self, tapes, raw_tapes):
+        """Doubles the width of the tapes"""
+        num_tapes, width = tapes.shape
+        blank_id = self._compiled.blank_symbol_id
+
+        grown = numpy.full((num_tapes, width * 2), blank_id, dtype=numpy.uint8)
+        grown[:, :width] = tapes
+        grown_raw = numpy.full((num_tapes, width * 2), self._blank_byte, dtype=numpy.uint8)
+        grown_raw[:, :width] = raw_tapes
+
+        return grown, grown_raw
+
+    def _error(self, status, state, tape, head):
+        if status == MISSING:
+            return MissingStateTransition((self._compiled.states[state], tape[head]))
+        elif status == NEGATIVE:
+            return NegativeTapePositionException()
+        elif status == TOO_MANY_STEPS:
+            return TooManyStepsException()
+        else:
+            return None
+
+
+def tapes_from_intervals(interval_lists, num_bits=BITS_PER_NUMBER):
+    """Encodes many lists of intervals into initial tapes"""
+    return [encode_intervals_array(intervals, num_bits).tobytes().decode(ENCODING) for intervals in interval_lists]
+
+
+def intervals_from_results(results, num_bits=BITS_PER_NUMBER):
+    """Decodes the final tapes of many runs back into lists of intervals"""
+    return [decode_intervals_array(result.tape, num_bits).tolist() for result in results]
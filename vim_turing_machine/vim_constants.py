@@ -1,10 +1,12 @@
 VIM_MACHINE_FILENAME = 'machine.vim'
 
+VIM_SYMBOLS_FILENAME = 'machine.symbols.json'
+
 VIM_NEXT_STATE = '`ny$@"'
 
-VIM_MOVE_TAPE_FORWARDS = '`tWmt'
+VIM_MOVE_TAPE_FORWARDS = '`t mt'
 
-VIM_MOVE_TAPE_BACKWARDS = '`tBmt'
+VIM_MOVE_TAPE_BACKWARDS = '`t\bmt'
 
 VIM_RUN_REGISTER = '@"'
 
@@ -29,6 +31,29 @@ VIM_POINTERS = ''.join([
     create_pointer('e', direction='k'),
 ])
 
+# The line dispatch machine has no state transitions block to point to
+VIM_LINE_DISPATCH_POINTERS = ''.join([
+    create_pointer('t'),
+    create_pointer('l'),
+    create_pointer('k'),
+    create_pointer('o'),
+    create_pointer('p'),
+    create_pointer('n'),
+    create_pointer('e', direction='k'),
+])
+
+# The cell past the end of the tape. Reading it adds a line to the tape.
+VIM_END_OF_TAPE = '+'
+
+# Move the head to the next blank, or the end of the tape, in normal mode.
+# They start on the cell before the first one to check, since a search skips
+# the cell under the cursor.
+VIM_SCAN_FORWARDS_COMMAND = '/[{blank_character}{end_of_tape}]\r'
+
+VIM_SCAN_BACKWARDS_COMMAND = '?[{blank_character}{end_of_tape}]\r'
+
+VIM_ADD_LINE_TO_TAPE_COMMAND = '`eO{characters_per_line}i{blank_character}0mt`ny$@"'
+
 VIM_TEMPLATE = """0/_v1\rnf-ly$@"
 
 ### launch with ggyy@" ###
@@ -44,11 +69,11 @@ _k:  # Current state
 
 _t:  # Current tape
 {initial_tape}
-notvalid\|--addlinetotape
+{end_of_tape}
 _e:  # End of tape. Pointer is 1 line above this
 
 _n:  # Next state transition. Usage: `ny$@"
-{logging}`t"tyiW`ky$`s/_"-t\|---\rf:ly$@"
+{logging}`t"tyl`ky$`s/_"-t\|_-t:\rf:ly$@"
 
 _p:  # Print state. Usage: `py$@"
 `ky$`op
@@ -59,11 +84,49 @@ _l:  # Log the tape and state Usage: `ly$@"
 _s:  # State transitions
 {state_transitions}
 # End State transitions
+# Print state when unknown transition
+_-0: `py$@"
+_-1: `py$@"
+_-{blank_character}: `py$@"
 # Add an extra line to the end of the tape
-_--addlinetotape: `eO{characters_per_line}i{blank_character} 0mt`ny$@"
+_-{end_of_tape}: {add_line_to_tape}
 
-# Print state when unknown transition
-_---: `py$@"
+# vim: set whichwrap+=b,s
+"""
+
+# Jumps to the dispatch entry of the current state with `{line}G` and then
+# searches the next few lines for the one of the current tape character, so
+# every step takes the same time however many transitions there are.
+VIM_LINE_DISPATCH_TEMPLATE = """0/_v1\rnf-ly$@"
+
+### launch with ggyy@" ###
+
+# Init pointers
+_v1-gg0mh{pointers}`ny$@"
+
+_d:  # Dispatch table. Every state is the line number of its entry.
+{dispatch_table}
+# End dispatch table
+
+_o:  # Output
+
+
+_k:  # Current state. Usage: `k"ky$@k jumps to its dispatch entry
+{initial_state}
+
+_t:  # Current tape
+{initial_tape}
+{end_of_tape}
+_e:  # End of tape. Pointer is 1 line above this
+
+_n:  # Next state transition. Usage: `ny$@"
+{logging}`t"tyl`k"ky$@k/^t:\rf:ly$@"
+
+_p:  # Print state. Usage: `py$@"
+`ky$`op
+
+_l:  # Log the tape and state Usage: `ly$@"
+`tyipGopdd`kyyGp
 
 # vim: set whichwrap+=b,s
 """
@@ -1,7 +1,22 @@
+import os
+from collections import defaultdict
+
 from vim_turing_machine.constants import BACKWARDS
 from vim_turing_machine.constants import BLANK_CHARACTER
+from vim_turing_machine.constants import DO_NOT_MOVE
 from vim_turing_machine.constants import FORWARDS
+from vim_turing_machine.constants import INITIAL_STATE
+from vim_turing_machine.constants import VALID_CHARACTERS
+from vim_turing_machine.profiler import Profiler
+from vim_turing_machine.struct import FusedStateTransition
+from vim_turing_machine.turing_machine import MissingStateTransition
+from vim_turing_machine.turing_machine import NegativeTapePositionException
+from vim_turing_machine.turing_machine import TooManyStepsException
 from vim_turing_machine.turing_machine import TuringMachine
+from vim_turing_machine.vim_constants import VIM_ADD_LINE_TO_TAPE_COMMAND
+from vim_turing_machine.vim_constants import VIM_END_OF_TAPE
+from vim_turing_machine.vim_constants import VIM_LINE_DISPATCH_POINTERS
+from vim_turing_machine.vim_constants import VIM_LINE_DISPATCH_TEMPLATE
 from vim_turing_machine.vim_constants import VIM_LOG_TAPE_AND_STATE
 from vim_turing_machine.vim_constants import VIM_MACHINE_FILENAME
 from vim_turing_machine.vim_constants import VIM_MOVE_TAPE_BACKWARDS
@@ -9,8 +24,13 @@ from vim_turing_machine.vim_constants import VIM_MOVE_TAPE_FORWARDS
 from vim_turing_machine.vim_constants import VIM_NEXT_STATE
 from vim_turing_machine.vim_constants import VIM_POINTERS
 from vim_turing_machine.vim_constants import VIM_RUN_REGISTER
+from vim_turing_machine.vim_constants import VIM_SCAN_BACKWARDS_COMMAND
+from vim_turing_machine.vim_constants import VIM_SCAN_FORWARDS_COMMAND
 from vim_turing_machine.vim_constants import VIM_TAPE_WRAP_POSITION
+from vim_turing_machine.vim_constants import VIM_SYMBOLS_FILENAME
 from vim_turing_machine.vim_constants import VIM_TEMPLATE
+from vim_turing_machine.vim_symbols import compact_state_names
+from vim_turing_machine.vim_symbols import write_symbols
 
 
 def create_initial_tape(input_tape):
@@ -24,7 +44,162 @@ def create_initial_tape(input_tape):
             initial_tape.append([])
         initial_tape[index // VIM_TAPE_WRAP_POSITION].append(value)
 
-    return '\n'.join(' '.join(row) for row in initial_tape)
+    return '\n'.join(''.join(row) for row in initial_tape)
+
+
+# The profile guided vim machine gives up on profiling inputs that run longer
+PROFILE_MAX_STEPS = 10 ** 6
+
+
+def count_transition_hits(state_transitions, initial_tape, max_steps=None):
+    """Runs the input on the Python engine and counts how often every
+    transition fires. A run that fails still counts the transitions that
+    fired before it failed, since the vim machine fails the same way. A run
+    that hits max_steps raises TooManyStepsException, since its counts do
+    not cover the whole run.
+
+    :rtype: Counter of StateTransition
+    """
+    profiler = Profiler()
+    machine = TuringMachine(state_transitions, quiet=True, profiler=profiler, validate=False)
+    try:
+        machine.run(initial_tape, max_steps=max_steps)
+    except (MissingStateTransition, NegativeTapePositionException):
+        pass
+
+    return profiler.transition_hits
+
+
+def order_by_hits(state_transitions, transition_hits):
+    """Puts the transitions that fire most often first. Every step searches
+    the state transitions from the top, so this minimizes the total search
+    distance. Ties keep their original order."""
+    return sorted(state_transitions, key=lambda transition: -transition_hits[transition])
+
+
+def search_distance(state_transitions, transition_hits):
+    """The number of lines the vim machine searches through, over a run
+    with these hits"""
+    return sum(
+        index * transition_hits[transition]
+        for index, transition in enumerate(state_transitions)
+    )
+
+
+def chain_links(state_transitions):
+    """States that move the head the same way whatever they read, e.g. the
+    states of `move_n_bits`. All of their transitions go to the same state
+    in the same direction, and either write what they read or all write the
+    same character. States that read blanks are left out, so that a chain
+    never runs past the end of the tape.
+
+    :rtype: {state: (next_state, character written or None, direction)}
+    """
+    transitions_by_state = defaultdict(list)
+    for transition in state_transitions:
+        transitions_by_state[transition.previous_state].append(transition)
+
+    links = {}
+    for state, transitions in transitions_by_state.items():
+        if any(transition.previous_character == BLANK_CHARACTER for transition in transitions):
+            continue
+
+        moves = {(transition.next_state, transition.tape_pointer_direction) for transition in transitions}
+        writes = {transition.next_character for transition in transitions}
+        keeps_tape = all(transition.next_character == transition.previous_character for transition in transitions)
+        if len(moves) != 1 or (not keeps_tape and len(writes) != 1):
+            continue
+
+        (next_state, direction), = moves
+        if direction != DO_NOT_MOVE:
+            links[state] = (next_state, None if keeps_tape else writes.pop(), direction)
+
+    return links
+
+
+def scan_states(state_transitions):
+    """States that move over bits until they read a blank, e.g. the states
+    that search for the next number. Both of their bit transitions go back
+    to the state in the same direction without writing.
+
+    :rtype: {state: direction}
+    """
+    loops = defaultdict(set)
+    for transition in state_transitions:
+        if (
+            transition.previous_character != BLANK_CHARACTER and
+            transition.next_state == transition.previous_state and
+            transition.next_character == transition.previous_character and
+            transition.tape_pointer_direction != DO_NOT_MOVE
+        ):
+            loops[transition.previous_state].add((transition.previous_character, transition.tape_pointer_direction))
+
+    scans = {}
+    for state, moves in loops.items():
+        directions = {direction for _, direction in moves}
+        if len(moves) == 2 and len(directions) == 1:
+            scans[state] = directions.pop()
+
+    return scans
+
+
+def fuse_transition_chains(state_transitions, initial_state=INITIAL_STATE):
+    """Follows every transition through the chain of links after it, so the
+    vim machine runs the whole chain in one step. A transition into a scan
+    state also runs the scan. Only the links that are still entered, like
+    the initial state, keep their transitions.
+
+    :rtype: [StateTransition or FusedStateTransition]
+    """
+    links = chain_links(state_transitions)
+    scans = scan_states(state_transitions)
+
+    def fuse(transition):
+        chain = []
+        state = transition.next_state
+        visited = {transition.previous_state}
+        # Stops where the chain loops back to a state it went through
+        while state in links and state not in visited:
+            visited.add(state)
+            state, character, direction = links[state]
+            chain.append((character, direction))
+
+        scan = scans.get(state, DO_NOT_MOVE)
+        if not chain and scan == DO_NOT_MOVE:
+            return transition
+        return FusedStateTransition(
+            previous_state=transition.previous_state,
+            previous_character=transition.previous_character,
+            next_state=state,
+            next_character=transition.next_character,
+            tape_pointer_direction=transition.tape_pointer_direction,
+            chain=tuple(chain),
+            scan=scan,
+        )
+
+    fused = [fuse(transition) for transition in state_transitions]
+    entered = {initial_state} | {transition.next_state for transition in fused}
+
+    return [
+        transition for transition in fused
+        if transition.previous_state not in links or transition.previous_state in entered
+    ]
+
+
+def tape_motion(distance):
+    """The vim commands that move the head `distance` cells along the tape"""
+    if distance == 0:
+        return ''
+    key = ' ' if distance > 0 else '\b'
+    return key if abs(distance) == 1 else '{}{}'.format(abs(distance), key)
+
+
+def add_line_to_tape():
+    """The vim commands that add a line of blanks to the end of the tape"""
+    return VIM_ADD_LINE_TO_TAPE_COMMAND.format(
+        characters_per_line=VIM_TAPE_WRAP_POSITION,
+        blank_character=BLANK_CHARACTER,
+    )
 
 
 class VimStateTransitionAdapter(object):
@@ -51,29 +226,169 @@ class VimStateTransitionAdapter(object):
 
     def _change_tape_to(self):
         """Returns the vim commands to change current tape value to next"""
-        return '`t"_cw{}'.format(self.st.next_character)
+        return '`tr{}'.format(self.st.next_character)
 
     def _move_pointer(self):
         """Returns the vim commands to move the tape after transition"""
-        if self.st.tape_pointer_direction == FORWARDS:
+        if isinstance(self.st, FusedStateTransition):
+            return self._run_chain()
+        elif self.st.tape_pointer_direction == FORWARDS:
             return VIM_MOVE_TAPE_FORWARDS
         elif self.st.tape_pointer_direction == BACKWARDS:
             return VIM_MOVE_TAPE_BACKWARDS
         else:
             return ''
 
+    def _run_chain(self):
+        """Moves through the chain of a fused transition, with one counted
+        motion between the cells that it writes, and then scans"""
+        commands = ['`t']
+        distance = self.st.tape_pointer_direction
+        for character, direction in self.st.chain:
+            if character is not None:
+                commands.append('{}r{}'.format(tape_motion(distance), character))
+                distance = 0
+            distance += direction
+        # A scan starts one cell back, so that it checks the cell the
+        # chain ends on too
+        commands.append(tape_motion(distance - self.st.scan))
+        if self.st.scan == FORWARDS:
+            commands.append(VIM_SCAN_FORWARDS_COMMAND.format(blank_character=BLANK_CHARACTER, end_of_tape=VIM_END_OF_TAPE))
+        elif self.st.scan == BACKWARDS:
+            commands.append(VIM_SCAN_BACKWARDS_COMMAND.format(blank_character=BLANK_CHARACTER, end_of_tape=VIM_END_OF_TAPE))
+        commands.append('mt')
+        return ''.join(commands)
+
+
+class VimDispatchTransitionAdapter(VimStateTransitionAdapter):
+    """A transition as a line of the dispatch table, where states are the
+    line numbers of their entries"""
+
+    def __init__(self, state_transition, state_lines):
+        super().__init__(state_transition)
+        self.state_lines = state_lines
+
+    def to_vim(self):
+        return '{}:{}{}{}{}'.format(
+            self.st.previous_character,
+            self._change_state_to(),
+            self._change_tape_to(),
+            self._move_pointer(),
+            VIM_NEXT_STATE,
+        )
+
+    def _change_state_to(self):
+        return '`k"_C{}G'.format(self.state_lines[self.st.next_state])
+
+
+def dispatch_table_states(state_transitions, initial_state=INITIAL_STATE):
+    """Every state with an entry in the dispatch table, initial state first"""
+    states = {initial_state: None}
+    for transition in state_transitions:
+        states[transition.previous_state] = None
+        states[transition.next_state] = None
+    return list(states)
+
+
+def create_dispatch_table(state_transitions, first_line, initial_state=INITIAL_STATE):
+    """Builds the dispatch table of the line dispatch machine. Every state
+    has an entry of a header and then one line per tape character, plus one
+    for the end of the tape. A character without a transition, including
+    every character in a final state, halts and prints the state.
+
+    :param int first_line: The line number of the table in the file
+    :rtype: (str, {state: line number})
+    """
+    characters = sorted(VALID_CHARACTERS)
+    entry_length = len(characters) + 2
+    states = dispatch_table_states(state_transitions, initial_state)
+    state_lines = {
+        state: first_line + index * entry_length
+        for index, state in enumerate(states)
+    }
+    transition_mapping = {
+        (transition.previous_state, transition.previous_character): transition
+        for transition in state_transitions
+    }
+
+    lines = []
+    for state in states:
+        lines.append('# {}'.format(state))
+        for character in characters:
+            transition = transition_mapping.get((state, character))
+            if transition is None:
+                lines.append('{}:`k"_C{}`py$@"'.format(character, state))
+            else:
+                lines.append(VimDispatchTransitionAdapter(transition, state_lines).to_vim())
+        lines.append('{}:{}'.format(VIM_END_OF_TAPE, add_line_to_tape()))
+
+    return '\n'.join(lines), state_lines
+
 
 class VimTuringMachine(TuringMachine):
 
-    def run(self, initial_tape, auto_step=True):
-        """Generates vim machine in an output file"""
+    def run(
+        self,
+        initial_tape,
+        auto_step=True,
+        profile_guided=False,
+        line_dispatch=False,
+        compact_states=False,
+        fuse_chains=False,
+        filename=VIM_MACHINE_FILENAME,
+        profile_max_steps=PROFILE_MAX_STEPS,
+    ):
+        """Generates vim machine in an output file
+
+        :param bool profile_guided: Run the input on the Python engine first
+            and write the transitions that fire most often first, so that vim
+            finds them sooner. Inputs that take more than profile_max_steps
+            steps keep the transitions in their original order.
+        :param bool line_dispatch: Write a machine that jumps to the line of
+            the current state instead of searching all of the transitions on
+            every step.
+        :param bool compact_states: Rename the states to short ids and write
+            the names they stand for to VIM_SYMBOLS_FILENAME, next to the
+            machine.
+        :param bool fuse_chains: Run the chains of states that move the head
+            the same way whatever they read in one step each.
+        :param str filename: Where to write the machine
+        """
         self.initialize_machine(initial_tape)
+        initial_state = self.current_state
 
-        with open(VIM_MACHINE_FILENAME, 'w') as machine:
-            machine.write(VIM_TEMPLATE.format(
-                initial_state=self.current_state,
-                initial_tape=create_initial_tape(self.tape),
-                characters_per_line=VIM_TAPE_WRAP_POSITION,
+        state_transitions = list(self._state_transitions)
+        if profile_guided:
+            try:
+                transition_hits = count_transition_hits(self._state_transitions, initial_tape, max_steps=profile_max_steps)
+            except TooManyStepsException:
+                print('Profiling stopped after {} steps, keeping the original order'.format(profile_max_steps))
+            else:
+                before = search_distance(state_transitions, transition_hits)
+                state_transitions = order_by_hits(state_transitions, transition_hits)
+                print('Search distance: {} -> {} lines'.format(before, search_distance(state_transitions, transition_hits)))
+
+        if compact_states:
+            state_transitions, symbols = compact_state_names(state_transitions, initial_state)
+            state_ids = {state: state_id for state_id, state in symbols.items()}
+            initial_state = state_ids.get(initial_state, initial_state)
+            symbols_filename = os.path.join(os.path.dirname(filename), VIM_SYMBOLS_FILENAME)
+            write_symbols(symbols, symbols_filename)
+            print('State names written to {}'.format(symbols_filename))
+
+        if fuse_chains:
+            num_transitions = len(state_transitions)
+            state_transitions = fuse_transition_chains(state_transitions, initial_state)
+            print('Fused chains: {} -> {} transitions'.format(num_transitions, len(state_transitions)))
+
+        if line_dispatch:
+            contents = self._line_dispatch_machine(state_transitions, initial_state, auto_step)
+        else:
+            contents = VIM_TEMPLATE.format(
+                initial_state=initial_state,
+                initial_tape=create_initial_tape(list(self.tape)),
+                end_of_tape=VIM_END_OF_TAPE,
+                add_line_to_tape=add_line_to_tape(),
                 pointers=VIM_POINTERS,
                 blank_character=BLANK_CHARACTER,
                 logging=(
@@ -81,8 +396,28 @@ class VimTuringMachine(TuringMachine):
                 ),
                 state_transitions='\n'.join(
                     VimStateTransitionAdapter(state_transition).to_vim()
-                    for state_transition in self._state_transitions
+                    for state_transition in state_transitions
                 ),
-            ).replace(VIM_RUN_REGISTER, VIM_RUN_REGISTER if auto_step else ''))
+            )
 
-        print('Machine written to {}'.format(VIM_MACHINE_FILENAME))
+        with open(filename, 'w') as machine:
+            machine.write(contents.replace(VIM_RUN_REGISTER, VIM_RUN_REGISTER if auto_step else ''))
+
+        print('Machine written to {}'.format(filename))
+
+    def _line_dispatch_machine(self, state_transitions, initial_state, auto_step):
+        # Everything above the table is fixed, so it starts on the same line
+        # in every machine
+        first_line = VIM_LINE_DISPATCH_TEMPLATE.split('{dispatch_table}')[0].count('\n') + 1
+        dispatch_table, state_lines = create_dispatch_table(state_transitions, first_line, initial_state)
+
+        return VIM_LINE_DISPATCH_TEMPLATE.format(
+            initial_state='{}G'.format(state_lines[initial_state]),
+            initial_tape=create_initial_tape(list(self.tape)),
+            end_of_tape=VIM_END_OF_TAPE,
+            pointers=VIM_LINE_DISPATCH_POINTERS,
+            logging=(
+                VIM_LOG_TAPE_AND_STATE if auto_step and self._debug else ''
+            ),
+            dispatch_table=dispatch_table,
+        )
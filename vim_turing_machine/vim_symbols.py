@@ -0,0 +1,106 @@
+"""Short state names for vim machines.
+
+The generators build long state names, which the vim machine types on every
+state change and matches on every search. `compact_state_names` renames the
+states to short base 36 ids, and VimTuringMachine writes the names they stand
+for to a json symbol file next to machine.vim. Final states keep their
+names.
+
+Translate a machine.vim that ran back to the original names with:
+
+    python -m vim_turing_machine.vim_symbols machine.vim [symbol file]
+
+This prints the file with the current state, the output and any logged
+states decoded.
+"""
+import json
+import sys
+
+from vim_turing_machine.constants import FINAL_STATES
+from vim_turing_machine.constants import INITIAL_STATE
+from vim_turing_machine.struct import StateTransition
+from vim_turing_machine.vim_constants import VIM_SYMBOLS_FILENAME
+
+
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+
+# Lines of machine.vim that are followed by a state. Every logged step is a
+# copy of the tape from `_t:` to `_e:`, followed by the state.
+STATE_SECTIONS = ('_k:', '_o:', '_e:')
+
+
+def to_base_36(number):
+    digits = ''
+    while True:
+        number, digit = divmod(number, len(DIGITS))
+        digits = DIGITS[digit] + digits
+        if number == 0:
+            return digits
+
+
+def compact_state_names(state_transitions, initial_state=INITIAL_STATE):
+    """Renames every state but the final states to a base 36 id, in the
+    order they appear starting with the initial state
+
+    :rtype: ([StateTransition], {id: original state})
+    """
+    ids = {state: state for state in FINAL_STATES}
+
+    def state_id(state):
+        if state not in ids:
+            ids[state] = to_base_36(len(ids) - len(FINAL_STATES))
+        return ids[state]
+
+    state_id(initial_state)
+    renamed = [
+        StateTransition(
+            previous_state=state_id(transition.previous_state),
+            previous_character=transition.previous_character,
+            next_state=state_id(transition.next_state),
+            next_character=transition.next_character,
+            tape_pointer_direction=transition.tape_pointer_direction,
+        )
+        for transition in state_transitions
+    ]
+
+    return renamed, {
+        state_id: state
+        for state, state_id in ids.items()
+        if state not in FINAL_STATES
+    }
+
+
+def write_symbols(symbols, filename=VIM_SYMBOLS_FILENAME):
+    with open(filename, 'w') as f:
+        json.dump(symbols, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def load_symbols(filename=VIM_SYMBOLS_FILENAME):
+    """:rtype: {id: original state}"""
+    with open(filename) as f:
+        return json.load(f)
+
+
+def decode_machine(contents, symbols):
+    """Translates the state ids in a machine.vim back to the original names:
+    the current state, the printed output and the states in the logs. The
+    tape is left alone, even where its lines look like ids."""
+    lines = contents.split('\n')
+
+    for index, line in enumerate(lines):
+        if index and lines[index - 1].startswith(STATE_SECTIONS):
+            lines[index] = symbols.get(line, line)
+
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    machine_filename = sys.argv[1]
+    symbols = load_symbols(sys.argv[2] if len(sys.argv) > 2 else VIM_SYMBOLS_FILENAME)
+
+    # Not read as text, which would turn the carriage returns into newlines
+    with open(machine_filename, 'rb') as f:
+        contents = f.read().decode()
+
+    sys.stdout.write(decode_machine(contents, symbols))